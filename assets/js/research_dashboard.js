@@ -177,6 +177,12 @@
     return "#00ff41";
   }
 
+  function topicLabel(node) {
+    const primary = node.topic || "Other";
+    const others = (Array.isArray(node.topics) ? node.topics : []).filter((topic) => topic !== primary);
+    return others.length ? `${primary} (also ${others.join(", ")})` : primary;
+  }
+
   function buildCitationButtons(meta) {
     if (!window.buildCitationFormats) return "";
     const citations = window.buildCitationFormats({
@@ -294,6 +300,7 @@
       venue: node.venue,
       type: node.type,
       topic: node.topic || "Other",
+      topics: Array.isArray(node.topics) ? node.topics : [],
       symbolSize: node.symbolSize || 14,
       topicColor: topicColors[node.topic] || topicColors.Other,
       yearColor: getColorByYear(node.year),
@@ -355,7 +362,7 @@
         return;
       }
       inspectorBody.innerHTML = `<strong>${escapeHtml(node.name)}</strong><br>
-        <span style="opacity:0.8">Topic: ${escapeHtml(node.topic || "Other")}</span><br>
+        <span style="opacity:0.8">Topic: ${escapeHtml(topicLabel(node))}</span><br>
         <span style="opacity:0.8">Venue: ${escapeHtml(node.venue || "—")}</span><br>
         <span style="opacity:0.8">Year: ${escapeHtml(node.year || "—")} · Citations: ${node.value}</span>`;
       inspectorPin.disabled = false;
@@ -436,7 +443,7 @@
               }
               return `<div style="max-width:260px; white-space:normal; word-wrap:break-word;">
                 <strong>${escapeHtml(params.name)}</strong><br>
-                <span style="opacity:0.8">Topic: ${escapeHtml(params.data.topic || "Other")}</span><br>
+                <span style="opacity:0.8">Topic: ${escapeHtml(topicLabel(params.data))}</span><br>
                 <span style="opacity:0.8">Venue: ${escapeHtml(params.data.venue || "—")}</span><br>
                 <span style="opacity:0.8">Year: ${escapeHtml(params.data.year || "—")} · Citations: ${params.value}</span>
                 <div class="cite-tooltip-actions">${buildCitationButtons(params.data || {})}</div>
@@ -529,9 +536,32 @@
 
   function renderCentrality(centrality) {
     if (!centrality || !Array.isArray(centrality.papers)) return;
+    // Large graphs get sampled-pivot estimates; mark them as such.
+    const estimation = centrality.estimation || {};
+    const estimated = estimation.mode === "approximate";
+    const approx = (value) => (value && estimated ? `≈${value}` : value);
     updateText(IDS.CENTRALITY_DENSITY, (centrality.metrics && centrality.metrics.density) || "--");
-    updateText(IDS.CENTRALITY_PATH, (centrality.metrics && centrality.metrics.avgPath) || "--");
-    updateText(IDS.CENTRALITY_CLUSTER, (centrality.metrics && centrality.metrics.clustering) || "--");
+    updateText(IDS.CENTRALITY_PATH, approx(centrality.metrics && centrality.metrics.avgPath) || "--");
+    updateText(IDS.CENTRALITY_CLUSTER, approx(centrality.metrics && centrality.metrics.clustering) || "--");
+    const confidence = `${Math.round((estimation.confidence || 0) * 100)}% confidence`;
+    const estimateNotes = {
+      [IDS.CENTRALITY_PATH]: `Mean over ${estimation.pivots} sampled papers`,
+      [IDS.CENTRALITY_CLUSTER]: `Estimated from ${estimation.clusteringTrials} sampled triples (±${estimation.clusteringError}, ${confidence})`,
+    };
+    Object.entries(estimateNotes).forEach(([id, note]) => {
+      const el = document.getElementById(id);
+      if (!el) return;
+      if (estimated) {
+        el.title = note;
+      } else {
+        el.removeAttribute("title");
+      }
+    });
+    const bridgeNote = estimated
+      ? (estimation.betweenError === null || estimation.betweenError === undefined
+        ? ` title="Estimated from ${estimation.pivots} sampled papers"`
+        : ` title="Top ${estimation.topK} bridge scores within ±${Math.round(estimation.betweenError * 100)}% (${confidence}, ${estimation.pivots} sampled papers)"`)
+      : "";
 
     const listEl = document.getElementById(IDS.CENTRALITY_LIST);
     if (!listEl) return;
@@ -560,7 +590,7 @@
               <div class="centrality-meta">
                 <span>${escapeHtml(item.year || "—")}</span>
                 <span>${escapeHtml(item.venue || "—")}</span>
-                <span>${labelMap[metricKey]} ${Number(item[metricKey] || 0).toFixed(2)}</span>
+                <span${metricKey === "between" ? bridgeNote : ""}>${labelMap[metricKey]} ${estimated && metricKey === "between" ? "≈" : ""}${Number(item[metricKey] || 0).toFixed(2)}</span>
               </div>
               <div class="centrality-pills">${pills.map((pill) => `<span class="centrality-pill">${escapeHtml(pill)}</span>`).join("")}</div>
             </div>
@@ -660,10 +690,12 @@
     const chart = window.echarts.init(dom);
     dashboardState.charts.collab = chart;
 
-    const rangeData = collaboration.ranges[dashboardState.collab.range] || collaboration.ranges.all || { nodes: [], links: [], authorMeta: {} };
-    const nodeCounts = new Map((rangeData.nodes || []).map((node) => [node.id, node.count || 0]));
+    const rangeData = collaboration.ranges[dashboardState.collab.range] || collaboration.ranges.all || { graph: null, authorMeta: {} };
+    const graph = rangeData.graph || { names: [], count: [], source: [], target: [], weight: [] };
     const metaMap = rangeData.authorMeta || {};
-    const maxCount = Math.max(...(rangeData.nodes || []).filter((node) => node.id !== "Benjamin Ampel").map((node) => node.count || 0), 1);
+    const maxCount = rangeData.maxCount || 1;
+    // Positions are precomputed at build time; without them fall back to a live force layout.
+    const hasLayout = Array.isArray(graph.x) && graph.x.length === graph.names.length;
 
     const myName = "Benjamin Ampel";
     const nameMap = {
@@ -673,22 +705,25 @@
       admin: myName,
     };
 
-    const nodes = (rangeData.nodes || []).map((node) => ({
-      id: node.id,
-      name: node.id,
-      value: node.count || 0,
-      symbolSize: node.id === myName ? 60 : Math.max(18, Math.min(52, (node.count || 0) * 7)),
-      fixed: node.id === myName,
-      x: node.id === myName ? dom.clientWidth / 2 : null,
-      y: node.id === myName ? dom.clientHeight / 2 : null,
-    }));
+    const nodes = graph.names.map((name, index) => {
+      const count = graph.count[index] || 0;
+      return {
+        id: name,
+        name,
+        value: count,
+        symbolSize: name === myName ? 60 : Math.max(18, Math.min(52, count * 7)),
+        fixed: hasLayout || name === myName,
+        x: hasLayout ? graph.x[index] : name === myName ? dom.clientWidth / 2 : null,
+        y: hasLayout ? graph.y[index] : name === myName ? dom.clientHeight / 2 : null,
+      };
+    });
 
-    const links = (rangeData.links || []).map((link) => ({
-      source: link.source,
-      target: link.target,
-      value: link.count,
+    const links = graph.source.map((source, index) => ({
+      source: graph.names[source],
+      target: graph.names[graph.target[index]],
+      value: graph.weight[index],
       lineStyle: {
-        width: Math.min(1.5 + (link.count * 0.8), 6),
+        width: Math.min(1.5 + (graph.weight[index] * 0.8), 6),
         opacity: 0.6,
       },
     }));
@@ -789,7 +824,7 @@
           series: [
             {
               type: "graph",
-              layout: "force",
+              layout: hasLayout ? "none" : "force",
               roam: true,
               zoom: 0.6,
               data: styledNodes,
@@ -1241,28 +1276,94 @@
     setTimeout(callback, 0);
   }
 
+  // The payload is sharded: data/dashboard/manifest.json lists one
+  // content-hashed file per section, and each panel fetches only the
+  // sections it renders, when it is about to scroll into view.
+  let manifestPromise = null;
+  const sectionPromises = {};
+
+  function loadSections(names) {
+    if (!manifestPromise) {
+      manifestPromise = fetch(buildUrl("data/dashboard/manifest.json"), { cache: "no-cache" })
+        .then((response) => (response.ok ? response.json() : null))
+        .catch(() => null);
+    }
+    return manifestPromise.then((manifest) => {
+      const sections = (manifest && manifest.sections) || {};
+      return Promise.all(
+        names.map((name) => {
+          if (!sectionPromises[name]) {
+            const entry = sections[name];
+            sectionPromises[name] = entry ? safeFetch(buildUrl(`data/dashboard/${entry.file}`)) : Promise.resolve(null);
+          }
+          return sectionPromises[name];
+        })
+      ).then((values) => {
+        const loaded = {};
+        names.forEach((name, index) => {
+          loaded[name] = values[index];
+        });
+        dashboardState.payload = Object.assign(dashboardState.payload || {}, loaded);
+        return loaded;
+      });
+    });
+  }
+
+  function whenVisible(ids, callback) {
+    const target = ids.map((id) => document.getElementById(id)).find(Boolean);
+    if (!target) return; // panel not on this page: never fetch its data
+    if (!("IntersectionObserver" in window)) {
+      callback();
+      return;
+    }
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (!entries.some((entry) => entry.isIntersecting)) return;
+        observer.disconnect();
+        callback();
+      },
+      { rootMargin: "300px 0px" }
+    );
+    observer.observe(target);
+  }
+
+  const PANELS = [
+    { ids: [IDS.TOPICS], sections: ["topics"], render: (data) => renderTopics(data.topics || []) },
+    { ids: [IDS.MAP], sections: ["impactGraph"], render: (data) => renderImpactMap(data.impactGraph || {}) },
+    { ids: [IDS.CENTRALITY_LIST, IDS.CENTRALITY_RADAR, IDS.CENTRALITY_DENSITY], sections: ["centrality"], render: (data) => renderCentrality(data.centrality) },
+    { ids: [IDS.COLLAB], sections: ["collaboration"], render: (data) => renderCollabNetwork(data.collaboration) },
+    { ids: [IDS.FOOTPRINT], sections: ["footprint"], render: (data) => renderFootprintMap(data.footprint || {}) },
+    { ids: [IDS.VISIT_TOTAL, IDS.VISIT_MONTH, IDS.VISIT_GEO, IDS.VISIT_LOCATIONS, IDS.VISIT_MINIMAP], sections: ["visitor"], render: (data) => renderVisitorStats(data.visitor || {}) },
+  ];
+
   function initDashboard() {
     if (dashboardState.initialized) return;
     dashboardState.initialized = true;
 
-    loadDashboardAssets()
-      .then(() => safeFetch(buildUrl("data/dashboard_payload.json")))
-      .then((payload) => {
-        if (!payload) return;
-        dashboardState.payload = payload;
-        renderMetricSummary(payload);
+    const assets = loadDashboardAssets();
+    Promise.all([assets, loadSections(["metrics", "scholar"])])
+      .then(([, data]) => {
+        if (!data.metrics || !data.scholar) return;
+        renderMetricSummary(data);
         scheduleWork(() => {
-          renderLine((payload.scholar && payload.scholar.citationsByYear) || []);
-          renderTopics(payload.topics || []);
-          renderImpactMap(payload.impactGraph || {});
-          renderCentrality(payload.network && payload.network.centrality);
-          renderCollabNetwork(payload.network && payload.network.collaboration);
-          renderFootprintMap(payload.footprint || {});
-          renderVisitorStats(payload.visitor || {});
+          renderLine(data.scholar.citationsByYear || []);
           refreshLayout();
         });
       })
       .catch((error) => console.error("Dashboard Error:", error));
+
+    PANELS.forEach((panel) => {
+      whenVisible(panel.ids, () => {
+        Promise.all([assets, loadSections(panel.sections)])
+          .then(([, data]) => {
+            scheduleWork(() => {
+              panel.render(data);
+              refreshLayout();
+            });
+          })
+          .catch((error) => console.error("Dashboard Error:", error));
+      });
+    });
   }
 
   const dashboardDetails = wrapper.closest("details");
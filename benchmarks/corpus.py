@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Synthetic publication corpora for the dashboard builder benchmarks.
+
+A corpus looks like what the pipeline feeds the builders: a publications.json
+list and a scholar-metrics.json dict. Distributions are drawn from the site's
+own data so the builders see realistic inputs:
+
+- title words come from the current publication titles and the dashboard's
+  topic taxonomy, with Zipf-like frequencies;
+- authors come from a pool that grows with the corpus (a research center, not
+  one CV), with skewed productivity and 1-10 authors per paper;
+- journal venues come from the site's venues and the Q1/FT50/UTD24 lists,
+  conference/workshop venues from data/venue_locations.yaml (a few are left
+  unmatched on purpose);
+- years skew recent and citations are heavy-tailed.
+
+Generation is deterministic for a given size and seed.
+
+Usage:
+    python benchmarks/corpus.py 5000 --out /tmp/corpus-5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+from datetime import date
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATIC_DATA = PROJECT_ROOT / "static" / "data"
+DATA_DIR = PROJECT_ROOT / "data"
+
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from build_dashboard_payload import STOP_WORDS  # noqa: E402
+from lib.topics import TOPIC_TAXONOMY  # noqa: E402
+
+MAIN_AUTHOR = "Benjamin M. Ampel"
+
+FIRST_NAMES = [
+    "Hsinchun", "Mark", "Sagar", "Steven", "Kaeli", "Tala", "Ryan", "Maria", "Wei", "Priya",
+    "James", "Olivia", "Noah", "Ava", "Liam", "Sofia", "Ethan", "Mia", "Lucas", "Amelia",
+    "Yuki", "Chen", "Fatima", "Omar", "Elena", "Ivan", "Aisha", "Diego", "Hana", "Kofi",
+    "Laura", "Marco", "Nina", "Pedro", "Rosa", "Sven", "Tariq", "Uma", "Victor", "Zoe",
+]
+LAST_NAMES = [
+    "Chen", "Patton", "Samtani", "Ullman", "Otto", "Vahedi", "Reyes", "Garcia", "Zhang", "Patel",
+    "Smith", "Johnson", "Lee", "Kim", "Nguyen", "Brown", "Wang", "Li", "Liu", "Martin",
+    "Tanaka", "Hassan", "Ivanova", "Rossi", "Silva", "Kowalski", "Okafor", "Muller", "Larsen", "Haddad",
+    "Yang", "Lopez", "Singh", "Walker", "Young", "Hill", "Scott", "Green", "Adams", "Baker",
+]
+FILLER_WORDS = [
+    "approach", "framework", "analysis", "study", "towards", "using", "based", "novel", "design",
+    "empirical", "evaluation", "systems", "methods", "perspective", "investigation", "model",
+]
+
+
+def _zipf_weights(count: int, exponent: float = 1.1):
+    return [1.0 / ((rank + 1) ** exponent) for rank in range(count)]
+
+
+def _load_json(path: Path, default):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return default
+
+
+def _vocabulary():
+    words = []
+    for publication in _load_json(STATIC_DATA / "publications.json", []):
+        for word in re.sub(r"[^A-Za-z0-9 -]", " ", publication.get("title", "")).split():
+            if len(word) > 3 and word.lower() not in STOP_WORDS:
+                words.append(word)
+    for keywords in TOPIC_TAXONOMY.values():
+        for keyword in keywords:
+            words.extend(keyword.title().split())
+    words.extend(FILLER_WORDS)
+    # Most frequent first so the Zipf weights favour them.
+    counts = {}
+    for word in words:
+        counts[word] = counts.get(word, 0) + 1
+    return sorted(counts, key=lambda word: (-counts[word], word))
+
+
+def _journal_venues():
+    venues = {pub.get("venue") for pub in _load_json(STATIC_DATA / "publications.json", []) if pub.get("type") == "journal"}
+    for list_name in ("q1", "ft50", "utd24"):
+        raw = _load_json(STATIC_DATA / "journal_lists" / f"{list_name}.json", [])
+        entries = raw if isinstance(raw, list) else raw.get("journals", [])
+        venues.update(item.get("name") if isinstance(item, dict) else item for item in entries)
+    return sorted(venue for venue in venues if venue)
+
+
+def _conference_rules():
+    try:
+        rules = yaml.safe_load((DATA_DIR / "venue_locations.yaml").read_text(encoding="utf-8")) or []
+    except (OSError, yaml.YAMLError):
+        rules = []
+    return [rule for rule in rules if isinstance(rule, dict) and rule.get("match")]
+
+
+def _author_pool(rng: random.Random, size: int):
+    names = [f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES]
+    rng.shuffle(names)
+    pool = names[:size]
+    # A few middle initials and "Last, First" spellings, as scraped data has.
+    for index in range(0, len(pool), 17):
+        first, last = pool[index].split(" ", 1)
+        pool[index] = f"{last}, {first}" if index % 2 else f"{first} {chr(65 + index % 26)}. {last}"
+    return pool
+
+
+def generate(size: int, seed: int = 0, current_year: int = None):
+    """Return (publications, scholar) for a corpus of `size` papers."""
+    rng = random.Random(f"{seed}:{size}")
+    current_year = current_year or date.today().year
+
+    vocabulary = _vocabulary()
+    # Flatter than the real 41-paper CV so a large corpus is not one topic
+    # cluster; gives a co-occurrence density close to the site's own (~0.15).
+    word_weights = _zipf_weights(len(vocabulary), 0.5)
+    journals = _journal_venues()
+    journal_weights = _zipf_weights(len(journals), 0.9)
+    rules = _conference_rules()
+    rule_weights = _zipf_weights(len(rules), 0.7)
+
+    authors = _author_pool(rng, max(25, min(len(FIRST_NAMES) * len(LAST_NAMES), size // 3)))
+    author_weights = _zipf_weights(len(authors), 0.9)
+    author_counts = [1, 2, 3, 4, 5, 6, 7, 8, 10]
+    author_count_weights = [5, 15, 30, 25, 12, 6, 3, 2, 2]
+
+    years = list(range(current_year - 14, current_year + 1))
+    year_weights = [1.0 + index * 0.4 for index in range(len(years))]
+
+    publications = []
+    seen_titles = set()
+    for index in range(size):
+        title_words = []
+        for word in rng.choices(vocabulary, weights=word_weights, k=rng.randint(6, 14)):
+            if word not in title_words:
+                title_words.append(word)
+        title = " ".join(title_words)
+        title = title[0].upper() + title[1:]
+        if title.lower() in seen_titles:
+            title = f"{title} {index}"
+        seen_titles.add(title.lower())
+
+        team = set(rng.choices(authors, weights=author_weights, k=rng.choices(author_counts, author_count_weights)[0]))
+        if rng.random() < 0.3:
+            team.add(MAIN_AUTHOR)
+        team = sorted(team)
+        rng.shuffle(team)
+
+        kind = rng.choices(["journal", "conference", "workshop"], weights=[45, 40, 15])[0]
+        year = rng.choices(years, weights=year_weights)[0]
+        if kind == "journal":
+            venue = rng.choices(journals, weights=journal_weights)[0]
+        elif rules and rng.random() < 0.95:
+            rule = rng.choices(rules, weights=rule_weights)[0]
+            venue = rule["match"]
+            year = rule.get("year", year)
+        else:
+            venue = f"Workshop on {' '.join(rng.sample(vocabulary[:200], 2))}"
+
+        publications.append({
+            "title": title,
+            "authors": team,
+            "year": year,
+            "type": kind,
+            "venue": venue,
+            "url": f"/{kind}_publication/synthetic-{index}/",
+            "date": f"{year}-{rng.randint(1, 12):02d}-01",
+            "abstract": " ".join(rng.choices(vocabulary, weights=word_weights, k=60)),
+            "award": None,
+            "featured": False,
+        })
+
+    scholar_pubs = []
+    citations_by_year = {}
+    for publication in publications:
+        if rng.random() < 0.15:
+            continue  # not every paper is on Scholar
+        age = current_year - publication["year"]
+        citations = int(rng.paretovariate(1.3) * max(age, 0.5)) - 1
+        scholar_pubs.append({
+            "title": publication["title"] if rng.random() < 0.8 else publication["title"].upper(),
+            "citations": max(citations, 0),
+            "year": str(publication["year"]),
+            "authors": ", ".join(publication["authors"]),
+            "venue": f"{publication['venue']}, {publication['year']}",
+        })
+        for offset in range(max(age, 0) + 1):
+            year = publication["year"] + offset
+            citations_by_year[year] = citations_by_year.get(year, 0) + max(citations, 0) // (age + 1)
+
+    total = sum(pub["citations"] for pub in scholar_pubs)
+    scholar = {
+        "lastUpdated": f"{current_year}-01-01",
+        "metrics": {
+            "citations": total,
+            "hIndex": sum(1 for rank, c in enumerate(sorted((p["citations"] for p in scholar_pubs), reverse=True), 1) if c >= rank),
+            "i10Index": sum(1 for pub in scholar_pubs if pub["citations"] >= 10),
+            "publications": len(scholar_pubs),
+        },
+        "citationsByYear": [{"year": str(year), "citations": count} for year, count in sorted(citations_by_year.items())],
+        "individualPublications": scholar_pubs,
+    }
+    return publications, scholar
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("size", type=int, help="number of papers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, required=True, help="directory for publications.json and scholar-metrics.json")
+    args = parser.parse_args(argv)
+
+    publications, scholar = generate(args.size, args.seed)
+    args.out.mkdir(parents=True, exist_ok=True)
+    (args.out / "publications.json").write_text(json.dumps(publications, indent=2) + "\n", encoding="utf-8")
+    (args.out / "scholar-metrics.json").write_text(json.dumps(scholar, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote {len(publications)} papers to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Time the dashboard builders on synthetic corpora.
+
+Each (builder, corpus size) case runs in a forked worker with a time limit,
+so a builder that falls over at some size is recorded as a timeout instead
+of hanging the suite; larger sizes of a builder that timed out are skipped.
+Results are written as JSON (see RESULT_SCHEMA) and can be compared with an
+earlier run to spot regressions.
+
+Usage:
+    python benchmarks/run.py                             # 50, 500, 5000, 20000 papers
+    python benchmarks/run.py --sizes 50 500 --repeat 5
+    python benchmarks/run.py --only build_impact_graph compute_centrality
+    python benchmarks/run.py --compare benchmarks/results/<earlier>.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+RESULT_SCHEMA = 1
+
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+import corpus  # noqa: E402
+
+DEFAULT_SIZES = [50, 500, 5000, 20000]
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+# Each case prepares its inputs the way the builder's script does (untimed)
+# and returns a callable that runs the builder once, plus a size summary of
+# the result so runs of different code can be checked for equal output size.
+
+def _payload_inputs(publications, scholar):
+    import build_dashboard_payload as payload
+
+    merged = payload.merge_publication_citations(publications, scholar)
+    for publication in merged:
+        match = payload.classify(publication.get("title", ""))
+        publication["topic"] = match.primary
+        publication["topicHits"] = dict(match.hits)
+    return payload, merged
+
+
+def case_build_impact_graph(publications, scholar):
+    payload, merged = _payload_inputs(publications, scholar)
+    run = lambda: payload.build_impact_graph(merged)  # noqa: E731
+    summary = lambda graph: {"nodes": len(graph["nodes"]), "links": len(graph["links"])}  # noqa: E731
+    return run, summary
+
+
+def case_build_impact_stats(publications, scholar):
+    payload, merged = _payload_inputs(publications, scholar)
+    run = lambda: payload.build_impact_stats(merged, scholar, [])  # noqa: E731
+    summary = lambda stats: {key: stats[key]["value"] for key in ("journals", "q1", "ft50", "utd24")}  # noqa: E731
+    return run, summary
+
+
+def case_enrich_footprint_points(publications, scholar):
+    payload, merged = _payload_inputs(publications, scholar)
+    run = lambda: payload.enrich_footprint_points(merged)  # noqa: E731
+    summary = lambda footprint: {"points": len(footprint["points"]), "routes": len(footprint["routes"])}  # noqa: E731
+    return run, summary
+
+
+def _metrics_inputs(publications, scholar):
+    import build_dashboard_metrics as metrics
+
+    citations = {
+        metrics.normalize_title(pub["title"]): int(pub.get("citations") or 0)
+        for pub in scholar.get("individualPublications", [])
+    }
+    prepared = []
+    for pub in publications:
+        item = dict(pub)
+        key = metrics.normalize_title(item.get("title") or "")
+        if key in citations:
+            item["citations"] = citations[key]
+        prepared.append(item)
+    return metrics, prepared
+
+
+def case_compute_centrality(publications, scholar):
+    metrics, prepared = _metrics_inputs(publications, scholar)
+    run = lambda: metrics.compute_centrality(prepared)  # noqa: E731
+    summary = lambda result: {"papers": len(result["papers"]), **result["metrics"]}  # noqa: E731
+    return run, summary
+
+
+def case_compute_collaboration(publications, scholar):
+    metrics, prepared = _metrics_inputs(publications, scholar)
+    run = lambda: metrics.compute_collaboration(prepared)  # noqa: E731
+    summary = lambda result: {  # noqa: E731
+        name: {"nodes": len(data["graph"]["names"]), "links": len(data["graph"]["source"])}
+        for name, data in result["ranges"].items()
+    }
+    return run, summary
+
+
+def case_draw_network_plot(publications, scholar):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    import generate_network as network
+
+    _, coauthor_counts = network.build_network_data(publications)
+    layout = network.plot_layout(coauthor_counts)
+
+    def run():
+        figure = network.draw_network_plot(layout, network.PALETTES["light"])
+        figure.canvas.draw()  # rasterize, as savefig would
+        plt.close(figure)
+        return len(coauthor_counts)
+
+    return run, lambda coauthors: {"coauthors": coauthors}
+
+
+CASES = {
+    "build_impact_graph": case_build_impact_graph,
+    "compute_centrality": case_compute_centrality,
+    "compute_collaboration": case_compute_collaboration,
+    "build_impact_stats": case_build_impact_stats,
+    "enrich_footprint_points": case_enrich_footprint_points,
+    "draw_network_plot": case_draw_network_plot,
+}
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _worker(name, size, seed, repeat, budget, queue):
+    try:
+        publications, scholar = corpus.generate(size, seed)
+        run, summary = CASES[name](publications, scholar)
+        times = []
+        result = None
+        # The builders print warnings (e.g. unmatched venues); keep them out of the report.
+        with contextlib.redirect_stdout(io.StringIO()):
+            while len(times) < repeat:
+                started = time.perf_counter()
+                result = run()
+                times.append(time.perf_counter() - started)
+                if sum(times) > budget:
+                    break
+        queue.put({"status": "ok", "runs": times, "output": summary(result), "peakRssKb": _peak_rss_kb()})
+    except Exception as exc:  # reported, not raised: one broken case should not stop the suite
+        queue.put({"status": "error", "error": f"{type(exc).__name__}: {exc}"})
+
+
+def run_case(name, size, seed=0, repeat=3, timeout=120.0):
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    queue = context.Queue()
+    process = context.Process(target=_worker, args=(name, size, seed, repeat, timeout / 4, queue))
+    started = time.perf_counter()
+    process.start()
+    try:
+        outcome = queue.get(timeout=timeout)
+    except Exception:
+        outcome = {"status": "timeout", "timeout": timeout}
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+    outcome.update({"benchmark": name, "papers": size, "elapsed": round(time.perf_counter() - started, 3)})
+    if outcome["status"] == "ok":
+        runs = outcome["runs"]
+        outcome.update({
+            "runs": [round(value, 6) for value in runs],
+            "min": round(min(runs), 6),
+            "median": round(statistics.median(runs), 6),
+        })
+    return outcome
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names, sizes, seed=0, repeat=3, timeout=120.0, log=print):
+    results = []
+    for name in names:
+        fell_over = None
+        for size in sorted(sizes):
+            if fell_over is not None:
+                results.append({"benchmark": name, "papers": size, "status": "skipped", "reason": fell_over})
+                log(f"{name:26s} {size:>6d}  skipped")
+                continue
+            outcome = run_case(name, size, seed, repeat, timeout)
+            results.append(outcome)
+            if outcome["status"] == "ok":
+                log(f"{name:26s} {size:>6d}  median {outcome['median']:10.4f}s  min {outcome['min']:10.4f}s  "
+                    f"rss {outcome['peakRssKb'] / 1024:7.1f} MB  {outcome['output']}")
+            else:
+                log(f"{name:26s} {size:>6d}  {outcome['status'].upper()} {outcome.get('error', '')}")
+                fell_over = f"{outcome['status']} at {size} papers"
+    return {
+        "schema": RESULT_SCHEMA,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpuCount": os.cpu_count(),
+        "settings": {"seed": seed, "repeat": repeat, "timeout": timeout},
+        "results": results,
+    }
+
+
+def compare(current, previous, threshold=1.25):
+    """Print median-time ratios against an earlier run. Returns the regressed cases."""
+    before = {(item["benchmark"], item["papers"]): item for item in previous.get("results", [])}
+    regressions = []
+    print(f"\nCompared with {previous.get('commit') or '?'} ({previous.get('created')}):")
+    for item in current["results"]:
+        key = (item["benchmark"], item["papers"])
+        old = before.get(key)
+        if old is None:
+            continue
+        if item["status"] == "ok" and old.get("status") == "ok":
+            ratio = item["median"] / old["median"] if old["median"] else float("inf")
+            flag = "REGRESSION" if ratio > threshold else ("faster" if ratio < 1 / threshold else "")
+            same = "" if item.get("output") == old.get("output") else "  output differs"
+            print(f"  {key[0]:26s} {key[1]:>6d}  {old['median']:10.4f}s -> {item['median']:10.4f}s  x{ratio:6.2f} {flag}{same}")
+            if ratio > threshold:
+                regressions.append(key)
+        elif item["status"] != old.get("status"):
+            print(f"  {key[0]:26s} {key[1]:>6d}  {old.get('status')} -> {item['status']}")
+            if old.get("status") == "ok":
+                regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="corpus sizes (papers)")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="builders to time")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (fewer if a case is slow)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a case counts as fallen over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None, help="results file (default benchmarks/results/<stamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 if any case regressed")
+    args = parser.parse_args(argv)
+
+    os.chdir(PROJECT_ROOT)
+    names = args.only or list(CASES)
+    report = run_suite(names, args.sizes, args.seed, args.repeat, args.timeout)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\nWrote {output}")
+
+    if args.compare:
+        regressions = compare(report, json.loads(args.compare.read_text(encoding="utf-8")), args.threshold)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,52 +3,47 @@
 Precompute dashboard network metrics (centrality + collaboration) to reduce
 client-side processing in the Research Dashboard.
 
+Betweenness, average path and clustering are exact for graphs of the
+site's size and estimated from sampled pivots above that; the mode used is
+recorded in centrality.estimation (see lib/centrality.py, CENTRALITY_MODE).
+Collaboration networks are built for each window in COLLABORATION_RANGES
+(overridable through the environment variable of the same name) from one
+pass of per-year tallies, and written as compact graphs with a shared,
+precomputed layout (lib/graph_export.py).
+
 Outputs:
   static/data/dashboard_network.json
 """
 
 from __future__ import annotations
 
-import json
 import networkx as nx
+import numpy as np
+import os
 import re
-from collections import defaultdict
+import scipy.sparse as sp
 from datetime import datetime
+from itertools import combinations
+from operator import itemgetter
 from pathlib import Path
 
+from lib import artifacts, centrality, instrument
+from lib.authors import is_main, main_author, resolve
+from lib.graph_export import compact_graph, layout
+
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 PUBLICATIONS_FILE = PROJECT_ROOT / "static" / "data" / "publications.json"
 SCHOLAR_FILE = PROJECT_ROOT / "static" / "data" / "scholar-metrics.json"
 OUTPUT_FILE = PROJECT_ROOT / "static" / "data" / "dashboard_network.json"
 
-NAME_MAP = {
-    'B Ampel': 'Benjamin Ampel', 'BM Ampel': 'Benjamin Ampel', 'B. Ampel': 'Benjamin Ampel', 'admin': 'Benjamin Ampel',
-    'H Chen': 'Hsinchun Chen', 'H. Chen': 'Hsinchun Chen',
-    'S Samtani': 'Sagar Samtani', 'S. Samtani': 'Sagar Samtani',
-    'S Ullman': 'Steven Ullman', 'S. Ullman': 'Steven Ullman',
-    'H Zhu': 'Hongyi Zhu', 'H. Zhu': 'Hongyi Zhu',
-    'M Patton': 'Mark Patton', 'M. Patton': 'Mark Patton',
-    'B Lazarine': 'Ben Lazarine', 'B. Lazarine': 'Ben Lazarine',
-    'T Vahedi': 'Tala Vahedi', 'T. Vahedi': 'Tala Vahedi',
-    'K Otto': 'Kaeli Otto', 'K. Otto': 'Kaeli Otto',
-    'Y Gao': 'Yang Gao', 'Y. Gao': 'Yang Gao',
-    'J Hu': 'James Hu', 'J. Hu': 'James Hu',
-    'CH Yang': 'Chi-Heng Yang', 'JF Nunamaker Jr': 'Jay Nunamaker',
-    'C Marx': 'Carolin Marx', 'C Dacosta': 'Cade Dacosta',
-    'C Zhang': 'Chengjun Zhang', 'M Hashim': 'Matthew Hashim',
-    'M Wagner': 'Mason Wagner', 'RY Reyes': 'Raul Reyes',
-    'S Yang': 'Shanchieh Yang', 'Y Li': 'Yidong Li', 'Y. Li': 'Yidong Li'
-}
-
-MAIN_AUTHOR = 'Benjamin Ampel'
+# Collaboration windows: 'all', N recent years or a YYYY-YYYY span
+# (comma-separated; COLLABORATION_RANGES in the environment overrides).
+COLLABORATION_RANGES = 'all,5,3,2'
 
 
 def load_json(path: Path):
-    if not path.exists():
-        return None
-    with path.open('r', encoding='utf-8') as f:
-        return json.load(f)
+    return artifacts.read_json(path)
 
 
 def normalize_title(title: str) -> str:
@@ -70,7 +65,8 @@ def load_publications():
         return []
     if isinstance(data, dict) and 'individualPublications' in data:
         data = data.get('individualPublications', [])
-    return data if isinstance(data, list) else []
+    # Copy each record: main() adds citation counts and the parsed file may be shared.
+    return [dict(pub) for pub in data] if isinstance(data, list) else []
 
 
 def load_citation_map():
@@ -88,12 +84,7 @@ def load_citation_map():
 
 
 def normalize_name(name: str) -> str:
-    clean = re.sub(r'\s+', ' ', (name or '').strip())
-    if ',' in clean:
-        parts = [p.strip() for p in clean.split(',') if p.strip()]
-        if len(parts) >= 2:
-            clean = f"{parts[1]} {parts[0]}"
-    return NAME_MAP.get(clean, clean)
+    return resolve(name)
 
 
 def author_list(raw):
@@ -114,78 +105,102 @@ def percentile(arr, p):
     return sorted_vals[idx]
 
 
+def incidence_matrix(item_sets):
+    """Binary papers x items CSR matrix (one row per set in `item_sets`)."""
+    columns = {}
+    indices = [columns.setdefault(item, len(columns)) for items in item_sets for item in items]
+    indptr = np.cumsum([0] + [len(items) for items in item_sets])
+    data = np.ones(len(indices), dtype=np.int32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(item_sets), len(columns)), dtype=np.int32)
+
+
+def overlap_totals(matrix):
+    """Per paper, items shared with every other paper summed: row sums of
+    X·Xᵀ without the diagonal, computed as X·(Xᵀ·1) - X·1."""
+    per_item = np.asarray(matrix.sum(axis=0)).ravel()
+    own = np.asarray(matrix.sum(axis=1)).ravel()
+    return (matrix @ per_item - own).astype(int).tolist()
+
+
+def pair_overlaps(matrix, minimum=1, block=2048):
+    """Pairs i < j whose shared-item count in X·Xᵀ is at least `minimum`.
+
+    Returns (rows, cols, counts) sorted by (row, col). The product is taken a
+    block of rows at a time so memory follows the number of linked pairs.
+    """
+    matrix = matrix.tocsr()
+    transposed = matrix.T.tocsc()
+    parts = []
+    for start in range(0, matrix.shape[0], block):
+        product = (matrix[start:start + block] @ transposed).tocoo()
+        rows = product.row + start
+        keep = (product.col > rows) & (product.data >= minimum)
+        parts.append((rows[keep], product.col[keep], product.data[keep]))
+    rows = np.concatenate([part[0] for part in parts])
+    cols = np.concatenate([part[1] for part in parts])
+    counts = np.concatenate([part[2] for part in parts])
+    order = np.lexsort((cols, rows))
+    return rows[order], cols[order], counts[order]
+
+
 def compute_centrality(publications):
     n = len(publications)
     if n == 0:
         return {
             'papers': [],
             'metrics': {'density': 0, 'avgPath': 0, 'clustering': 0},
+            'estimation': {'mode': 'exact', 'nodes': 0, 'edges': 0},
             'thresholds': {'topic': 0, 'venue': 0, 'author': 0, 'citation': 0},
             'maxLinks': {'topic': 1, 'venue': 1, 'author': 1}
         }
 
-    graph = nx.Graph()
-    graph.add_nodes_from(range(n))
-    degrees = [0] * n
-    topic_links = [0] * n
-    venue_links = [0] * n
-    author_links = [0] * n
-
     author_sets = []
     word_sets = []
-
     for pub in publications:
-        authors = author_list(pub.get('authors', []))
-        author_sets.append({re.sub(r'\s+', ' ', a.lower()).strip() for a in authors if a})
+        author_sets.append({normalize_name(a) for a in author_list(pub.get('authors', [])) if a})
         title = (pub.get('title') or '').lower()
         title = re.sub(r'[^a-z0-9 ]', ' ', title)
         word_sets.append({w for w in title.split() if len(w) > 4})
 
-    for i in range(n):
-        for j in range(i + 1, n):
-            p1 = publications[i]
-            p2 = publications[j]
-            weight = 0
-            if p1.get('venue') and p1.get('venue') == p2.get('venue'):
-                weight += 1
-                venue_links[i] += 1
-                venue_links[j] += 1
-
-            common_words = len(word_sets[i].intersection(word_sets[j]))
-            if common_words > 0:
-                weight += common_words * 0.5
-                topic_links[i] += common_words
-                topic_links[j] += common_words
-
-            common_authors = len(author_sets[i].intersection(author_sets[j]))
-            if common_authors > 0:
-                author_links[i] += common_authors
-                author_links[j] += common_authors
-
-            if weight > 0.5:
-                graph.add_edge(i, j, weight=weight)
-                degrees[i] += 1
-                degrees[j] += 1
+    words = incidence_matrix(word_sets)
+    authors = incidence_matrix(author_sets)
+    venues = incidence_matrix([{pub.get('venue')} if pub.get('venue') else set() for pub in publications])
+
+    topic_links = overlap_totals(words)
+    venue_links = overlap_totals(venues)
+    author_links = overlap_totals(authors)
+
+    # Edge weight is venue match + 0.5 per shared title word; kept doubled
+    # (2 * venue + words) so it stays an exact integer until the end.
+    rows, cols, doubled = pair_overlaps(sp.hstack([venues, venues, words], format='csr'), minimum=2)
+    degrees = np.bincount(np.concatenate([rows, cols]), minlength=n).tolist()
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_weighted_edges_from(zip(rows.tolist(), cols.tolist(), (doubled / 2).tolist()))
 
     if graph.number_of_edges():
         try:
             eigen_map = nx.eigenvector_centrality_numpy(graph, weight="weight")
         except Exception:
             eigen_map = nx.eigenvector_centrality(graph, max_iter=500, weight="weight")
-        betweenness_map = nx.betweenness_centrality(graph, normalized=False, weight=None)
+        adjacency = sp.csr_array(
+            (np.ones(2 * len(rows)), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(n, n),
+        )
+        measured = centrality.measure(graph, adjacency=adjacency)
+        betweenness_map = dict(enumerate(measured['between']))
         density = nx.density(graph)
-        clustering_coeff = nx.average_clustering(graph)
-        largest_component = max(nx.connected_components(graph), key=len)
-        if len(largest_component) > 1:
-            avg_path = nx.average_shortest_path_length(graph.subgraph(largest_component))
-        else:
-            avg_path = 0
+        clustering_coeff = measured['clustering']
+        avg_path = measured['avgPath']
+        estimation = measured['estimation']
     else:
         eigen_map = {index: 0 for index in range(n)}
         betweenness_map = {index: 0 for index in range(n)}
         density = 0
         clustering_coeff = 0
         avg_path = 0
+        estimation = {'mode': 'exact', 'nodes': n, 'edges': 0}
 
     centrality_info = []
     for i, pub in enumerate(publications):
@@ -220,6 +235,7 @@ def compute_centrality(publications):
             'avgPath': round(avg_path, 4),
             'clustering': round(clustering_coeff, 4)
         },
+        'estimation': estimation,
         'thresholds': {
             'topic': topic_thresh,
             'venue': venue_thresh,
@@ -234,67 +250,102 @@ def compute_centrality(publications):
     }
 
 
-def build_collaboration_range(publications, current_year, years_back=None):
-    if years_back:
-        min_year = current_year - years_back + 1
-        filtered = [p for p in publications if (ensure_int(p.get('year')) or 0) >= min_year]
-    else:
-        filtered = publications
+def _tally(counts, first, keys, index):
+    """Count `keys` and note `index` as where each key was first seen."""
+    for key in keys:
+        if key in counts:
+            counts[key] += 1
+        else:
+            counts[key] = 1
+            first[key] = index
 
-    node_counts = defaultdict(int)
-    link_counts = defaultdict(int)
-    author_meta = {}
-    max_count = 0
 
-    for pub in filtered:
-        raw_authors = author_list(pub.get('authors'))
-        authors = sorted({normalize_name(a) for a in raw_authors if a})
-        if not authors:
-            continue
+def _merge_tallies(counts, first, bucket_counts, bucket_first):
+    for key, count in bucket_counts.items():
+        if key in counts:
+            counts[key] += count
+            if bucket_first[key] < first[key]:
+                first[key] = bucket_first[key]
+        else:
+            counts[key] = count
+            first[key] = bucket_first[key]
+
+
+def _in_first_seen_order(first):
+    """Keys ordered as a single pass over the publications would first meet them:
+    by first publication, then by name (authors are processed sorted)."""
+    return [key for key, _ in sorted(first.items(), key=itemgetter(1, 0))]
+
+
+def _empty_collaboration():
+    return {'nodes': ({}, {}), 'pairs': ({}, {}), 'venues': {}, 'years': {}}
 
-        for author in authors:
-            node_counts[author] += 1
-            if author != MAIN_AUTHOR and node_counts[author] > max_count:
-                max_count = node_counts[author]
-
-            meta = author_meta.setdefault(author, {
-                'count': 0,
-                'years': set(),
-                'venues': defaultdict(int),
-                'coauthors': defaultdict(int)
-            })
-            meta['count'] += 1
-            year_val = ensure_int(pub.get('year'))
-            if year_val:
-                meta['years'].add(year_val)
-            venue = pub.get('venue')
-            if venue:
-                meta['venues'][venue] += 1
-
-        for i in range(len(authors)):
-            for j in range(i + 1, len(authors)):
-                a = authors[i]
-                b = authors[j]
-                pair = "|".join(sorted([a, b]))
-                link_counts[pair] += 1
-
-                author_meta[a]['coauthors'][b] += 1
-                author_meta[b]['coauthors'][a] += 1
-
-    nodes = [{'id': name, 'count': count} for name, count in node_counts.items()]
-    links = []
-    for pair, count in link_counts.items():
-        source, target = pair.split('|', 1)
-        links.append({'source': source, 'target': target, 'count': count})
 
+def collaboration_buckets(publications):
+    """Per-year collaboration tallies from one pass over the publications.
+
+    Each bucket holds, for that year (0 when unknown), author paper counts,
+    co-author pair counts and per-author venue counts, each as (counts, first
+    publication index) so merged windows keep the output order of a plain
+    pass over the filtered list. Co-author counts are the pair counts.
+    """
+    buckets = {}
+    for index, pub in enumerate(publications):
+        authors = sorted({normalize_name(a) for a in author_list(pub.get('authors')) if a})
+        if not authors:
+            continue
+        year = ensure_int(pub.get('year')) or 0
+        bucket = buckets.get(year)
+        if bucket is None:
+            bucket = buckets[year] = _empty_collaboration()
+        _tally(*bucket['nodes'], authors, index)
+        venue = pub.get('venue')
+        if venue:
+            for author in authors:
+                _tally(*bucket['venues'].setdefault(author, ({}, {})), (venue,), index)
+        if len(authors) > 1:
+            _tally(*bucket['pairs'], combinations(authors, 2), index)
+    return buckets
+
+
+def _merge_bucket(window, year, bucket):
+    _merge_tallies(*window['nodes'], *bucket['nodes'])
+    _merge_tallies(*window['pairs'], *bucket['pairs'])
+    venues = window['venues']
+    for author, tallies in bucket['venues'].items():
+        if author in venues:
+            _merge_tallies(*venues[author], *tallies)
+        else:
+            venues[author] = (dict(tallies[0]), dict(tallies[1]))
+    if year:
+        years = window['years']
+        for author in bucket['nodes'][0]:
+            years.setdefault(author, set()).add(year)
+
+
+def _collaboration_output(window):
+    node_counts, node_first = window['nodes']
+    link_counts, link_first = window['pairs']
+    authors = _in_first_seen_order(node_first)
+    nodes = [{'id': name, 'count': node_counts[name]} for name in authors]
     meta_out = {}
-    for name, meta in author_meta.items():
+    for name in authors:
+        venue_counts, venue_first = window['venues'].get(name, ({}, {}))
         meta_out[name] = {
-            'count': meta['count'],
-            'years': sorted(meta['years']),
-            'venues': dict(meta['venues']),
-            'coauthors': dict(meta['coauthors'])
+            'count': node_counts[name],
+            'years': sorted(window['years'].get(name, ())),
+            'venues': {venue: venue_counts[venue] for venue in _in_first_seen_order(venue_first)},
+            'coauthors': {}
         }
+    # In first-seen pair order, each author meets its co-authors by first
+    # shared publication and then by name.
+    links = []
+    for source, target in _in_first_seen_order(link_first):
+        count = link_counts[(source, target)]
+        links.append({'source': source, 'target': target, 'count': count})
+        meta_out[source]['coauthors'][target] = count
+        meta_out[target]['coauthors'][source] = count
+    max_count = max((node_counts[name] for name in authors if not is_main(name)), default=0)
 
     return {
         'nodes': nodes,
@@ -304,17 +355,89 @@ def build_collaboration_range(publications, current_year, years_back=None):
     }
 
 
-def compute_collaboration(publications):
-    current_year = datetime.now().year
-    ranges = {
-        'all': build_collaboration_range(publications, current_year, None),
-        '5': build_collaboration_range(publications, current_year, 5),
-        '3': build_collaboration_range(publications, current_year, 3),
-        '2': build_collaboration_range(publications, current_year, 2)
-    }
-    return {'currentYear': current_year, 'ranges': ranges}
+def merge_collaboration_buckets(buckets, first_year=None, last_year=None):
+    """Collaboration network for publications with first_year <= year <= last_year
+    (either bound may be None), merged from collaboration_buckets()."""
+    window = _empty_collaboration()
+    for year, bucket in buckets.items():
+        if (first_year is None or year >= first_year) and (last_year is None or year <= last_year):
+            _merge_bucket(window, year, bucket)
+    return _collaboration_output(window)
+
+
+def parse_collaboration_ranges(spec):
+    """Range names -> (first_year, last_year) offsets. A name is 'all', a number
+    of recent years ('5': this year and the four before) or a span ('2015-2019')."""
+    ranges = {}
+    for name in (part.strip() for part in spec.split(',')):
+        if not name:
+            continue
+        if name == 'all':
+            ranges[name] = None
+        elif name.isdigit() and int(name) > 0:
+            ranges[name] = int(name)
+        elif re.fullmatch(r'\d{4}-\d{4}', name):
+            first, last = (int(year) for year in name.split('-'))
+            ranges[name] = (min(first, last), max(first, last))
+        else:
+            raise ValueError(f"Invalid collaboration range {name!r} (use all, N years or YYYY-YYYY)")
+    return ranges
+
 
+def configured_collaboration_ranges():
+    return parse_collaboration_ranges(os.environ.get('COLLABORATION_RANGES') or COLLABORATION_RANGES)
 
+
+def compute_collaboration(publications, ranges=None):
+    current_year = datetime.now().year
+    if ranges is None:
+        ranges = configured_collaboration_ranges()
+    buckets = collaboration_buckets(publications)
+    windows = {}
+
+    # "All" and the recent-years windows are nested, so they come from one
+    # running merge, newest years first; each bucket is merged once.
+    recent = sorted(
+        ((current_year - span + 1 if span else None, name) for name, span in ranges.items() if not isinstance(span, tuple)),
+        key=lambda item: -item[0] if item[0] is not None else float('inf'),
+    )
+    years = sorted(buckets, reverse=True)
+    window = _empty_collaboration()
+    for first_year, name in recent:
+        while years and (first_year is None or years[0] >= first_year):
+            year = years.pop(0)
+            _merge_bucket(window, year, buckets[year])
+        windows[name] = _collaboration_output(window)
+
+    for name, span in ranges.items():
+        if isinstance(span, tuple):
+            windows[name] = merge_collaboration_buckets(buckets, *span)
+    return {'currentYear': current_year, 'ranges': compact_collaboration({name: windows[name] for name in ranges})}
+
+
+def compact_collaboration(windows):
+    """Replace each window's nodes/links with one compact graph (lib/graph_export.py).
+    One layout covers every range, so nodes keep their place when the range changes."""
+    names, weights = {}, {}
+    for window in windows.values():
+        names.update(dict.fromkeys(node['id'] for node in window['nodes']))
+        for link in window['links']:
+            pair = (link['source'], link['target'])
+            weights[pair] = max(weights.get(pair, 0), link['count'])
+    positions = layout(names, [(*pair, weight) for pair, weight in weights.items()], center=main_author())
+    compacted = {}
+    for name, window in windows.items():
+        graph = compact_graph(
+            [node['id'] for node in window['nodes']],
+            [(link['source'], link['target'], link['count']) for link in window['links']],
+            positions,
+            count=[node['count'] for node in window['nodes']],
+        )
+        compacted[name] = {'graph': graph, 'authorMeta': window['authorMeta'], 'maxCount': window['maxCount']}
+    return compacted
+
+
+@instrument.stage()
 def main():
     publications = load_publications()
     citations = load_citation_map()
@@ -332,9 +455,7 @@ def main():
         'collaboration': collaboration
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_FILE.open('w', encoding='utf-8') as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, ensure_ascii=False, indent=2)
 
     print(f"Wrote {OUTPUT_FILE}")
 
@@ -3,18 +3,32 @@
 Build a single dashboard payload for client-side consumers.
 
 This moves normalization and derived metrics out of the browser so the
-dashboard and impact snapshot can render from one cached JSON file.
+dashboard and impact snapshot can render from cached JSON.
+
+The payload is written as static/data/dashboard/manifest.json plus one
+compact file per section, named <section>.<content hash>.json. Clients fetch
+the small manifest (revalidated) and then only the sections they render;
+section files never change under the same name, so browsers can cache them
+indefinitely.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import math
 import re
 from pathlib import Path
 
+import numpy as np
 import yaml
 
+from lib import artifacts, instrument
+from lib.authors import is_main, resolve
+from lib.gazetteer import Gazetteer
+from lib.topics import TOPIC_TAXONOMY, classify, classify_topic
+from lib.venues import VenueMatcher, clean_venue_name
+
 
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -28,7 +42,9 @@ VISITOR_FILE = STATIC_DATA / "visitor_stats.json"
 CV_TOPICS_FILE = STATIC_DATA / "cv_topics.json"
 DASHBOARD_NETWORK_FILE = STATIC_DATA / "dashboard_network.json"
 IMPACT_MAP_FILE = DATA_DIR / "impact_map.yaml"
-OUTPUT_FILE = STATIC_DATA / "dashboard_payload.json"
+OUTPUT_DIR = STATIC_DATA / "dashboard"
+MANIFEST_FILE = OUTPUT_DIR / "manifest.json"
+MANIFEST_VERSION = 1
 
 STATE_MAP = {
     "Alabama": "AL",
@@ -109,15 +125,6 @@ CITY_COORDS = {
     "Tehran|Iran": [35.6892, 51.3890],
 }
 
-TOPIC_TAXONOMY = {
-    "AI / Deep Learning": ["Deep Learning", "Neural", "Transfer Learning", "Embedding", "Machine Learning", "Artificial Intelligence", "Adversarial"],
-    "Cybersecurity": ["Cyber", "Vulnerability", "Exploit", "Attack", "Threat", "Security", "Malicious", "Ransomware", "Phishing"],
-    "LLMs & NLP": ["Large Language Model", "LLM", "Text Analytics", "NLP", "Transformer", "Bert", "GPT", "Language Models"],
-    "Hacker Communities": ["Hacker", "Forum", "Dark Web", "Paste", "Community", "Marketplace", "Underground"],
-    "Design Science": ["Design Science", "Framework", "Artifact", "System", "Implementation", "Prototyping"],
-    "Behavioral": ["Nudging", "Bias", "Social", "Human", "Behavior", "Psychology", "Decision", "Trust"],
-}
-
 STOP_WORDS = {
     "the", "of", "and", "in", "to", "a", "for", "on", "with", "using",
     "an", "based", "via", "system", "analysis", "approach", "study",
@@ -127,10 +134,7 @@ STOP_WORDS = {
 
 
 def load_json(path: Path, default):
-    if not path.exists():
-        return default
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+    return artifacts.read_json(path, default)
 
 
 def load_publications():
@@ -155,52 +159,6 @@ def normalize_title(title: str) -> str:
     return re.sub(r"[^a-z0-9]+", "", normalize(title))
 
 
-def clean_venue_name(value: str) -> str:
-    if not value:
-        return ""
-    venue = value.split(",")[0].strip()
-    venue = re.sub(r"\s+forthcoming$", "", venue, flags=re.I).strip()
-    venue = re.sub(r"\s+in press$", "", venue, flags=re.I).strip()
-    venue = re.sub(r"\s+\d+(\s*\(\d+\))?.*$", "", venue, flags=re.I).strip()
-    venue = re.sub(r"management information systems quarterly\s*\(misq\)", "MIS Quarterly", venue, flags=re.I)
-    venue = re.sub(r"management information systems quarterly", "MIS Quarterly", venue, flags=re.I)
-    return venue
-
-
-def to_key(value: str) -> str:
-    return re.sub(r"[^a-z0-9]+", " ", normalize(clean_venue_name(value))).strip()
-
-
-def flatten_journal_list(raw):
-    entries = raw if isinstance(raw, list) else raw.get("journals", [])
-    flattened = []
-    for item in entries:
-        if isinstance(item, str):
-            flattened.append(item)
-            continue
-        aliases = item.get("aliases", []) if isinstance(item, dict) else []
-        name = item.get("name") if isinstance(item, dict) else None
-        flattened.extend([name, *aliases])
-    return [entry for entry in flattened if entry]
-
-
-def matches_list(venue: str, aliases) -> bool:
-    venue_key = to_key(venue)
-    if not venue_key:
-        return False
-    for alias in aliases:
-        alias_key = to_key(alias)
-        if not alias_key:
-            continue
-        if venue_key == alias_key:
-            return True
-        alias_pat = re.sub(r'\s+', r'\\s+', alias_key)
-        pattern = re.compile(rf"(^|\s){alias_pat}(\s|$)")
-        if pattern.search(venue_key):
-            return True
-    return False
-
-
 def merge_publication_citations(publications, scholar):
     scholar_pubs = scholar.get("individualPublications", []) if isinstance(scholar, dict) else []
     citation_map = {}
@@ -218,20 +176,12 @@ def merge_publication_citations(publications, scholar):
     return merged
 
 
-def classify_topic(title: str) -> str:
-    text = normalize(title)
-    for category, keywords in TOPIC_TAXONOMY.items():
-        if any(normalize(keyword) in text for keyword in keywords):
-            return category
-    return "Other"
-
-
 def compute_focus_metrics(publications):
     current_year = max((int(publication.get("year") or 0) for publication in publications), default=0)
     counts = {key: 0 for key in TOPIC_TAXONOMY}
     recent = {key: 0 for key in TOPIC_TAXONOMY}
     for publication in publications:
-        topic = classify_topic(publication.get("title", ""))
+        topic = publication.get("topic") or classify_topic(publication.get("title", ""))
         if topic in counts:
             counts[topic] += 1
             year = int(publication.get("year") or 0)
@@ -243,6 +193,84 @@ def compute_focus_metrics(publications):
     return {"primaryFocus": focus, "emergingFocus": emerging}
 
 
+def impact_link_candidates(nodes):
+    """Yield (left, right, common_words, common_authors, same_venue) for every
+    pair of nodes, left < right in order, that can reach the link threshold.
+
+    Inverted indexes from keyword, co-author and venue to node ids replace the
+    all-pairs comparison: only pairs sharing an author or a venue, or at least
+    two keywords (one keyword alone scores 1, below the 1.5 threshold), are
+    produced. Each node's overlaps with later nodes are counted with one
+    bincount over its postings, which also lists the partners in order.
+    """
+    size = len(nodes)
+    word_postings = {}
+    author_postings = {}
+    venue_postings = {}
+    for index, node in enumerate(nodes):
+        for word in node["_words"]:
+            word_postings.setdefault(word, []).append(index)
+        for author in node["_authors"]:
+            author_postings.setdefault(author, []).append(index)
+        if node["_venue"]:
+            venue_postings.setdefault(node["_venue"], []).append(index)
+    for postings in (word_postings, author_postings, venue_postings):
+        for key, ids in postings.items():
+            postings[key] = np.asarray(ids, dtype=np.intp)
+
+    def overlaps(postings, keys, left):
+        later = [ids[np.searchsorted(ids, left, side="right"):] for ids in map(postings.__getitem__, keys)]
+        if not later:
+            return np.zeros(size, dtype=np.intp)
+        return np.bincount(np.concatenate(later), minlength=size)
+
+    for left, node in enumerate(nodes):
+        word_counts = overlaps(word_postings, node["_words"], left)
+        author_counts = overlaps(author_postings, node["_authors"], left)
+        same_venue = overlaps(venue_postings, [node["_venue"]] if node["_venue"] else [], left) > 0
+
+        rights = np.flatnonzero((word_counts > 1) | (author_counts > 0) | same_venue)
+        if not len(rights):
+            continue
+        yield from zip(
+            [left] * len(rights),
+            rights.tolist(),
+            word_counts[rights].tolist(),
+            author_counts[rights].tolist(),
+            same_venue[rights].tolist(),
+        )
+
+
+def _link_template(common_words, common_authors, same_venue, total_cites):
+    """(value, reason, types, lineStyle) of a link with these overlaps and
+    combined citations, or None below the 1.5 score threshold."""
+    score = 0
+    reasons = []
+    if common_words > 0:
+        score += common_words
+        reasons.append(f"{common_words} Keywords")
+    if same_venue:
+        score += 2.0
+        reasons.append("Same Venue")
+    if common_authors > 0:
+        score += common_authors * 3.0
+        reasons.append(f"{common_authors} Co-Authors")
+    if score < 1.5:
+        return None
+    impact_bonus = math.log(total_cites / 2 + 1) * 1.5
+    types = {
+        "topic": common_words > 0,
+        "venue": same_venue,
+        "author": common_authors > 0,
+    }
+    line_style = {
+        "width": min((score * 0.5) + impact_bonus, 5),
+        "opacity": min(0.15 + (score * 0.1), 0.7),
+        "curveness": 0.2,
+    }
+    return score + impact_bonus, ", ".join(reasons), types, line_style
+
+
 def build_impact_graph(publications):
     nodes = []
     links = []
@@ -254,7 +282,7 @@ def build_impact_graph(publications):
         raw_authors = publication.get("authors") or []
         if isinstance(raw_authors, str):
             raw_authors = raw_authors.split(",")
-        authors = sorted({normalize(author) for author in raw_authors if author and "ampel" not in normalize(author)})
+        authors = sorted({resolve(author) for author in raw_authors if author and not is_main(author)})
         venue = normalize(publication.get("venue", ""))
         citations = int(publication.get("citations") or 0)
         nodes.append({
@@ -266,51 +294,37 @@ def build_impact_graph(publications):
             "venue": publication.get("venue"),
             "type": publication.get("type"),
             "topic": publication.get("topic") or classify_topic(title),
+            "topics": list(publication.get("topicHits") or classify(title).hits),
             "symbolSize": max(10, min(65, math.log(citations + 2) * 9)),
             "_words": sorted(filtered_words),
             "_authors": authors,
             "_venue": venue,
         })
 
-    for left in range(len(nodes)):
-        for right in range(left + 1, len(nodes)):
-            node_left = nodes[left]
-            node_right = nodes[right]
-            common_words = len(set(node_left["_words"]).intersection(node_right["_words"]))
-            common_authors = len(set(node_left["_authors"]).intersection(node_right["_authors"]))
-            same_venue = bool(node_left["_venue"] and node_left["_venue"] == node_right["_venue"])
-
-            score = 0
-            reasons = []
-            if common_words > 0:
-                score += common_words
-                reasons.append(f"{common_words} Keywords")
-            if same_venue:
-                score += 2.0
-                reasons.append("Same Venue")
-            if common_authors > 0:
-                score += common_authors * 3.0
-                reasons.append(f"{common_authors} Co-Authors")
-
-            if score >= 1.5:
-                avg_cites = (node_left["value"] + node_right["value"]) / 2
-                impact_bonus = math.log(avg_cites + 1) * 1.5
-                links.append({
-                    "source": left,
-                    "target": right,
-                    "value": score + impact_bonus,
-                    "reason": ", ".join(reasons),
-                    "types": {
-                        "topic": common_words > 0,
-                        "venue": same_venue,
-                        "author": common_authors > 0,
-                    },
-                    "lineStyle": {
-                        "width": min((score * 0.5) + impact_bonus, 5),
-                        "opacity": min(0.15 + (score * 0.1), 0.7),
-                        "curveness": 0.2,
-                    },
-                })
+    # Link attributes depend only on the overlap counts and the pair's total
+    # citations, which repeat across many pairs: build each combination's
+    # value, reason and (shared, read-only) types/lineStyle dicts once.
+    # Every candidate clears the 1.5 threshold (two keywords score 2, a venue
+    # 2, a co-author 3), so the graph has one link per candidate pair and the
+    # remaining cost is O(links): a shared venue alone links every pair of its
+    # papers (about 4M links, 11 s and 1.3 GB for the 5000-paper benchmark).
+    templates = {}
+    for left, right, common_words, common_authors, same_venue in impact_link_candidates(nodes):
+        key = (common_words, common_authors, same_venue, nodes[left]["value"] + nodes[right]["value"])
+        if key not in templates:
+            templates[key] = _link_template(*key)
+        template = templates[key]
+        if template is None:
+            continue
+        value, reason, types, line_style = template
+        links.append({
+            "source": left,
+            "target": right,
+            "value": value,
+            "reason": reason,
+            "types": types,
+            "lineStyle": line_style,
+        })
 
     for node in nodes:
         node.pop("_words", None)
@@ -325,22 +339,19 @@ def count_by_type(publications, publication_type: str) -> int:
     return sum(1 for publication in publications if normalize(publication.get("type")) == target)
 
 
-def count_by_venue(publications, aliases):
+def count_by_venue(publications, matcher, list_name):
     matching = [
         publication
         for publication in publications
         if normalize(publication.get("type")) == "journal"
-        and matches_list(publication.get("venue") or publication.get("publication") or "", aliases)
+        and matcher.matches(publication.get("venue") or publication.get("publication") or "", list_name)
     ]
     venues = sorted({clean_venue_name(publication.get("venue") or publication.get("publication") or "") for publication in matching if publication.get("venue") or publication.get("publication")})
     return {"count": len(matching), "venues": venues}
 
 
 def build_impact_stats(publications, scholar, awards):
-    q1_list = flatten_journal_list(load_json(STATIC_DATA / "journal_lists" / "q1.json", []))
-    ft50_list = flatten_journal_list(load_json(STATIC_DATA / "journal_lists" / "ft50.json", []))
-    utd24_list = flatten_journal_list(load_json(STATIC_DATA / "journal_lists" / "utd24.json", []))
-    combined_top_list = sorted(set(q1_list + ft50_list + utd24_list))
+    matcher = VenueMatcher.from_directory(STATIC_DATA / "journal_lists")
     scholar_pubs = scholar.get("individualPublications", []) if isinstance(scholar, dict) else []
 
     seen_titles = set()
@@ -357,7 +368,7 @@ def build_impact_stats(publications, scholar, awards):
         add_publication(publication)
 
     for publication in scholar_pubs:
-        if matches_list(publication.get("venue", ""), combined_top_list):
+        if matcher.matches_any(publication.get("venue", "")):
             add_publication({"title": publication.get("title", ""), "venue": publication.get("venue", ""), "type": "journal"})
 
     journals = count_by_type(publications, "journal")
@@ -368,9 +379,9 @@ def build_impact_stats(publications, scholar, awards):
     latest_year_count = sum(1 for publication in publications if int(publication.get("year") or 0) == latest_year)
 
     best_paper_awards = [award for award in awards if re.search(r"best paper", award.get("title", ""), re.I)]
-    q1 = count_by_venue(top_list_publications, q1_list)
-    ft50 = count_by_venue(top_list_publications, ft50_list)
-    utd24 = count_by_venue(top_list_publications, utd24_list)
+    q1 = count_by_venue(top_list_publications, matcher, "q1")
+    ft50 = count_by_venue(top_list_publications, matcher, "ft50")
+    utd24 = count_by_venue(top_list_publications, matcher, "utd24")
 
     return {
         "updatedLabel": scholar.get("lastUpdated") if isinstance(scholar, dict) else None,
@@ -514,9 +525,10 @@ def enrich_footprint_points(publications=None):
     Conference/workshop points are DERIVED from publications.json against the
     data/venue_locations.yaml gazetteer, so new papers at known venues appear
     automatically. Institution/Collaboration points stay manually curated in
-    data/impact_map.yaml. Unmatched venue+year pairs print a build warning.
+    data/impact_map.yaml. Unmatched venue+year pairs print one batched build
+    warning.
     """
-    gazetteer = load_yaml(DATA_DIR / "venue_locations.yaml", [])
+    gazetteer = Gazetteer.load(DATA_DIR / "venue_locations.yaml")
     publications = publications or []
 
     grouped = {}
@@ -525,15 +537,8 @@ def enrich_footprint_points(publications=None):
             continue
         venue = str(pub.get("venue") or "")
         year = pub.get("year")
-        rule = None
-        for candidate in gazetteer:
-            if candidate.get("match", "").lower() in venue.lower() and (
-                "year" not in candidate or candidate.get("year") == year
-            ):
-                rule = candidate
-                break
+        rule = gazetteer.locate(venue, year)
         if rule is None:
-            print(f"[footprint] WARNING: no gazetteer rule for venue={venue!r} year={year} -- add one to data/venue_locations.yaml")
             continue
         if rule.get("skip"):
             continue
@@ -543,6 +548,8 @@ def enrich_footprint_points(publications=None):
             entry["years"].add(int(year))
         entry["titles"].append(pub.get("title", ""))
 
+    gazetteer.report_unmatched("[footprint]")
+
     enriched = []
     all_years = []
     for (name, lat, lng), entry in grouped.items():
@@ -611,6 +618,38 @@ def enrich_footprint_points(publications=None):
     }
 
 
+def split_sections(payload):
+    """Sections as clients load them: the network splits into its two views."""
+    sections = {key: value for key, value in payload.items() if key != "network"}
+    network = payload.get("network") or {}
+    sections["centrality"] = network.get("centrality")
+    sections["collaboration"] = network.get("collaboration")
+    return sections
+
+
+def write_payload_shards(payload, out_dir: Path = OUTPUT_DIR):
+    """Write one compact, content-hashed file per section plus manifest.json,
+    and delete section files the new manifest no longer references."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": MANIFEST_VERSION, "sections": {}}
+    for name, section in split_sections(payload).items():
+        text = json.dumps(section, ensure_ascii=False, separators=(",", ":"))
+        raw = text.encode("utf-8")
+        file_name = f"{name}.{hashlib.sha256(raw).hexdigest()[:12]}.json"
+        path = out_dir / file_name
+        if not path.exists():
+            path.write_bytes(raw)
+        manifest["sections"][name] = {"file": file_name, "bytes": len(raw)}
+
+    artifacts.write_json(out_dir / "manifest.json", manifest, newline=True, indent=2)
+    current = {entry["file"] for entry in manifest["sections"].values()}
+    for stale in out_dir.glob("*.*.json"):
+        if stale.name not in current:
+            stale.unlink()
+    return manifest
+
+
+@instrument.stage()
 def main():
     publications = load_publications()
     scholar = load_json(SCHOLAR_FILE, {})
@@ -621,10 +660,11 @@ def main():
 
     merged_publications = merge_publication_citations(publications, scholar)
     for publication in merged_publications:
-        publication["topic"] = classify_topic(publication.get("title", ""))
+        match = classify(publication.get("title", ""))
+        publication["topic"] = match.primary
+        publication["topicHits"] = dict(match.hits)
 
     payload = {
-        "papers": merged_publications,
         "metrics": compute_focus_metrics(merged_publications),
         "impactGraph": build_impact_graph(merged_publications),
         "scholar": {
@@ -639,10 +679,9 @@ def main():
         "footprint": enrich_footprint_points(merged_publications),
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_FILE.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
-    print(f"Wrote {OUTPUT_FILE}")
+    manifest = write_payload_shards(payload)
+    total = sum(entry["bytes"] for entry in manifest["sections"].values())
+    print(f"Wrote {MANIFEST_FILE} ({len(manifest['sections'])} sections, {total / 1024:.0f} KB)")
 
 
 if __name__ == "__main__":
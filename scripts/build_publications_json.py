@@ -1,10 +1,10 @@
 #!/usr/bin/env python3
-import json
 import re
 from datetime import date, datetime
 from pathlib import Path
 
-import yaml
+from lib import artifacts, front_matter, instrument
+from lib.authors import display
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -53,7 +53,7 @@ def normalize_authors(authors):
     for author in authors:
         name = str(author).strip()
         if name.lower() == "admin":
-            name = "Benjamin M. Ampel"
+            name = display(name)
         normalized.append(name)
     return normalized
 
@@ -100,77 +100,61 @@ def slugify(value):
 
 
 def load_front_matter(path):
-    text = path.read_text(errors="ignore")
-    if not text.startswith("---"):
-        return {}
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        return {}
-    front = parts[1]
-    try:
-        data = yaml.safe_load(front)
-    except Exception:
-        data = {}
-    return data or {}
+    return front_matter.load(path)
 
 
 def collect_publications():
     items = []
-    for pub_type, dir_name in TYPE_DIRS.items():
-        base_dir = CONTENT_DIR / dir_name
-        if not base_dir.exists():
+    for entry in front_matter.get_index().publications():
+        pub_type, data = entry.type, entry.data
+        dir_name = TYPE_DIRS[pub_type]
+        if entry.draft:
             continue
-        for md_path in base_dir.rglob("index.md"):
-            data = load_front_matter(md_path)
-            if data.get("draft") is True:
-                continue
-            title = data.get("title")
-            if not title:
-                continue
-            folder_slug = slugify(md_path.parent.name)
-            year = (
-                extract_year(data.get("date"))
-                or extract_year(data.get("publishDate"))
-                or extract_year(data.get("year"))
-            )
-            iso_date = (
-                normalize_date(data.get("date"))
-                or normalize_date(data.get("publishDate"))
-            )
-            authors = normalize_authors(data.get("authors"))
-            venue = normalize_venue(data)
-            abstract = data.get("abstract") or data.get("summary") or data.get("description")
-            url = f"/{dir_name}/{folder_slug}/"
-            award = None
-            award_sources = list(data.get("awards") or []) + list(data.get("tags") or [])
-            for entry in award_sources:
-                if "best paper" in str(entry).lower():
-                    award = "Best Paper Award"
-                    break
-            items.append(
-                {
-                    "title": str(title).strip(),
-                    "authors": authors,
-                    "year": year,
-                    "type": pub_type,
-                    "venue": venue,
-                    "url": url,
-                    "date": iso_date,
-                    "abstract": str(abstract).strip() if abstract else None,
-                    "award": award,
-                    "featured": bool(data.get("featured")),
-                }
-            )
+        title = data.get("title")
+        if not title:
+            continue
+        folder_slug = slugify(entry.path.parent.name)
+        year = (
+            extract_year(data.get("date"))
+            or extract_year(data.get("publishDate"))
+            or extract_year(data.get("year"))
+        )
+        iso_date = (
+            normalize_date(data.get("date"))
+            or normalize_date(data.get("publishDate"))
+        )
+        authors = normalize_authors(data.get("authors"))
+        venue = normalize_venue(data)
+        abstract = data.get("abstract") or data.get("summary") or data.get("description")
+        url = f"/{dir_name}/{folder_slug}/"
+        award = None
+        award_sources = list(data.get("awards") or []) + list(data.get("tags") or [])
+        for source in award_sources:
+            if "best paper" in str(source).lower():
+                award = "Best Paper Award"
+                break
+        items.append(
+            {
+                "title": str(title).strip(),
+                "authors": authors,
+                "year": year,
+                "type": pub_type,
+                "venue": venue,
+                "url": url,
+                "date": iso_date,
+                "abstract": str(abstract).strip() if abstract else None,
+                "award": award,
+                "featured": bool(data.get("featured")),
+            }
+        )
     items.sort(key=lambda x: (x["year"] or 0, x["title"]))
     return items
 
 
+@instrument.stage()
 def main():
     items = collect_publications()
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_PATH.open("w", encoding="utf-8") as f:
-        json.dump(items, f, indent=2, ensure_ascii=True)
-        f.write("\n")
+    artifacts.write_json(OUTPUT_PATH, items, newline=True, indent=2, ensure_ascii=True)
     by_type = {}
     for item in items:
         by_type[item["type"]] = by_type.get(item["type"], 0) + 1
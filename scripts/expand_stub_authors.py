@@ -3,8 +3,8 @@ expand_stub_authors.py
 
 Scans all publication index.md stubs for abbreviated author names
 (e.g., "S Samtani", "BM Ampel") created by sync_scholar_publications.py.
-Attempts to expand them using a lookup table built from all full author
-names already present in the content directories.
+Attempts to expand them using the author registry (data/authors.yaml) and
+the full author names already present in the content directories.
 
 If any names cannot be resolved, sends an email notification AND creates
 a GitHub Issue so you can fix them manually.
@@ -31,14 +31,10 @@ from pathlib import Path
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-ROOT         = Path(__file__).resolve().parents[1]
-CONTENT_ROOT = ROOT / "content"
+from lib import front_matter, instrument
+from lib.authors import AuthorResolver
 
-SECTION_DIRS = [
-    "journal_publication",
-    "conference_publication",
-    "workshop_publication",
-]
+ROOT         = Path(__file__).resolve().parents[1]
 
 AUTHOR_EMAIL = "bampel@gsu.edu"   # default notification recipient
 
@@ -57,30 +53,10 @@ def is_abbreviated(name: str) -> bool:
 
 def _read_authors(path: Path) -> list:
     """Return the authors list from an index.md front-matter block."""
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    if not text.startswith("---"):
-        return []
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        return []
-
-    authors = []
-    in_authors = False
-    for line in parts[1].splitlines():
-        stripped = line.strip()
-        if stripped.startswith("authors:"):
-            in_authors = True
-            continue
-        if in_authors:
-            if re.match(r"^\s*-\s+", line):          # "- name" or "  - name"
-                author = re.sub(r"^\s*-\s+", "", line).strip()
-                if author:
-                    authors.append(author)
-            elif stripped == "":
-                continue                               # blank line inside block
-            else:
-                break                                  # new YAML key → end of block
-    return authors
+    authors = front_matter.load(path).get("authors") or []
+    if isinstance(authors, str):
+        authors = [authors]
+    return [str(a).strip() for a in authors if str(a).strip()]
 
 
 def _rewrite_authors(path: Path, new_authors: list) -> bool:
@@ -113,42 +89,21 @@ def _rewrite_authors(path: Path, new_authors: list) -> bool:
 
 
 # ---------------------------------------------------------------------------
-# Build lookup table from existing full author names
+# Build lookup table from the author registry and existing full names
 # ---------------------------------------------------------------------------
 
-def build_author_lookup() -> dict:
+def build_author_lookup() -> AuthorResolver:
     """
-    Scan all index.md files and collect full author names (non-abbreviated,
-    non-admin).  Build a (first_initial, last_name_lower) → [full_name, ...]
-    mapping for fast lookup.
+    Resolver over data/authors.yaml plus every full (non-abbreviated,
+    non-admin) author name already used on a publication page, so new
+    collaborators expand before they are added to the registry.  Spellings
+    of one person ("Matthew Hashim", "Matthew J. Hashim") count once.
     """
-    lookup: dict = {}
-    seen: set = set()
-
-    for section in SECTION_DIRS:
-        for path in (CONTENT_ROOT / section).rglob("index.md"):
-            for name in _read_authors(path):
-                if name == "admin" or is_abbreviated(name) or name in seen:
-                    continue
-                seen.add(name)
-
-                parts = name.strip().split()
-                # Strip middle initials ("J.") and suffixes ("Jr.", "II")
-                parts = [
-                    p for p in parts
-                    if not re.match(r"^[A-Z]\.$", p)
-                    and not re.match(r"^(Jr|Sr|II|III)\.?$", p, re.I)
-                ]
-                if len(parts) < 2:
-                    continue
-
-                first   = parts[0]
-                last    = parts[-1].lower()
-                initial = first[0].lower()
-                key     = (initial, last)
-                if name not in lookup.get(key, []):
-                    lookup.setdefault(key, []).append(name)
-
+    lookup = AuthorResolver.load()
+    for entry in front_matter.get_index().publications():
+        for name in entry.authors:
+            if name != "admin" and not is_abbreviated(name):
+                lookup.register(name)
     return lookup
 
 
@@ -156,7 +111,7 @@ def build_author_lookup() -> dict:
 # Expand abbreviated names
 # ---------------------------------------------------------------------------
 
-def expand_authors(authors: list, lookup: dict) -> tuple:
+def expand_authors(authors: list, lookup: AuthorResolver) -> tuple:
     """
     Returns (expanded_list, unresolved_abbrevs).
     Unresolved = abbreviated names with zero OR multiple matches (ambiguous).
@@ -169,26 +124,11 @@ def expand_authors(authors: list, lookup: dict) -> tuple:
             expanded.append(name)
             continue
 
-        parts       = name.strip().split()
-        last        = parts[-1].lower()
-        first_init  = parts[0][0].lower()     # first letter of initials
-        key         = (first_init, last)
-        matches     = lookup.get(key, [])
-
+        matches = lookup.candidates(name)     # same first initial + last name
         if len(matches) == 1:
-            expanded.append(matches[0])       # unambiguous match ✓
-        elif len(matches) > 1:
-            # Multiple matches — check if they're all the same person
-            # (e.g., "Matthew Hashim" vs "Matthew J. Hashim")
-            first_names = {m.split()[0] for m in matches}
-            if len(first_names) == 1:
-                # Same first name → same person, pick the most complete form
-                expanded.append(max(matches, key=len))
-            else:
-                expanded.append(name)         # genuinely ambiguous, flag it
-                unresolved.append(name)
+            expanded.append(lookup.display(matches[0]))   # unambiguous match ✓
         else:
-            expanded.append(name)             # no match found, flag it
+            expanded.append(name)             # none or ambiguous, flag it
             unresolved.append(name)
 
     return expanded, unresolved
@@ -303,39 +243,40 @@ def _try_github_issue(body: str, paths: list):
 # Main
 # ---------------------------------------------------------------------------
 
+@instrument.stage()
 def main():
     print("=== Expand Stub Author Names ===")
 
     lookup = build_author_lookup()
-    print(f"Author lookup: {len(lookup)} (initial, last_name) entries from existing pages.")
+    print(f"Author lookup: {len(lookup.people)} people from data/authors.yaml and existing pages.")
 
     expanded_files = 0
     unresolved_map: dict = {}
 
-    for section in SECTION_DIRS:
-        for path in sorted((CONTENT_ROOT / section).rglob("index.md")):
-            authors = _read_authors(path)
-            if not authors:
-                continue
-
-            abbreviated = [a for a in authors if a != "admin" and is_abbreviated(a)]
-            if not abbreviated:
-                continue    # nothing to do for this file
-
-            new_authors, unresolved = expand_authors(authors, lookup)
-            changed = _rewrite_authors(path, new_authors)
-
-            rel = str(path.relative_to(ROOT))
-            if changed:
-                resolved = [n for n in new_authors if n not in authors]
-                expanded_files += 1
-                print(f"  [OK]      {rel}")
-                print(f"            expanded: {resolved}")
-
-            if unresolved:
-                unresolved_map[rel] = unresolved
-                print(f"  [PARTIAL] {rel}")
-                print(f"            unresolved: {unresolved}")
+    for entry in front_matter.get_index().publications():
+        path    = entry.path
+        authors = entry.authors
+        if not authors:
+            continue
+
+        abbreviated = [a for a in authors if a != "admin" and is_abbreviated(a)]
+        if not abbreviated:
+            continue    # nothing to do for this file
+
+        new_authors, unresolved = expand_authors(authors, lookup)
+        changed = _rewrite_authors(path, new_authors)
+
+        rel = str(path.relative_to(ROOT))
+        if changed:
+            resolved = [n for n in new_authors if n not in authors]
+            expanded_files += 1
+            print(f"  [OK]      {rel}")
+            print(f"            expanded: {resolved}")
+
+        if unresolved:
+            unresolved_map[rel] = unresolved
+            print(f"  [PARTIAL] {rel}")
+            print(f"            unresolved: {unresolved}")
 
     if expanded_files == 0 and not unresolved_map:
         print("No abbreviated author names found — nothing to do.")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Export web variants of the generated figures.
+
+The map, co-author network and impact dashboard scripts save 150-DPI PNGs,
+which serve as the 2x images. For each of them this writes, next to the PNG:
+
+    <name>@1x.png    half-size, optimized
+    <name>@1x.webp   <name>@2x.webp
+    <name>@1x.avif   <name>@2x.avif   (when Pillow has AVIF support)
+
+and records every variant's size, dimensions and SHA-256 in
+static/images/manifest.json. Figures whose PNG hash matches the manifest
+and whose variants are still on disk are not re-encoded.
+
+Each variant is checked against the byte budget for its format. Over-budget
+variants are reported as warnings. With IMAGE_BUDGET_MODE=fail they are
+deleted instead and the script exits with status 1.
+
+Usage:
+    python scripts/export_images.py
+
+Environment:
+    IMAGE_BUDGETS       per-format budgets, e.g. "png=600k,webp=200k,avif=150k"
+    IMAGE_BUDGET_MODE   warn (default) | fail
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image, features
+
+from lib import artifacts, instrument
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+IMAGES_DIR = PROJECT_ROOT / "static" / "images"
+MANIFEST_FILE = IMAGES_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+FIGURES = (
+    "research-map",
+    "research-map-dark",
+    "coauthor-network",
+    "coauthor-network-dark",
+    "impact-dashboard",
+    "impact-dashboard-dark",
+)
+
+# (format, scale) -> Pillow save options. The 2x PNG is the source itself.
+VARIANTS = {
+    ("png", 1): {"optimize": True},
+    ("webp", 1): {"quality": 82, "method": 4},
+    ("webp", 2): {"quality": 82, "method": 4},
+    ("avif", 1): {"quality": 60, "speed": 6},
+    ("avif", 2): {"quality": 60, "speed": 6},
+}
+DEFAULT_BUDGETS = {"png": 600_000, "webp": 200_000, "avif": 150_000}
+BUDGET_MODES = ("warn", "fail")
+_UNITS = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_budgets(spec) -> dict:
+    """Budgets from "png=600k,webp=200k" (bytes, or k/m suffixed) over the defaults."""
+    budgets = dict(DEFAULT_BUDGETS)
+    for part in (spec or "").split(","):
+        if not part.strip():
+            continue
+        fmt, _, size = part.partition("=")
+        fmt, size = fmt.strip().lower(), size.strip().lower()
+        if fmt not in budgets:
+            raise ValueError(f"IMAGE_BUDGETS: unknown format {fmt!r}")
+        multiplier = _UNITS.get(size[-1:], 1)
+        try:
+            budgets[fmt] = int(float(size.rstrip("km")) * multiplier)
+        except ValueError:
+            raise ValueError(f"IMAGE_BUDGETS: bad size {size!r} for {fmt}") from None
+    return budgets
+
+
+def configured_mode() -> str:
+    mode = (os.environ.get("IMAGE_BUDGET_MODE") or "warn").strip().lower()
+    if mode not in BUDGET_MODES:
+        raise ValueError(f"IMAGE_BUDGET_MODE must be one of {', '.join(BUDGET_MODES)}, not {mode!r}")
+    return mode
+
+
+def variant_name(figure: str, fmt: str, scale: int) -> str:
+    return f"{figure}.png" if (fmt, scale) == ("png", 2) else f"{figure}@{scale}x.{fmt}"
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _entry(name, fmt, scale, width, height, data, budgets):
+    return {
+        "file": name,
+        "format": fmt,
+        "scale": scale,
+        "width": width,
+        "height": height,
+        "bytes": len(data),
+        "sha256": _digest(data),
+        "overBudget": len(data) > budgets[fmt],
+    }
+
+
+def _is_current(previous, source_hash, formats, images_dir) -> bool:
+    if not previous or previous.get("sha256") != source_hash:
+        return False
+    expected = {("png", 2), *(key for key in VARIANTS if key[0] in formats)}
+    if {(variant["format"], variant["scale"]) for variant in previous["variants"]} != expected:
+        return False
+    return all(
+        (images_dir / variant["file"]).is_file()
+        and (images_dir / variant["file"]).stat().st_size == variant["bytes"]
+        for variant in previous["variants"]
+    )
+
+
+def export_figure(figure, formats, budgets, previous=None, images_dir=IMAGES_DIR):
+    """Write the variants of one figure. Returns its manifest entry, or None
+    when the source PNG does not exist."""
+    source = images_dir / f"{figure}.png"
+    if not source.is_file():
+        return None
+    raw = source.read_bytes()
+    source_hash = _digest(raw)
+    if _is_current(previous, source_hash, formats, images_dir):
+        variants = [
+            dict(variant, overBudget=variant["bytes"] > budgets[variant["format"]])
+            for variant in previous["variants"]
+        ]
+        return dict(previous, variants=variants)
+
+    with Image.open(source) as image:
+        image.load()
+    full = image
+    half = image.resize((max(1, round(image.width / 2)), max(1, round(image.height / 2))), Image.LANCZOS)
+    variants = [_entry(source.name, "png", 2, full.width, full.height, raw, budgets)]
+    for (fmt, scale), options in VARIANTS.items():
+        if fmt not in formats:
+            continue
+        picture = full if scale == 2 else half
+        name = variant_name(figure, fmt, scale)
+        path = images_dir / name
+        picture.save(path, fmt.upper(), **options)
+        variants.append(_entry(name, fmt, scale, picture.width, picture.height, path.read_bytes(), budgets))
+    return {"sha256": source_hash, "width": full.width, "height": full.height, "variants": variants}
+
+
+def available_formats() -> set:
+    formats = {fmt for fmt, _ in VARIANTS}
+    for fmt in ("webp", "avif"):
+        if not features.check(fmt):
+            print(f"WARNING: Pillow was built without {fmt.upper()} support; skipping .{fmt} variants")
+            formats.discard(fmt)
+    return formats
+
+
+@instrument.stage()
+def main():
+    try:
+        budgets = parse_budgets(os.environ.get("IMAGE_BUDGETS"))
+        mode = configured_mode()
+    except ValueError as exc:
+        print(f"ERROR: {exc}")
+        return 1
+
+    formats = available_formats()
+    previous = artifacts.read_json(MANIFEST_FILE, {}) or {}
+    if previous.get("version") != MANIFEST_VERSION:
+        previous = {}
+    known = previous.get("images", {})
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        futures = {
+            figure: pool.submit(export_figure, figure, formats, budgets, known.get(figure))
+            for figure in FIGURES
+        }
+        images = {figure: future.result() for figure, future in futures.items()}
+    images = {figure: entry for figure, entry in images.items() if entry is not None}
+
+    over = [variant for entry in images.values() for variant in entry["variants"] if variant["overBudget"]]
+    for variant in over:
+        print(f"{'ERROR' if mode == 'fail' else 'WARNING'}: {variant['file']} is {variant['bytes']:,} bytes, "
+              f"over the {variant['format']} budget of {budgets[variant['format']]:,}")
+    if mode == "fail":
+        # Never publish an over-budget variant (the 2x PNG source itself stays).
+        for entry in images.values():
+            kept = []
+            for variant in entry["variants"]:
+                if variant["overBudget"] and (variant["format"], variant["scale"]) != ("png", 2):
+                    (IMAGES_DIR / variant["file"]).unlink(missing_ok=True)
+                else:
+                    kept.append(variant)
+            entry["variants"] = kept
+
+    artifacts.write_json(MANIFEST_FILE, {"version": MANIFEST_VERSION, "budgets": budgets, "images": images},
+                         newline=True, indent=2)
+    written = sum(len(entry["variants"]) for entry in images.values())
+    print(f"Exported {written} image variant(s) for {len(images)} figure(s) to {MANIFEST_FILE}")
+    return 1 if over and mode == "fail" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,16 +7,13 @@ Run: python scripts/fetch_arxiv_papers.py
 Fetches papers from the last 60 days and scores them by keyword relevance.
 arXiv API docs: https://info.arxiv.org/help/api/index.html
 """
-import json
-import socket
-import time
-import urllib.error
-import urllib.request
 import urllib.parse
 import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from lib import artifacts, http, instrument
+
 SCRIPT_DIR  = Path(__file__).parent
 OUTPUT_FILE = SCRIPT_DIR.parent / "static" / "data" / "arxiv_papers.json"
 
@@ -72,24 +69,10 @@ def fetch_arxiv():
     })
     url = f"{ARXIV_API}?{params}"
     print(f"Fetching: {url[:100]}...")
-    req = urllib.request.Request(url, headers={"User-Agent": "BampelWebsite/1.0"})
-    last_error = None
-    for attempt in range(1, FETCH_RETRIES + 1):
-        try:
-            with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
-                return resp.read()
-        except (TimeoutError, socket.timeout, urllib.error.URLError) as exc:
-            last_error = exc
-            if attempt == FETCH_RETRIES:
-                break
-            wait_seconds = attempt * 10
-            print(
-                f"arXiv fetch failed on attempt {attempt}/{FETCH_RETRIES}: {exc}. "
-                f"Retrying in {wait_seconds}s..."
-            )
-            time.sleep(wait_seconds)
-
-    raise RuntimeError(f"arXiv fetch failed after {FETCH_RETRIES} attempts: {last_error}")
+    try:
+        return http.get_client().get(url, timeout=FETCH_TIMEOUT, retries=FETCH_RETRIES - 1).content
+    except http.RequestError as exc:
+        raise RuntimeError(f"arXiv fetch failed: {exc}") from exc
 
 
 def parse_arxiv_xml(xml_bytes):
@@ -142,6 +125,7 @@ def parse_arxiv_xml(xml_bytes):
     return entries
 
 
+@instrument.stage()
 def main():
     print("=== Fetch arXiv Papers ===")
     try:
@@ -152,14 +136,12 @@ def main():
             print(f"Keeping existing arXiv data at {OUTPUT_FILE}")
             return
 
-        OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(OUTPUT_FILE, "w") as f:
-            json.dump({
-                "refresh_date": datetime.now().strftime("%Y-%m-%d"),
-                "days_back": DAYS_BACK,
-                "papers": [],
-                "error": str(exc),
-            }, f, indent=2)
+        artifacts.write_json(OUTPUT_FILE, {
+            "refresh_date": datetime.now().strftime("%Y-%m-%d"),
+            "days_back": DAYS_BACK,
+            "papers": [],
+            "error": str(exc),
+        }, indent=2)
         print(f"Wrote empty fallback arXiv data to {OUTPUT_FILE}")
         return
 
@@ -184,9 +166,7 @@ def main():
         "papers":       top,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(output, f, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
 
     print(f"Saved {len(top)} papers to {OUTPUT_FILE}")
     for e in top[:5]:
@@ -7,14 +7,13 @@ Run: python scripts/fetch_github_research.py
 Uses GitHub Search API (no auth required for basic use; GITHUB_TOKEN env var
 used if set, for higher rate limits).
 """
-import json
 import os
-import time
-import urllib.request
 import urllib.parse
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from lib import artifacts, http, instrument
+
 ROOT        = Path(__file__).resolve().parents[1]
 OUTPUT_FILE = ROOT / "static" / "data" / "github_research.json"
 
@@ -42,7 +41,7 @@ KEYWORD_QUERIES = [
 
 RESULTS_PER_QUERY = 10
 TOP_N             = 25
-DELAY_SECS        = 1.5   # GitHub rate limits without auth: 10 req/min
+SEARCH_RATE_TOKEN = 30 / 60   # search API: 10 req/min without a token, 30 with one
 
 # Only repos updated in the last year
 MIN_PUSHED = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
@@ -74,9 +73,7 @@ def fetch_repos(q: str, sort: str = "stars") -> list:
     })
     url = f"{GH_API}?{params}"
     try:
-        req = urllib.request.Request(url, headers=_headers())
-        with urllib.request.urlopen(req, timeout=20) as r:
-            d = json.loads(r.read())
+        d = http.get_client().get_json(url, headers=_headers())
         items = d.get("items") or []
         return [
             i for i in items
@@ -103,18 +100,21 @@ def normalize(raw: dict) -> dict:
     }
 
 
+@instrument.stage()
 def main():
     print("=== Fetching GitHub Research Repos ===")
+    if os.environ.get("GITHUB_TOKEN"):
+        http.get_client().set_limit("api.github.com", SEARCH_RATE_TOKEN, burst=10)
     seen: dict = {}
 
     all_queries = TOPIC_QUERIES + KEYWORD_QUERIES
-    for q in all_queries:
-        print(f"  Searching: \"{q[:60]}\"")
-        for raw in fetch_repos(q):
+    print(f"  Searching {len(all_queries)} queries…")
+    for q, found in zip(all_queries, http.gather(fetch_repos, all_queries, default=[])):
+        print(f"  \"{q[:60]}\": {len(found)} repos")
+        for raw in found:
             full_name = raw.get("full_name", "")
             if full_name and full_name not in seen:
                 seen[full_name] = normalize(raw)
-        time.sleep(DELAY_SECS)
 
     repos = sorted(seen.values(), key=lambda r: r.get("stars", 0), reverse=True)
     top   = repos[:TOP_N]
@@ -124,9 +124,7 @@ def main():
         "repos":        top,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
 
     print(f"\nSaved {len(top)} repos to {OUTPUT_FILE}")
     for r in top[:5]:
@@ -8,13 +8,11 @@ Unlike fetch_nsf_grants.py (which shows awarded NSF grants), this script finds
 *open* funding opportunities across all federal agencies that Dr. Ampel could
 apply for.  Grants.gov REST API — no key required.
 """
-import json
-import time
-import urllib.request
-import urllib.parse
 from datetime import datetime
 from pathlib import Path
 
+from lib import artifacts, http, instrument
+
 ROOT        = Path(__file__).resolve().parents[1]
 OUTPUT_FILE = ROOT / "static" / "data" / "grants_gov.json"
 
@@ -49,30 +47,20 @@ SECONDARY_TERMS = [
 
 RESULTS_PER_KEYWORD = 20
 TOP_N               = 20
-DELAY_SECS          = 1.2
 
 # Only show currently open/active opportunities
 VALID_STATUSES = {"posted", "forecasted"}
 
 
 def fetch_keyword(keyword: str) -> list:
-    payload = json.dumps({
+    payload = {
         "keyword":        keyword,
         "rows":           RESULTS_PER_KEYWORD,
         "startRecordNum": 0,
         "oppStatuses":    "posted|forecasted",
-    }).encode()
-    req = urllib.request.Request(
-        GRANTS_GOV_API,
-        data=payload,
-        headers={
-            "Content-Type": "application/json",
-            "User-Agent":   "BampelWebsite/1.0",
-        },
-    )
+    }
     try:
-        with urllib.request.urlopen(req, timeout=20) as r:
-            d = json.loads(r.read())
+        d = http.get_client().post_json(GRANTS_GOV_API, payload)
         return d.get("oppHits") or []
     except Exception as e:
         print(f"  Warning [{keyword}]: {e}")
@@ -117,19 +105,19 @@ def normalize(raw: dict) -> dict:
     }
 
 
+@instrument.stage()
 def main():
     print("=== Fetching Grants.gov Opportunities ===")
     seen: dict = {}
 
-    for kw in SEARCH_KEYWORDS:
-        print(f"  Searching: \"{kw}\"")
-        opps = fetch_keyword(kw)
+    print(f"  Searching {len(SEARCH_KEYWORDS)} keywords…")
+    for kw, opps in zip(SEARCH_KEYWORDS, http.gather(fetch_keyword, SEARCH_KEYWORDS, default=[])):
+        print(f"  \"{kw}\": {len(opps)} opportunities")
         for raw in opps:
             key = raw.get("number") or raw.get("id") or raw.get("title", "")
             if key and key not in seen:
                 if raw.get("oppStatus", "").lower() in VALID_STATUSES:
                     seen[key] = normalize(raw)
-        time.sleep(DELAY_SECS)
 
     opps_list = list(seen.values())
 
@@ -149,9 +137,7 @@ def main():
         "opportunities": top,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
 
     print(f"\nSaved {len(top)} opportunities to {OUTPUT_FILE}")
     for o in top[:5]:
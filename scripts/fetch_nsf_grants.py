@@ -7,13 +7,12 @@ Run: python scripts/fetch_nsf_grants.py
 Refreshes the grant data — run whenever you want updated results.
 NSF Awards API docs: https://resources.research.gov/common/webapi/awardapisearch-v1.htm
 """
-import json
-import time
-import urllib.request
 import urllib.parse
 from datetime import datetime
 from pathlib import Path
 
+from lib import artifacts, http, instrument
+
 SCRIPT_DIR  = Path(__file__).parent
 OUTPUT_FILE = SCRIPT_DIR.parent / "static" / "data" / "nsf_grants.json"
 
@@ -58,7 +57,6 @@ RELEVANCE_TERMS = PRIMARY_TERMS + SECONDARY_TERMS
 
 RESULTS_PER_KEYWORD = 25   # NSF API max per page
 TOP_N               = 20   # Final grants to keep
-DELAY_SECS          = 1.2  # Polite delay between API calls
 
 # Only include awards from this year onward
 MIN_YEAR = 2022
@@ -108,9 +106,7 @@ def fetch_keyword(keyword):
     })
     url = f"{NSF_API}?{params}"
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "BampelWebsite/1.0"})
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            data = json.loads(resp.read())
+        data = http.get_client().get_json(url)
         return data.get("response", {}).get("award", []) or []
     except Exception as e:
         print(f"  Warning [{keyword}]: {e}")
@@ -154,14 +150,15 @@ def tag_keywords(grant):
     return grant
 
 
+@instrument.stage()
 def main():
     print("=== Fetching NSF Grants ===")
     seen   = {}  # awardId -> normalized grant
     total_fetched = 0
 
-    for kw in SEARCH_KEYWORDS:
-        print(f"  Searching: \"{kw}\"")
-        awards = fetch_keyword(kw)
+    print(f"  Searching {len(SEARCH_KEYWORDS)} keywords…")
+    for kw, awards in zip(SEARCH_KEYWORDS, http.gather(fetch_keyword, SEARCH_KEYWORDS, default=[])):
+        print(f"  \"{kw}\": {len(awards)} awards")
         total_fetched += len(awards)
         for raw in awards:
             aid = raw.get("id", "")
@@ -170,7 +167,6 @@ def main():
                 if parse_year(raw.get("expDate", "")) < MIN_YEAR:
                     continue
                 seen[aid] = normalize(raw)
-        time.sleep(DELAY_SECS)
 
     print(f"\nFetched {total_fetched} raw results → {len(seen)} unique awards after dedup.")
 
@@ -195,9 +191,7 @@ def main():
         "grants":       top,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(output, f, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
 
     print(f"Saved {len(top)} grants to {OUTPUT_FILE}")
     for g in top[:5]:
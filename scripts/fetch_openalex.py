@@ -7,13 +7,12 @@ Run: python scripts/fetch_openalex.py
 OpenAlex is a free, open bibliographic database covering 250M+ works.
 No API key required; provide an email for the polite pool.
 """
-import json
-import time
-import urllib.request
 import urllib.parse
 from datetime import date, datetime
 from pathlib import Path
 
+from lib import artifacts, http, instrument
+
 ROOT        = Path(__file__).resolve().parents[1]
 OUTPUT_FILE = ROOT / "static" / "data" / "openalex.json"
 
@@ -33,7 +32,6 @@ QUERIES = [
 
 RESULTS_PER_QUERY = 25
 TOP_N             = 30
-DELAY_SECS        = 0.4   # stay in polite pool
 
 # Relevance filter: result TITLE must contain at least one of these terms
 TITLE_TERMS = {
@@ -67,12 +65,7 @@ def fetch_works(query: str) -> list:
     })
     url = f"{BASE}/works?{params}"
     try:
-        req = urllib.request.Request(
-            url,
-            headers={"User-Agent": f"BampelWebsite/1.0 (mailto:{MAILTO})"},
-        )
-        with urllib.request.urlopen(req, timeout=20) as r:
-            return json.loads(r.read()).get("results", [])
+        return http.get_client().get_json(url).get("results", [])
     except Exception as e:
         print(f"  Warning [{query[:40]}]: {e}")
         return []
@@ -126,17 +119,18 @@ def normalize(raw: dict) -> dict:
     }
 
 
+@instrument.stage()
 def main():
     print("=== Fetching OpenAlex Papers ===")
     seen: dict = {}
 
-    for q in QUERIES:
-        print(f"  Searching: \"{q}\"")
-        for raw in fetch_works(q):
+    print(f"  Searching {len(QUERIES)} queries…")
+    for q, works in zip(QUERIES, http.gather(fetch_works, QUERIES, default=[])):
+        print(f"  \"{q}\": {len(works)} works")
+        for raw in works:
             wid = raw.get("id", "")
             if wid and wid not in seen:
                 seen[wid] = normalize(raw)
-        time.sleep(DELAY_SECS)
 
     papers = list(seen.values())
 
@@ -154,9 +148,7 @@ def main():
         "papers":       top,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2, ensure_ascii=False)
 
     print(f"\nSaved {len(top)} papers to {OUTPUT_FILE}")
     for p in top[:5]:
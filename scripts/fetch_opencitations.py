@@ -6,32 +6,55 @@ Run: python scripts/fetch_opencitations.py
 
 OpenCitations indexes open citation data.  No API key required.
 CrossRef provides bibliographic metadata for cited works.
+
+Harvesting is incremental. Citation edges (cited DOI, citing DOI, creation)
+and resolved CrossRef metadata are kept in a SQLite store under .build-cache/
+(kept between workflow runs). Each run asks COCI's /metadata for the citation
+counts of all DOIs in a few batched calls. It queries /citations only for
+DOIs whose count changed, filtered to citations created on or after the last
+one seen; when that leaves the store short of COCI's count (COCI also adds
+citations older than the newest one), it fetches the DOI's full list once
+more. It resolves through CrossRef only citing DOIs not yet in the store.
+The output lists every citation ever harvested. A lost store is rebuilt from
+scratch on the next run.
 """
 import json
-import re
-import time
-import urllib.request
+import sqlite3
 import urllib.parse
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timedelta
+
+from lib import artifacts, front_matter, http, instrument
 
 ROOT         = Path(__file__).resolve().parents[1]
-CONTENT_ROOT = ROOT / "content"
 OUTPUT_FILE  = ROOT / "static" / "data" / "opencitations.json"
+STORE_FILE   = ROOT / ".build-cache" / "opencitations.sqlite"
 
 OC_BASE    = "https://opencitations.net/index/coci/api/v1"
 CR_BASE    = "https://api.crossref.org/works"
 MAILTO     = "bampel@gsu.edu"
 
-SECTION_DIRS = [
-    "journal_publication",
-    "conference_publication",
-    "workshop_publication",
-]
-
-DELAY_SECS = 0.5   # polite delay between API calls
-MAX_CITATIONS_PER_PAPER = 50   # fetch up to this many citing papers per DOI
-TOP_CITING_TOTAL        = 30   # keep the most recent N across all papers
+METADATA_BATCH = 20   # DOIs per COCI /metadata call ("__"-joined in the URL)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS citations (
+    cited_doi  TEXT NOT NULL,
+    citing_doi TEXT NOT NULL,
+    creation   TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (cited_doi, citing_doi)
+);
+CREATE TABLE IF NOT EXISTS harvest (
+    cited_doi      TEXT PRIMARY KEY,
+    citation_count INTEGER,
+    last_creation  TEXT NOT NULL DEFAULT '',
+    checked        TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS works (
+    doi      TEXT PRIMARY KEY,
+    metadata TEXT NOT NULL,
+    resolved TEXT NOT NULL
+);
+"""
 
 
 # ---------------------------------------------------------------------------
@@ -40,50 +63,67 @@ TOP_CITING_TOTAL        = 30   # keep the most recent N across all papers
 
 def load_doi_map() -> dict:
     """Return {doi: paper_title} for all publications with a DOI."""
-    doi_map = {}
-    doi_re  = re.compile(r"^doi:\s*['\"]?(.+?)['\"]?\s*$", re.IGNORECASE)
+    return front_matter.get_index().doi_map()
 
-    for section in SECTION_DIRS:
-        for path in (CONTENT_ROOT / section).rglob("index.md"):
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            if not text.startswith("---"):
-                continue
-            parts = text.split("---", 2)
-            if len(parts) < 3:
-                continue
 
-            doi   = ""
-            title = ""
-            for line in parts[1].splitlines():
-                m = doi_re.match(line)
-                if m:
-                    doi = m.group(1).strip()
-                if line.strip().startswith("title:"):
-                    title = line.split(":", 1)[1].strip().strip('"').strip("'")
+# ---------------------------------------------------------------------------
+# Citation store
+# ---------------------------------------------------------------------------
+
+def open_store(path=STORE_FILE) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
 
-            if doi and title and doi not in ("''", '""', ""):
-                doi_map[doi] = title
 
-    return doi_map
+def _day_before(creation: str) -> str:
+    """The day before a COCI creation date (YYYY, YYYY-MM or YYYY-MM-DD)
+    starts, or "" (fetch everything) if it does not parse."""
+    try:
+        parts = [int(part) for part in creation.split("-")[:3]]
+        start = date(parts[0], *(parts[1:] + [1, 1])[:2])
+    except (ValueError, IndexError):
+        return ""
+    return (start - timedelta(days=1)).isoformat()
 
 
 # ---------------------------------------------------------------------------
 # OpenCitations: get citing DOIs
 # ---------------------------------------------------------------------------
 
-def fetch_citations(doi: str) -> list:
-    """Return list of {citing, creation, timespan} dicts from COCI."""
+def fetch_citation_counts(dois: list) -> dict:
+    """{lowercased doi: citation count} from COCI /metadata (missing on error)."""
+    batches = [dois[start:start + METADATA_BATCH] for start in range(0, len(dois), METADATA_BATCH)]
+
+    def fetch(batch):
+        joined = "__".join(urllib.parse.quote(doi, safe="") for doi in batch)
+        return http.get_client().get_json(f"{OC_BASE}/metadata/{joined}?format=json",
+                                          headers={"Accept": "application/json"})
+
+    counts = {}
+    for rows in http.gather(fetch, batches, default=[]):
+        for row in rows if isinstance(rows, list) else []:
+            try:
+                counts[row["doi"].lower()] = int(row["citation_count"])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return counts
+
+
+def fetch_citations(doi: str, since: str = "", ttl=None) -> list:
+    """Return list of {citing, creation, timespan} dicts from COCI, created
+    after `since` (YYYY-MM-DD) if given, or None on error. `ttl` overrides
+    the response cache's TTL."""
     url = f"{OC_BASE}/citations/{urllib.parse.quote(doi, safe='')}?format=json&sort=desc(creation)"
-    req = urllib.request.Request(url, headers={"Accept": "application/json"})
+    if since:
+        url += f"&filter=creation:>{since}"
     try:
-        with urllib.request.urlopen(req, timeout=20) as r:
-            data = json.loads(r.read())
-        if isinstance(data, list):
-            return data[:MAX_CITATIONS_PER_PAPER]
-        return []
+        data = http.get_client().get_json(url, headers={"Accept": "application/json"}, ttl=ttl)
+        return data if isinstance(data, list) else []
     except Exception as e:
         print(f"    OC error [{doi[:40]}]: {e}")
-        return []
+        return None
 
 
 # ---------------------------------------------------------------------------
@@ -91,11 +131,11 @@ def fetch_citations(doi: str) -> list:
 # ---------------------------------------------------------------------------
 
 def fetch_crossref(doi: str) -> dict:
+    """Metadata for `doi`; {"doi": doi, "title": ""} if CrossRef does not know
+    it, {} on any other error (retried next run)."""
     url = f"{CR_BASE}/{urllib.parse.quote(doi, safe='')}?mailto={MAILTO}"
-    req = urllib.request.Request(url, headers={"User-Agent": f"BampelWebsite/1.0 (mailto:{MAILTO})"})
     try:
-        with urllib.request.urlopen(req, timeout=15) as r:
-            msg = json.loads(r.read()).get("message", {})
+        msg = http.get_client().get_json(url, timeout=15).get("message", {})
 
         title = (msg.get("title") or [""])[0]
         year  = None
@@ -126,79 +166,162 @@ def fetch_crossref(doi: str) -> dict:
             "url":     f"https://doi.org/{doi}",
         }
     except Exception as e:
+        if getattr(getattr(e, "response", None), "status_code", None) == 404:
+            return {"doi": doi, "title": ""}
         print(f"    CrossRef error [{doi[:40]}]: {e}")
         return {}
 
 
+# ---------------------------------------------------------------------------
+# Harvest
+# ---------------------------------------------------------------------------
+
+def harvest_citations(db, doi_map: dict) -> int:
+    """Fetch new citation edges for every DOI whose count changed. Returns
+    the number of edges added."""
+    counts = fetch_citation_counts(list(doi_map))
+    stored = {row[0]: row[1:] for row in db.execute(
+        "SELECT cited_doi, citation_count, last_creation FROM harvest")}
+
+    todo = []   # (doi, since)
+    for doi in doi_map:
+        count, last_creation = stored.get(doi, (None, ""))
+        if doi in stored and counts.get(doi.lower()) == count:
+            continue
+        todo.append((doi, _day_before(last_creation) if last_creation else ""))
+    print(f"  {len(todo)} of {len(doi_map)} papers have new citations to fetch.")
+
+    added = 0
+    today = date.today().isoformat()
+    short = []  # filtered fetches that left the store below COCI's count
+    for (doi, since), cites in zip(todo, http.gather(lambda item: fetch_citations(*item), todo)):
+        if cites is None:
+            continue
+        print(f"  Citations for: {doi_map[doi][:55]}")
+        added += store_citations(db, doi, cites)
+        if since and _stored_count(db, doi) < counts.get(doi.lower(), 0):
+            # COCI adds edges whose creation predates the newest one already
+            # stored; the filter never returns those, so ask for everything.
+            short.append(doi)
+        else:
+            _mark_harvested(db, doi, counts, today)
+    if short:
+        print(f"  {len(short)} papers still short of their count; fetching all their citations.")
+    # ttl=0: a cached full list from an earlier run would be short too.
+    for doi, cites in zip(short, http.gather(lambda doi: fetch_citations(doi, ttl=0), short)):
+        if cites is None:
+            continue
+        added += store_citations(db, doi, cites)
+        _mark_harvested(db, doi, counts, today)
+    return added
+
+
+def store_citations(db, doi: str, cites: list) -> int:
+    """Insert the edges in `cites` for `doi`; returns how many were new."""
+    before = db.total_changes
+    db.executemany(
+        "INSERT OR IGNORE INTO citations (cited_doi, citing_doi, creation) VALUES (?, ?, ?)",
+        [(doi, c["citing"].strip(), c.get("creation") or "") for c in cites if (c.get("citing") or "").strip()],
+    )
+    db.commit()
+    new = db.total_changes - before
+    print(f"    → {len(cites)} returned, {new} new")
+    return new
+
+
+def _stored_count(db, doi: str) -> int:
+    return db.execute("SELECT COUNT(*) FROM citations WHERE cited_doi = ?", (doi,)).fetchone()[0]
+
+
+def _mark_harvested(db, doi: str, counts: dict, today: str):
+    last_creation, total = db.execute(
+        "SELECT COALESCE(MAX(creation), ''), COUNT(*) FROM citations WHERE cited_doi = ?", (doi,)
+    ).fetchone()
+    db.execute(
+        "INSERT OR REPLACE INTO harvest (cited_doi, citation_count, last_creation, checked) VALUES (?, ?, ?, ?)",
+        (doi, counts.get(doi.lower(), total), last_creation, today),
+    )
+    db.commit()
+
+
+def resolve_citing_works(db) -> int:
+    """Resolve citing DOIs not yet in the store through CrossRef. Returns the
+    number resolved."""
+    pending = [row[0] for row in db.execute(
+        "SELECT DISTINCT citing_doi FROM citations WHERE citing_doi NOT IN (SELECT doi FROM works)")]
+    print(f"\nResolving {len(pending)} new citing papers via CrossRef…")
+    resolved = 0
+    today = date.today().isoformat()
+    for doi, meta in zip(pending, http.gather(fetch_crossref, pending, default={})):
+        if not meta:
+            continue
+        db.execute("INSERT OR REPLACE INTO works (doi, metadata, resolved) VALUES (?, ?, ?)",
+                   (doi, json.dumps(meta, ensure_ascii=False), today))
+        resolved += 1
+    db.commit()
+    return resolved
+
+
+def citation_graph(db, doi_map: dict):
+    """(citations, edges): one entry per resolved citing paper, newest first,
+    and every stored edge."""
+    rank = {doi: index for index, doi in enumerate(doi_map)}
+    edges = [
+        {"cited_doi": cited, "citing_doi": citing, "creation": creation}
+        for cited, citing, creation in db.execute(
+            "SELECT cited_doi, citing_doi, creation FROM citations ORDER BY creation DESC, citing_doi, cited_doi")
+        if cited in doi_map
+    ]
+    cited_by = {}
+    for edge in edges:
+        cited_by.setdefault(edge["citing_doi"], []).append(edge)
+    works = {doi: json.loads(metadata) for doi, metadata in db.execute("SELECT doi, metadata FROM works")}
+
+    citations = []
+    for citing, cited in cited_by.items():
+        meta = works.get(citing)
+        if not meta or not meta.get("title"):
+            continue
+        cited.sort(key=lambda edge: rank[edge["cited_doi"]])
+        meta = dict(meta)
+        meta["cites_paper"] = doi_map[cited[0]["cited_doi"]]
+        meta["also_cites"]  = doi_map[cited[1]["cited_doi"]] if len(cited) > 1 else ""
+        meta["oc_creation"] = cited[0]["creation"]
+        citations.append(meta)
+    citations.sort(key=lambda c: c.get("oc_creation", ""), reverse=True)
+    return citations, edges
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+@instrument.stage()
 def main():
     print("=== Fetching OpenCitations Data ===")
 
     doi_map = load_doi_map()
     print(f"Found {len(doi_map)} papers with DOIs.\n")
 
-    # Collect all citing DOIs with their context (which paper they cite)
-    citing_events = []   # list of {citing_doi, cited_doi, cited_title, creation}
-
-    for doi, paper_title in doi_map.items():
-        print(f"  Fetching citations for: {paper_title[:55]}")
-        cites = fetch_citations(doi)
-        print(f"    → {len(cites)} citing papers")
-        for c in cites:
-            citing_doi = c.get("citing", "")
-            if citing_doi:
-                citing_events.append({
-                    "citing_doi":   citing_doi.strip(),
-                    "cited_doi":    doi,
-                    "cited_title":  paper_title,
-                    "creation":     c.get("creation", ""),
-                })
-        time.sleep(DELAY_SECS)
-
-    # Deduplicate by citing_doi (a paper might cite multiple of Dr. Ampel's papers)
-    seen_citing: dict = {}
-    for ev in citing_events:
-        cdoi = ev["citing_doi"]
-        if cdoi not in seen_citing:
-            seen_citing[cdoi] = ev
-        # If already seen, append the second cited_title as additional context
-        elif seen_citing[cdoi]["cited_doi"] != ev["cited_doi"]:
-            seen_citing[cdoi]["also_cites"] = ev["cited_title"]
-
-    # Sort by creation date desc (most recent first), take top N
-    events_sorted = sorted(
-        seen_citing.values(),
-        key=lambda e: e.get("creation", ""),
-        reverse=True,
-    )[:TOP_CITING_TOTAL]
-
-    print(f"\nResolving {len(events_sorted)} unique citing papers via CrossRef…")
-
-    citations_out = []
-    for ev in events_sorted:
-        time.sleep(DELAY_SECS)
-        meta = fetch_crossref(ev["citing_doi"])
-        if not meta.get("title"):
-            continue
-        meta["cites_paper"]  = ev.get("cited_title", "")
-        meta["also_cites"]   = ev.get("also_cites", "")
-        meta["oc_creation"]  = ev.get("creation", "")
-        citations_out.append(meta)
+    db = open_store()
+    try:
+        added = harvest_citations(db, doi_map)
+        resolved = resolve_citing_works(db)
+        citations_out, edges = citation_graph(db, doi_map)
+    finally:
+        db.close()
 
     output = {
         "refresh_date": datetime.now().strftime("%Y-%m-%d"),
         "total_dois_checked": len(doi_map),
         "citations": citations_out,
+        "edges": edges,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2, ensure_ascii=False)
 
-    print(f"\nSaved {len(citations_out)} resolved citations to {OUTPUT_FILE}")
+    print(f"\nAdded {added} citation edges, resolved {resolved} citing papers.")
+    print(f"Saved {len(citations_out)} resolved citations ({len(edges)} edges) to {OUTPUT_FILE}")
     for c in citations_out[:5]:
         print(f"  [{c.get('year','?')}] {c.get('title','?')[:60]}")
 
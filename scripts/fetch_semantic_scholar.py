@@ -5,34 +5,47 @@ Fetch Semantic Scholar data for Dr. Ampel's publications:
 
 Saves results to static/data/semantic_scholar.json for the semantic_scholar shortcode.
 
+S2 paper IDs and citations are kept in .build-cache/semantic_scholar_store.json
+between runs. Each run resolves every publication with one /paper/batch call
+(stored paperIds, or "DOI:<doi>" for papers with a DOI in their front matter)
+and searches by title only for papers it cannot resolve that way; titles that
+search did not find are retried after MISS_RETRY_DAYS. The batch also returns
+each paper's citationCount, and citations are re-fetched (every page) only for
+papers whose count changed.
+
 Run: python scripts/fetch_semantic_scholar.py
 
 Refreshes the data — run whenever you want updated results (e.g., monthly).
 S2 API docs: https://api.semanticscholar.org/api-docs/
 """
-import json
-import time
-import urllib.request
 import urllib.parse
 from datetime import date
 from pathlib import Path
 
+from lib import artifacts, front_matter, http, instrument
+
 SCRIPT_DIR  = Path(__file__).parent
 PUBS_FILE   = SCRIPT_DIR.parent / "static" / "data" / "publications.json"
 OUTPUT_FILE = SCRIPT_DIR.parent / "static" / "data" / "semantic_scholar.json"
+STORE_FILE  = SCRIPT_DIR.parent / ".build-cache" / "semantic_scholar_store.json"
+STORE_VERSION = 1
 
 S2_GRAPH = "https://api.semanticscholar.org/graph/v1"
 S2_REC   = "https://api.semanticscholar.org/recommendations/v1"
 
-DELAY_SECS = 1.5        # polite delay between API calls (free tier, ~1 req/s limit)
 CURRENT_YEAR = date.today().year
 CITATION_CUTOFF_YEAR = CURRENT_YEAR - 2   # only citations from this year or newer
-MAX_PAPERS_FOR_IDS = 20   # search S2 IDs for the N most recent publications
-MAX_PAPERS_FOR_CITATIONS = 8   # get citations for the top N by recency
+MAX_PAPERS_FOR_IDS = None   # resolve S2 IDs for every publication (None = no cap)
+MAX_PAPERS_FOR_CITATIONS = None   # keep citations for every resolved paper
 MAX_CITATIONS = 20
 MAX_RECOMMENDATIONS = 15
+MAX_RECOMMENDATION_SEEDS = 20   # most recent resolved papers used as seeds
+BATCH_SIZE = 500          # /paper/batch accepts up to 500 IDs
+CITATION_PAGE_SIZE = 1000 # /paper/{id}/citations returns at most 1000 per page
+MISS_RETRY_DAYS = 30
 
-PAPER_SEARCH_FIELDS = "paperId,title,year"
+PAPER_SEARCH_FIELDS = "paperId,title,year,citationCount"
+BATCH_FIELDS        = "paperId,title,citationCount"
 CITATION_FIELDS     = "title,year,authors,venue,externalIds"
 REC_FIELDS          = "title,year,authors,venue,externalIds"
 
@@ -48,23 +61,18 @@ def _headers():
     }
 
 
-def safe_get(url):
+def safe_get(url, **kwargs):
+    """GET through the shared client (paced at S2's ~1 req/s)."""
     try:
-        req = urllib.request.Request(url, headers=_headers())
-        with urllib.request.urlopen(req, timeout=20) as resp:
-            return json.loads(resp.read())
+        return http.get_client().get_json(url, headers=_headers(), **kwargs)
     except Exception as e:
         print(f"  GET error ({url[:80]}): {e}")
         return None
 
 
-def safe_post(url, payload):
+def safe_post(url, payload, **kwargs):
     try:
-        body = json.dumps(payload).encode()
-        headers = {**_headers(), "Content-Type": "application/json"}
-        req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-        with urllib.request.urlopen(req, timeout=25) as resp:
-            return json.loads(resp.read())
+        return http.get_client().post_json(url, payload, headers=_headers(), timeout=25, **kwargs)
     except Exception as e:
         print(f"  POST error ({url[:80]}): {e}")
         return None
@@ -74,45 +82,52 @@ def safe_post(url, payload):
 # Core API calls
 # ---------------------------------------------------------------------------
 
-def find_s2_paper_id(title):
-    """Return Semantic Scholar paperId for a paper given its title, or None."""
+def find_s2_paper(title):
+    """Search S2 by title; return the best match {paperId, title, citationCount}, or None."""
     query = urllib.parse.quote(title)
     url   = f"{S2_GRAPH}/paper/search?query={query}&fields={PAPER_SEARCH_FIELDS}&limit=5"
     res   = safe_get(url)
-    time.sleep(DELAY_SECS)
     if not res or not res.get("data"):
         return None
 
     # Pick the best match by word-overlap similarity
     target_words = set(title.lower().split())
-    best_id, best_overlap = None, 0.0
+    best, best_overlap = None, 0.0
     for paper in res["data"]:
         s2_words = set((paper.get("title") or "").lower().split())
         overlap  = len(target_words & s2_words) / max(len(target_words), 1)
         if overlap > best_overlap:
             best_overlap = overlap
-            best_id      = paper["paperId"]
-
-    return best_id if best_overlap >= 0.6 else None
-
-
-def get_citations_for_paper(paper_id, cited_title):
-    """Return a list of recent papers that cited `paper_id`."""
-    url = (f"{S2_GRAPH}/paper/{paper_id}/citations"
-           f"?fields={CITATION_FIELDS}&limit=100")
-    res = safe_get(url)
-    time.sleep(DELAY_SECS)
-    if not res:
-        return []
-
-    results = []
-    for item in res.get("data", []):
-        cp   = item.get("citingPaper") or {}
-        year = cp.get("year")
-        if year and year < CITATION_CUTOFF_YEAR:
-            continue
-        results.append(_format_paper(cp, cited_paper=cited_title))
-
+            best         = paper
+
+    return best if best_overlap >= 0.6 else None
+
+
+def batch_papers(ids):
+    """Look up S2 paper IDs (or "DOI:<doi>") in bulk; returns {id: paper or None},
+    or None when a batch request failed."""
+    found = {}
+    for start in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[start:start + BATCH_SIZE]
+        res   = safe_post(f"{S2_GRAPH}/paper/batch?fields={BATCH_FIELDS}", {"ids": chunk}, ttl=0)
+        if not isinstance(res, list):
+            return None
+        found.update(zip(chunk, res))
+    return found
+
+
+def get_citations_for_paper(paper_id):
+    """Every paper that cited `paper_id` (all pages), or None if a page failed."""
+    results, offset = [], 0
+    while offset is not None:
+        url = (f"{S2_GRAPH}/paper/{paper_id}/citations"
+               f"?fields={CITATION_FIELDS}&offset={offset}&limit={CITATION_PAGE_SIZE}")
+        res = safe_get(url, ttl=0)
+        if res is None:
+            return None
+        for item in res.get("data", []):
+            results.append(_format_paper(item.get("citingPaper") or {}))
+        offset = res.get("next")
     return results
 
 
@@ -123,7 +138,6 @@ def get_recommendations(positive_ids):
     url     = f"{S2_REC}/papers?fields={REC_FIELDS}&limit=25"
     payload = {"positivePaperIds": positive_ids[:20], "negativePaperIds": []}
     res     = safe_post(url, payload)
-    time.sleep(DELAY_SECS)
     if not res:
         return []
     return [_format_paper(p) for p in res.get("recommendedPapers", [])]
@@ -156,52 +170,140 @@ def _format_paper(paper, cited_paper=None):
     return entry
 
 
+# ---------------------------------------------------------------------------
+# ID and citation store
+# ---------------------------------------------------------------------------
+
+def title_key(title):
+    return " ".join((title or "").lower().split())
+
+
+def load_store():
+    store = artifacts.read_json(STORE_FILE, {}) or {}
+    if store.get("version") != STORE_VERSION:
+        store = {}
+    # Copy: artifacts may hand out a shared, read-only object.
+    return {
+        "version":   STORE_VERSION,
+        "papers":    dict(store.get("papers", {})),
+        "misses":    dict(store.get("misses", {})),
+        "citations": dict(store.get("citations", {})),
+    }
+
+
+def save_store(store):
+    artifacts.write_json(STORE_FILE, store, newline=True, indent=1, ensure_ascii=False)
+
+
+def _recently_missed(store, key):
+    missed = store["misses"].get(key)
+    if not missed:
+        return False
+    try:
+        return (date.today() - date.fromisoformat(missed)).days < MISS_RETRY_DAYS
+    except ValueError:
+        return False
+
+
+def resolve_paper_ids(titles, store):
+    """[(paperId, title, citationCount)] for the titles S2 knows, in `titles` order.
+
+    Stored IDs and DOIs go through one /paper/batch call; only the rest are
+    searched by title. Updates store["papers"] and store["misses"].
+    """
+    dois = {title_key(title): doi for doi, title in front_matter.get_index().doi_map().items()}
+    lookup = {}   # title key -> batch ID
+    for title in titles:
+        key = title_key(title)
+        known = store["papers"].get(key, {}).get("paperId")
+        if known:
+            lookup[key] = known
+        elif dois.get(key):
+            lookup[key] = f"DOI:{dois[key]}"
+
+    batch = batch_papers(sorted(set(lookup.values()))) if lookup else {}
+    if batch is None:
+        # Batch failed: fall back to the stored IDs (citation counts unknown).
+        batch = {}
+        for key, entry in store["papers"].items():
+            if lookup.get(key) == entry.get("paperId"):
+                batch[entry["paperId"]] = {"paperId": entry["paperId"], "citationCount": entry.get("citationCount")}
+    resolved = {}
+    for key, batch_id in lookup.items():
+        paper = batch.get(batch_id)
+        if paper and paper.get("paperId"):
+            resolved[key] = paper
+
+    search = [title for title in titles
+              if title_key(title) not in resolved and not _recently_missed(store, title_key(title))]
+    if search:
+        print(f"  Searching S2 by title for {len(search)} papers…")
+    for title, paper in zip(search, http.gather(find_s2_paper, search)):
+        key = title_key(title)
+        if paper:
+            resolved[key] = paper
+            store["misses"].pop(key, None)
+            print(f"  Found: {title[:60]} → {paper['paperId']}")
+        else:
+            store["misses"][key] = date.today().isoformat()
+            print(f"  Not found: {title[:60]}")
+
+    paper_ids = []
+    for title in titles:
+        key   = title_key(title)
+        paper = resolved.get(key)
+        if not paper:
+            continue
+        entry = {"paperId": paper["paperId"], "citationCount": paper.get("citationCount")}
+        if dois.get(key):
+            entry["doi"] = dois[key]
+        store["papers"][key] = entry
+        paper_ids.append((paper["paperId"], title, paper.get("citationCount")))
+    return paper_ids
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+@instrument.stage()
 def main():
     print("=== Fetch Semantic Scholar Data ===")
 
     # Load publications
-    with open(PUBS_FILE) as f:
-        pubs = json.load(f)
+    pubs = artifacts.read_json(PUBS_FILE)
 
     # Prioritise recent publications (better S2 coverage)
     pubs_sorted = sorted(pubs, key=lambda p: p.get("year", 0), reverse=True)
     target_pubs = pubs_sorted[:MAX_PAPERS_FOR_IDS]
+    store = load_store()
 
-    # --- Step 1: Find S2 paper IDs ---
-    print(f"\nSearching S2 IDs for {len(target_pubs)} papers…")
-    paper_ids = []  # list of (paperId, title)
-    for pub in target_pubs:
-        title = pub["title"]
-        short = title[:60]
-        print(f"  Searching: {short}…")
-        pid = find_s2_paper_id(title)
-        if pid:
-            paper_ids.append((pid, title))
-            print(f"    → {pid}")
-        else:
-            print("    → not found")
-
-    print(f"\nResolved {len(paper_ids)} / {len(target_pubs)} papers.")
+    # --- Step 1: Resolve S2 paper IDs ---
+    print(f"\nResolving S2 IDs for {len(target_pubs)} papers…")
+    paper_ids = resolve_paper_ids([pub["title"] for pub in target_pubs], store)
+    print(f"Resolved {len(paper_ids)} / {len(target_pubs)} papers.")
 
     # --- Step 2: Get citations ---
-    print(f"\nFetching citations for top {MAX_PAPERS_FOR_CITATIONS} papers…")
+    targets = paper_ids[:MAX_PAPERS_FOR_CITATIONS]
+    stale   = [(pid, count) for pid, _, count in targets
+               if store["citations"].get(pid, {}).get("citationCount") != count]
+    print(f"\nFetching citations for {len(stale)} papers with new citations "
+          f"({len(targets) - len(stale)} unchanged)…")
+    for (pid, count), cits in zip(stale, http.gather(lambda item: get_citations_for_paper(item[0]), stale)):
+        if cits is not None:
+            store["citations"][pid] = {"citationCount": count, "papers": cits}
+
     all_citations  = []
     seen_cit_titles = set()
-
-    for pid, cited_title in paper_ids[:MAX_PAPERS_FOR_CITATIONS]:
-        short = cited_title[:55]
-        print(f"  Citations for: {short}…")
-        cits = get_citations_for_paper(pid, cited_title)
-        for c in cits:
-            key = c["title"].lower().strip()
+    for pid, cited_title, _ in targets:
+        for paper in store["citations"].get(pid, {}).get("papers", []):
+            year = paper.get("year")
+            if year and year < CITATION_CUTOFF_YEAR:
+                continue
+            key = paper["title"].lower().strip()
             if key and key not in seen_cit_titles:
                 seen_cit_titles.add(key)
-                all_citations.append(c)
-        print(f"    → {len(cits)} new citations")
+                all_citations.append({**paper, "cited_paper": cited_title})
 
     # Sort by year descending, keep top N
     all_citations.sort(key=lambda c: c.get("year") or 0, reverse=True)
@@ -211,7 +313,7 @@ def main():
 
     # --- Step 3: Get recommendations ---
     print("\nFetching paper recommendations…")
-    ids_only = [pid for pid, _ in paper_ids]
+    ids_only = [pid for pid, _, _ in paper_ids][:MAX_RECOMMENDATION_SEEDS]
     recs     = get_recommendations(ids_only)
 
     # Filter out Dr. Ampel's own papers
@@ -227,9 +329,8 @@ def main():
         "recommendations": top_recs,
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(output, f, indent=2)
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
+    save_store(store)
 
     print(f"\nSaved to {OUTPUT_FILE}")
     print(f"  Citations:       {len(top_citations)}")
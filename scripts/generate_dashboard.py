@@ -10,43 +10,51 @@ Output:
     - ../static/images/impact-dashboard-dark.png (dark mode)
 """
 
-import json
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 from pathlib import Path
 
+from lib import artifacts, instrument, render
+
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 METRICS_FILE = PROJECT_ROOT / "static" / "data" / "scholar-metrics.json"
 OUTPUT_DIR = PROJECT_ROOT / "static" / "images"
 
+PALETTES = {
+    'light': {
+        'bg_color': '#ffffff',
+        'card_color': '#f6f8fa',
+        'text_color': '#1f2328',
+        'accent_color': '#0969da',
+        'bar_color': '#0969da',
+        'muted_color': '#656d76',
+    },
+    'dark': {
+        'bg_color': '#0d1117',
+        'card_color': '#161b22',
+        'text_color': '#e6edf3',
+        'accent_color': '#58a6ff',
+        'bar_color': '#58a6ff',
+        'muted_color': '#8b949e',
+    },
+}
+
 
 def load_metrics():
     """Load metrics from JSON file."""
-    with open(METRICS_FILE, 'r') as f:
-        return json.load(f)
+    return artifacts.read_json(METRICS_FILE)
 
 
-def draw_dashboard(dark_mode=False):
-    """Generate the dashboard visualization."""
-    data = load_metrics()
-    
-    # Colors
-    if dark_mode:
-        bg_color = '#0d1117'
-        card_color = '#161b22'
-        text_color = '#e6edf3'
-        accent_color = '#58a6ff'
-        bar_color = '#58a6ff'
-        muted_color = '#8b949e'
-    else:
-        bg_color = '#ffffff'
-        card_color = '#f6f8fa'
-        text_color = '#1f2328'
-        accent_color = '#0969da'
-        bar_color = '#0969da'
-        muted_color = '#656d76'
+def draw_dashboard(data, palette):
+    """Generate the dashboard visualization in one palette of PALETTES."""
+    bg_color = palette['bg_color']
+    card_color = palette['card_color']
+    text_color = palette['text_color']
+    accent_color = palette['accent_color']
+    bar_color = palette['bar_color']
+    muted_color = palette['muted_color']
     
     fig = plt.figure(figsize=(12, 8), facecolor=bg_color)
     
@@ -127,27 +135,22 @@ def draw_dashboard(dark_mode=False):
     return fig
 
 
+@instrument.stage()
 def main():
     """Generate both light and dark mode dashboard images."""
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # Generate light mode
-    print("Generating light mode dashboard...")
-    fig_light = draw_dashboard(dark_mode=False)
-    light_path = OUTPUT_DIR / 'impact-dashboard.png'
-    fig_light.savefig(light_path, dpi=150, bbox_inches='tight', 
-                      facecolor='white', edgecolor='none')
-    plt.close(fig_light)
-    print(f"  Saved: {light_path}")
-    
-    # Generate dark mode
-    print("Generating dark mode dashboard...")
-    fig_dark = draw_dashboard(dark_mode=True)
-    dark_path = OUTPUT_DIR / 'impact-dashboard-dark.png'
-    fig_dark.savefig(dark_path, dpi=150, bbox_inches='tight', 
-                     facecolor='#0d1117', edgecolor='none')
-    plt.close(fig_dark)
-    print(f"  Saved: {dark_path}")
+    print("Generating light and dark mode dashboards...")
+    saved = render.render_themes(
+        draw_dashboard,
+        load_metrics(),
+        PALETTES,
+        {
+            'light': OUTPUT_DIR / 'impact-dashboard.png',
+            'dark': OUTPUT_DIR / 'impact-dashboard-dark.png',
+        },
+        savefig={'dpi': 150, 'bbox_inches': 'tight'},
+    )
+    for path in saved.values():
+        print(f"  Saved: {path}")
     
     print("\nDone! Dashboard images generated successfully.")
 
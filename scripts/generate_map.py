@@ -10,6 +10,11 @@ Usage:
 Output:
     - ../static/images/research-map.png (light mode)
     - ../static/images/research-map-dark.png (dark mode)
+
+The projected, themed basemaps (land, coastlines, borders, states, grid) are
+cached as raster layers in .build-cache/layers/, keyed by projection,
+extent, axes position, DPI and palette. Later runs, including offline ones,
+only draw the markers and labels over them.
 """
 
 import json
@@ -19,7 +24,11 @@ from matplotlib.patches import FancyBboxPatch, Rectangle
 import numpy as np
 from pathlib import Path
 
+from lib import artifacts, instrument, render
+from lib.gazetteer import Gazetteer
+
 try:
+    import cartopy
     import cartopy.crs as ccrs
     import cartopy.feature as cfeature
     HAS_CARTOPY = True
@@ -30,77 +39,193 @@ except ImportError:
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 LOCATIONS_FILE = PROJECT_ROOT / "static" / "data" / "locations.json"
+PUBLICATIONS_FILE = PROJECT_ROOT / "static" / "data" / "publications.json"
 OUTPUT_DIR = PROJECT_ROOT / "static" / "images"
 
+FIGSIZE = (16, 10)
+DPI = 150
+# Axes rectangles in figure coordinates.
+VIEW_RECTS = {
+    'world': [0.02, 0.15, 0.96, 0.75],  # main world map (takes most of the space)
+    'us': [0.58, 0.02, 0.40, 0.38],  # US inset map (bottom right)
+}
+US_EXTENT = [-125, -66, 24, 50]
+# Natural Earth scale per view: what cartopy's AdaptiveScaler picks for each
+# view's extent (110m for the globe, 50m for the zoomed US inset).
+VIEW_SCALES = {
+    'world': '110m',
+    'us': '50m',
+}
+
 
 def load_locations():
-    """Load locations from JSON file."""
+    """Load locations from JSON file, adding conference venues placed by the
+    data/venue_locations.yaml gazetteer so new papers at known venues appear
+    without editing locations.json."""
     with open(LOCATIONS_FILE, 'r') as f:
-        return json.load(f)
+        data = json.load(f)
+
+    gazetteer = Gazetteer.load()
+    derived = gazetteer.presentations(artifacts.read_json(PUBLICATIONS_FILE, []))
+    gazetteer.report_unmatched("[map]")
+    presentations = data.setdefault('presentations', [])
+    by_place = {(loc['name'], loc['lat'], loc['lng']): loc for loc in presentations}
+    for loc in derived:
+        existing = by_place.get((loc['name'], loc['lat'], loc['lng']))
+        if existing is None:
+            presentations.append(loc)
+        else:
+            existing['years'] = sorted(set(existing['years']) | set(loc['years']))
+    return data
+
+
+PALETTES = {
+    'light': {
+        'bg_color': '#f8fafc',  # Slate 50
+        'land_color': '#e2e8f0',  # Slate 200
+        'ocean_color': '#dbeafe',  # Blue 100
+        'border_color': '#cbd5e1',  # Slate 300
+        'text_color': '#1e293b',  # Slate 800
+        'presentation_color': '#2563eb',  # Blue 600
+        'presentation_glow': '#3b82f6',  # Blue 500
+        'collaborator_color': '#059669',  # Emerald 600
+        'collaborator_glow': '#10b981',  # Emerald 500
+        'accent_color': '#7c3aed',  # Violet 600
+        'muted_color': '#64748b',  # Slate 500
+        'inset_border': '#94a3b8',  # Slate 400
+    },
+    'dark': {
+        'bg_color': '#0f172a',  # Slate 900
+        'land_color': '#1e293b',  # Slate 800
+        'ocean_color': '#0c1929',  # Deep navy
+        'border_color': '#334155',  # Slate 700
+        'text_color': '#f1f5f9',  # Slate 100
+        'presentation_color': '#3b82f6',  # Blue 500
+        'presentation_glow': '#60a5fa',  # Blue 400
+        'collaborator_color': '#10b981',  # Emerald 500
+        'collaborator_glow': '#34d399',  # Emerald 400
+        'accent_color': '#8b5cf6',  # Violet 500
+        'muted_color': '#94a3b8',  # Slate 400
+        'inset_border': '#475569',  # Slate 600
+    },
+}
+
+
+_basemaps = {}
 
 
-def draw_map(dark_mode=False):
+def load_basemap(scale):
+    """Natural Earth geometries at one scale, read once per process and only
+    when a basemap layer has to be (re)built."""
+    if scale not in _basemaps:
+        _basemaps[scale] = {
+            'land': list(cfeature.LAND.with_scale(scale).geometries()),
+            'coastline': list(cfeature.COASTLINE.with_scale(scale).geometries()),
+            'borders': list(cfeature.BORDERS.with_scale(scale).geometries()),
+            'states': list(cfeature.STATES.with_scale(scale).geometries()),
+        }
+    return _basemaps[scale]
+
+
+def view_projection(view):
+    if view == 'world':
+        return ccrs.Robinson()
+    return ccrs.AlbersEqualArea(central_longitude=-96, central_latitude=37.5)
+
+
+def add_view_axes(fig, view, ocean_color):
+    ax = fig.add_axes(VIEW_RECTS[view], projection=view_projection(view))
+    ax.set_facecolor(ocean_color)
+    return ax
+
+
+def set_view_extent(ax, view):
+    if view == 'world':
+        ax.set_global()
+    else:
+        ax.set_extent(US_EXTENT, crs=ccrs.PlateCarree())
+
+
+def basemap_layer(view, palette):
+    """The projected, themed basemap of one view as a cached raster layer."""
+    land_color = palette['land_color']
+    ocean_color = palette['ocean_color']
+    border_color = palette['border_color']
+
+    def draw(fig):
+        ax = add_view_axes(fig, view, ocean_color)
+        set_view_extent(ax, view)
+        basemap = load_basemap(VIEW_SCALES[view])
+        geodetic = ccrs.PlateCarree()
+        if view == 'world':
+            # Add subtle grid to main map
+            ax.gridlines(draw_labels=False, linewidth=0.3, color=border_color,
+                         alpha=0.5, linestyle='--')
+        ax.add_geometries(basemap['land'], geodetic, facecolor=land_color, edgecolor='none')
+        ax.add_geometries(basemap['coastline'], geodetic, facecolor='none', linewidth=0.5,
+                          edgecolor=border_color)
+        ax.add_geometries(basemap['borders'], geodetic, facecolor='none', linewidth=0.3,
+                          edgecolor=border_color, linestyle=':', alpha=0.7)
+        if view == 'us':
+            ax.add_geometries(basemap['states'], geodetic, facecolor='none', linewidth=0.2,
+                              edgecolor=border_color, alpha=0.5)
+        return ax
+
+    key = {
+        'view': view,
+        'projection': view_projection(view).proj4_init,
+        'extent': US_EXTENT if view == 'us' else 'global',
+        'scale': VIEW_SCALES[view],
+        'rect': VIEW_RECTS[view],
+        'colors': [land_color, ocean_color, border_color],
+        'cartopy': cartopy.__version__,
+    }
+    return render.cached_layer(f"basemap-{view}", key, draw, FIGSIZE, DPI)
+
+
+def add_view(fig, view, palette):
+    """Axes for one view with its basemap layer drawn behind everything else."""
+    ax = add_view_axes(fig, view, palette['ocean_color'])
+    layer = basemap_layer(view, palette)
+    ax.imshow(layer['rgba'], extent=(*layer['xlim'], *layer['ylim']), transform=ax.projection,
+              origin='upper', interpolation='none', zorder=0)
+    set_view_extent(ax, view)
+    return ax
+
+
+def prepare_map():
+    """Everything the map needs that does not depend on the theme. Builds any
+    missing basemap layers here so the render workers only read them."""
+    for palette in PALETTES.values():
+        for view in VIEW_RECTS:
+            basemap_layer(view, palette)
+    return {'data': load_locations()}
+
+
+def draw_map(prepared, palette):
     """Generate a beautiful map visualization with US inset using cartopy."""
     if not HAS_CARTOPY:
         print("Cartopy required for map generation")
         return None
         
-    data = load_locations()
-    
-    # Color schemes - more vibrant and modern
-    if dark_mode:
-        bg_color = '#0f172a'  # Slate 900
-        land_color = '#1e293b'  # Slate 800
-        ocean_color = '#0c1929'  # Deep navy
-        border_color = '#334155'  # Slate 700
-        text_color = '#f1f5f9'  # Slate 100
-        presentation_color = '#3b82f6'  # Blue 500
-        presentation_glow = '#60a5fa'  # Blue 400
-        collaborator_color = '#10b981'  # Emerald 500
-        collaborator_glow = '#34d399'  # Emerald 400
-        accent_color = '#8b5cf6'  # Violet 500
-        muted_color = '#94a3b8'  # Slate 400
-        inset_border = '#475569'  # Slate 600
-    else:
-        bg_color = '#f8fafc'  # Slate 50
-        land_color = '#e2e8f0'  # Slate 200
-        ocean_color = '#dbeafe'  # Blue 100
-        border_color = '#cbd5e1'  # Slate 300
-        text_color = '#1e293b'  # Slate 800
-        presentation_color = '#2563eb'  # Blue 600
-        presentation_glow = '#3b82f6'  # Blue 500
-        collaborator_color = '#059669'  # Emerald 600
-        collaborator_glow = '#10b981'  # Emerald 500
-        accent_color = '#7c3aed'  # Violet 600
-        muted_color = '#64748b'  # Slate 500
-        inset_border = '#94a3b8'  # Slate 400
-    
-    # Create figure
-    fig = plt.figure(figsize=(16, 10), facecolor=bg_color)
+    data = prepared['data']
     
-    # Main world map (takes most of the space)
-    ax_main = fig.add_axes([0.02, 0.15, 0.96, 0.75], projection=ccrs.Robinson())
-    ax_main.set_facecolor(ocean_color)
-    ax_main.set_global()
+    # Color schemes - more vibrant and modern (see PALETTES)
+    bg_color = palette['bg_color']
+    border_color = palette['border_color']
+    text_color = palette['text_color']
+    presentation_color = palette['presentation_color']
+    presentation_glow = palette['presentation_glow']
+    collaborator_color = palette['collaborator_color']
+    collaborator_glow = palette['collaborator_glow']
+    accent_color = palette['accent_color']
+    muted_color = palette['muted_color']
+    inset_border = palette['inset_border']
     
-    # US inset map (bottom right)
-    ax_us = fig.add_axes([0.58, 0.02, 0.40, 0.38], projection=ccrs.AlbersEqualArea(
-        central_longitude=-96, central_latitude=37.5))
-    ax_us.set_facecolor(ocean_color)
-    ax_us.set_extent([-125, -66, 24, 50], crs=ccrs.PlateCarree())
-    
-    # Add subtle grid to main map
-    gl = ax_main.gridlines(draw_labels=False, linewidth=0.3, color=border_color, 
-                           alpha=0.5, linestyle='--')
-    
-    # Add map features to both maps
-    for ax in [ax_main, ax_us]:
-        ax.add_feature(cfeature.LAND, facecolor=land_color, edgecolor='none')
-        ax.add_feature(cfeature.COASTLINE, linewidth=0.5, edgecolor=border_color)
-        ax.add_feature(cfeature.BORDERS, linewidth=0.3, edgecolor=border_color, 
-                       linestyle=':', alpha=0.7)
-        if ax == ax_us:
-            ax.add_feature(cfeature.STATES, linewidth=0.2, edgecolor=border_color, alpha=0.5)
+    # Create figure; land, borders and grid come from the cached basemap layers
+    fig = plt.figure(figsize=FIGSIZE, facecolor=bg_color)
+    ax_main = add_view(fig, 'world', palette)
+    ax_us = add_view(fig, 'us', palette)
     
     # Separate US vs international locations
     us_presentations = []
@@ -364,33 +489,27 @@ def draw_map(dark_mode=False):
     return fig
 
 
+@instrument.stage()
 def main():
     """Generate both light and dark mode map images."""
     if not HAS_CARTOPY:
-        print("Error: cartopy is required. Install with: pip install cartopy")
-        return
+        # Fail the task so the pipeline does not re-export the stale maps.
+        raise SystemExit("Error: cartopy is required. Install with: pip install cartopy")
         
-    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    # Generate light mode
-    print("Generating light mode map...")
-    fig_light = draw_map(dark_mode=False)
-    if fig_light:
-        light_path = OUTPUT_DIR / 'research-map.png'
-        fig_light.savefig(light_path, dpi=150, bbox_inches='tight', 
-                          facecolor='#f8fafc', edgecolor='none')
-        plt.close(fig_light)
-        print(f"  Saved: {light_path}")
-    
-    # Generate dark mode
-    print("Generating dark mode map...")
-    fig_dark = draw_map(dark_mode=True)
-    if fig_dark:
-        dark_path = OUTPUT_DIR / 'research-map-dark.png'
-        fig_dark.savefig(dark_path, dpi=150, bbox_inches='tight', 
-                         facecolor='#0f172a', edgecolor='none')
-        plt.close(fig_dark)
-        print(f"  Saved: {dark_path}")
+    print("Generating light and dark mode maps...")
+    saved = render.render_themes(
+        draw_map,
+        prepare_map(),
+        PALETTES,
+        {
+            'light': OUTPUT_DIR / 'research-map.png',
+            'dark': OUTPUT_DIR / 'research-map-dark.png',
+        },
+        savefig={'dpi': DPI, 'bbox_inches': 'tight'},
+    )
+    for path in saved.values():
+        if path:
+            print(f"  Saved: {path}")
     
     print("\nDone! Map images generated successfully.")
 
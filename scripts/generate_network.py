@@ -7,14 +7,20 @@ import json
 import math
 import os
 import networkx as nx
+import matplotlib.colors as mcolors
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib import patheffects
+from matplotlib.collections import LineCollection
 import numpy as np
 from collections import defaultdict
 from pathlib import Path
-from networkx.algorithms import community
 from networkx.readwrite import json_graph
 
+from lib import artifacts, communities, instrument, render
+from lib.graph_export import compact_graph, layout
+from lib.authors import is_main, main_author, resolve
+
 # --- CONFIGURATION ---
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
@@ -22,41 +28,15 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 PUBLICATIONS_FILE = PROJECT_ROOT / "static" / "data" / "publications.json"
 OUTPUT_IMG_DIR = PROJECT_ROOT / "static" / "images"
 OUTPUT_DATA_FILE = PROJECT_ROOT / "static" / "data" / "network_stats.json"
+OUTPUT_GRAPH_FILE = PROJECT_ROOT / "static" / "data" / "network.json"
+# "compact" (string table, index arrays and a precomputed layout; see
+# lib/graph_export.py) or "node-link" (networkx node_link_data).
+GRAPH_EXPORT_FORMATS = ("compact", "node-link")
 
-AUTHOR_NORMALIZATION = {
-    'B Ampel': 'Benjamin Ampel', 'Benjamin Ampel': 'Benjamin Ampel',
-    'H Chen': 'Hsinchun Chen', 'H. Chen': 'Hsinchun Chen',
-    'S Samtani': 'Sagar Samtani', 'S. Samtani': 'Sagar Samtani',
-    'S Ullman': 'Steven Ullman', 'S. Ullman': 'Steven Ullman',
-    'H Zhu': 'Hongyi Zhu', 'H. Zhu': 'Hongyi Zhu',
-    'M Patton': 'Mark Patton', 'M. Patton': 'Mark Patton',
-    'B Lazarine': 'Ben Lazarine', 'B. Lazarine': 'Ben Lazarine',
-    'T Vahedi': 'Tala Vahedi', 'T. Vahedi': 'Tala Vahedi',
-    'K Otto': 'Kaeli Otto', 'K. Otto': 'Kaeli Otto',
-    'Y Gao': 'Yang Gao', 'Y. Gao': 'Yang Gao',
-    'J Hu': 'James Hu', 'J. Hu': 'James Hu',
-    'CH Yang': 'Chi-Heng Yang', 'JF Nunamaker Jr': 'Jay Nunamaker',
-    'C Marx': 'Carolin Marx', 'C Dacosta': 'Cade Dacosta',
-    'C Zhang': 'Chengjun Zhang', 'M Hashim': 'Matthew Hashim',
-    'M Wagner': 'Mason Wagner', 'RY Reyes': 'Raul Reyes',
-    'S Yang': 'Shanchieh Yang'
-}
-
-MAIN_AUTHOR = 'Benjamin Ampel'
-
-def normalize_name(name):
-    if not isinstance(name, str):
-        return ""
-    name = name.strip()
-    return AUTHOR_NORMALIZATION.get(name, name)
-
-def is_main_author(name):
-    normalized = normalize_name(name)
-    return normalized == MAIN_AUTHOR or 'ampel' in name.lower()
+MAIN_AUTHOR = main_author() or 'Benjamin Ampel'
 
 def load_publications():
-    with open(PUBLICATIONS_FILE, 'r') as f:
-        data = json.load(f)
+    data = artifacts.read_json(PUBLICATIONS_FILE)
     # Support both list-of-pubs or dict-wrapper formats
     if isinstance(data, dict) and "individualPublications" in data:
         return data["individualPublications"]
@@ -80,7 +60,7 @@ def build_network_data(publications):
             continue # Skip invalid formats
 
         # Normalize and filter
-        authors = [normalize_name(a) for a in author_list]
+        authors = [resolve(a) for a in author_list]
         authors = [a for a in authors if a and a.strip()]
         
         # Add edges between all co-authors (Clique)
@@ -90,9 +70,9 @@ def build_network_data(publications):
                 if u == v: continue
                 
                 # Update counts relative to Main Author
-                if is_main_author(u) and not is_main_author(v):
+                if is_main(u) and not is_main(v):
                     coauthor_counts[v] += 1
-                elif is_main_author(v) and not is_main_author(u):
+                elif is_main(v) and not is_main(u):
                     coauthor_counts[u] += 1
                 
                 # Add edge to graph (weighted)
@@ -103,8 +83,18 @@ def build_network_data(publications):
     
     return G, dict(coauthor_counts)
 
-def calculate_stats(G, coauthor_counts):
-    """Calculate interesting network metrics for the dashboard."""
+def previous_partition(stats):
+    """{author: cluster id} from last run's network_stats.json, for the warm start."""
+    saved = (stats or {}).get("communities") or {}
+    partition = saved.get("partition") or {}
+    return {name: cid for name, cid in partition.items() if isinstance(cid, int)}
+
+def calculate_stats(G, coauthor_counts, previous=None):
+    """Calculate interesting network metrics for the dashboard.
+
+    `previous` is last run's {author: cluster id}; communities are
+    warm-started from it so cluster IDs stay put between runs.
+    """
     
     # 1. Basic Metrics
     density = nx.density(G)
@@ -118,31 +108,23 @@ def calculate_stats(G, coauthor_counts):
         lcc_pct = 0
 
     # 3. Community Detection (Sub-groups)
-    # Remove main author temporarily to find distinct sub-groups
-    G_sub = G.copy()
-    if MAIN_AUTHOR in G_sub:
-        G_sub.remove_node(MAIN_AUTHOR)
-    
+    # Leave the main author out (a view, not a copy) to find distinct sub-groups
+    G_sub = G.subgraph(node for node in G if node != MAIN_AUTHOR)
+    found = communities.detect(G_sub, previous)
+    members_by_id = defaultdict(list)
+    for member, cid in found["partition"].items():
+        members_by_id[cid].append(member)
+
     clusters = []
-    try:
-        # Using Greedy Modularity
-        communities = community.greedy_modularity_communities(G_sub)
-        for i, c in enumerate(communities):
-            if i >= 3: break # Take top 3 clusters
-            
-            # Identify top members in this cluster
-            members = list(c)
-            members.sort(key=lambda x: coauthor_counts.get(x, 0), reverse=True)
-            top_members = members[:3]
-            
-            clusters.append({
-                "id": i + 1,
-                "size": len(c),
-                "top_members": top_members
-            })
-    except Exception as e:
-        print(f"Community detection info: {e}")
-        clusters = []
+    ranked = sorted(members_by_id.items(), key=lambda item: (-len(item[1]), item[0]))
+    for cid, members in ranked[:3]: # Take top 3 clusters
+        # Identify top members in this cluster
+        members.sort(key=lambda x: (-coauthor_counts.get(x, 0), x))
+        clusters.append({
+            "id": cid,
+            "size": len(members),
+            "top_members": members[:3]
+        })
 
     return {
         "density": round(density, 3),
@@ -150,9 +132,36 @@ def calculate_stats(G, coauthor_counts):
         "lcc_percentage": round(lcc_pct * 100, 1),
         "total_nodes": len(G.nodes),
         "total_edges": len(G.edges),
-        "clusters": clusters
+        "clusters": clusters,
+        "communities": {
+            "method": "louvain",
+            "seed": communities.SEED,
+            "resolution": communities.RESOLUTION,
+            "modularity": round(found["modularity"], 4),
+            "warmStart": found["warmStart"],
+            "count": len(members_by_id),
+            "partition": dict(sorted(found["partition"].items())),
+        },
     }
 
+def export_graph(G, export_format=None):
+    """The co-author graph for the interactive view, in NETWORK_EXPORT format."""
+    export_format = (export_format or os.environ.get("NETWORK_EXPORT") or "compact").strip().lower()
+    if export_format not in GRAPH_EXPORT_FORMATS:
+        raise ValueError(f"NETWORK_EXPORT must be one of {', '.join(GRAPH_EXPORT_FORMATS)}, not {export_format!r}")
+    if export_format == "node-link":
+        return json_graph.node_link_data(G)
+    names = sorted(G.nodes(), key=lambda name: (not is_main(name), name))
+    order = {name: i for i, name in enumerate(names)}
+    links = []
+    for u, v, data in G.edges(data=True):
+        if order[u] > order[v]:
+            u, v = v, u
+        links.append((u, v, data.get('weight', 1)))
+    links.sort(key=lambda link: (order[link[0]], order[link[1]]))
+    positions = layout(names, links, center=MAIN_AUTHOR)
+    return compact_graph(names, links, positions, degree=[G.degree(name) for name in names])
+
 def create_radial_layout(G, center_node, coauthor_counts):
     pos = {}
     pos[center_node] = (0, 0)
@@ -176,66 +185,86 @@ def create_radial_layout(G, center_node, coauthor_counts):
     place_ring(occasional, 4.0, start_angle=0.1)
     return pos
 
-def draw_network_plot(G, coauthor_counts, dark_mode=False):
-    if dark_mode:
-        bg_color, text_color, primary_color = '#0d1117', '#e6edf3', '#58a6ff'
-        frequent_color, moderate_color, occasional_color = '#7ee787', '#d29922', '#8b949e'
-        glow_color = '#58a6ff'
-    else:
-        bg_color, text_color, primary_color = '#ffffff', '#1f2328', '#0969da'
-        frequent_color, moderate_color, occasional_color = '#1a7f37', '#9a6700', '#656d76'
-        glow_color = '#0969da'
+PALETTES = {
+    'light': {
+        'bg_color': '#ffffff', 'text_color': '#1f2328', 'primary_color': '#0969da',
+        'frequent_color': '#1a7f37', 'moderate_color': '#9a6700', 'occasional_color': '#656d76',
+        'glow_color': '#0969da',
+    },
+    'dark': {
+        'bg_color': '#0d1117', 'text_color': '#e6edf3', 'primary_color': '#58a6ff',
+        'frequent_color': '#7ee787', 'moderate_color': '#d29922', 'occasional_color': '#8b949e',
+        'glow_color': '#58a6ff',
+    },
+}
 
-    fig, ax = plt.subplots(figsize=(14, 12), facecolor=bg_color)
-    ax.set_facecolor(bg_color)
-    
+def plot_layout(coauthor_counts):
+    """Theme-independent part of the plot: the star graph and its radial layout."""
     # We use a simplified star-graph for visualization layout
     VisG = nx.Graph()
     VisG.add_node(MAIN_AUTHOR)
     for author, count in coauthor_counts.items():
         VisG.add_node(author)
         VisG.add_edge(MAIN_AUTHOR, author, weight=count)
-        
+
     pos = create_radial_layout(VisG, MAIN_AUTHOR, coauthor_counts)
+    return {'graph': VisG, 'pos': pos, 'coauthor_counts': coauthor_counts}
+
+def draw_network_plot(layout, palette):
+    bg_color, text_color, primary_color = palette['bg_color'], palette['text_color'], palette['primary_color']
+    frequent_color, moderate_color, occasional_color = (
+        palette['frequent_color'], palette['moderate_color'], palette['occasional_color'])
+    glow_color = palette['glow_color']
+    VisG, pos, coauthor_counts = layout['graph'], layout['pos'], layout['coauthor_counts']
+
+    fig, ax = plt.subplots(figsize=(14, 12), facecolor=bg_color)
+    ax.set_facecolor(bg_color)
     
-    # Draw Edges
-    for u, v, data in VisG.edges(data=True):
-        weight = data['weight']
-        alpha = min(0.2 + weight * 0.1, 0.7)
-        width = 0.5 + weight * 0.8
-        if u in pos and v in pos:
-            x = [pos[u][0], pos[v][0]]
-            y = [pos[u][1], pos[v][1]]
-            ax.plot(x, y, color=primary_color, alpha=alpha, linewidth=width, solid_capstyle='round', zorder=1)
-    
-    # Draw Nodes
+    # Draw Edges (one collection; width and opacity grow with co-authored papers)
+    edges = [(u, v, data['weight']) for u, v, data in VisG.edges(data=True) if u in pos and v in pos]
+    if edges:
+        weights = np.array([weight for _, _, weight in edges], dtype=float)
+        edge_colors = np.tile(mcolors.to_rgba(primary_color), (len(edges), 1))
+        edge_colors[:, 3] = np.minimum(0.2 + weights * 0.1, 0.7)
+        ax.add_collection(LineCollection(
+            [(pos[u], pos[v]) for u, v, _ in edges],
+            colors=edge_colors, linewidths=0.5 + weights * 0.8, capstyle='round', zorder=1,
+        ))
+
+    # Draw Nodes (one scatter for every node, main author first)
+    outline = [patheffects.withStroke(linewidth=2.5, foreground='black')]
+    xs, ys, sizes, face_colors, rim_colors, rim_widths = [], [], [], [], [], []
     for node in VisG.nodes():
         if node not in pos: continue
         x, y = pos[node]
-        
+
         if node == MAIN_AUTHOR:
-            size = 5000
-            for gs, ga in [(7000, 0.1), (6000, 0.15), (5500, 0.2)]:
-                ax.scatter([x], [y], s=gs, c=glow_color, alpha=ga, zorder=2)
-            ax.scatter([x], [y], s=size, c=primary_color, edgecolors='white', linewidths=3, zorder=3)
-            ax.annotate('Benjamin\nAmpel', (x, y), fontsize=13, fontweight='bold', color='white', ha='center', va='center', zorder=5)
+            size, color, alpha, width = 5000, primary_color, 1.0, 3
+            glow = [mcolors.to_rgba(glow_color, ga) for ga in (0.1, 0.15, 0.2)]
+            ax.scatter([x] * 3, [y] * 3, s=[7000, 6000, 5500], c=glow, zorder=2)
+            ax.text(x, y, 'Benjamin\nAmpel', fontsize=13, fontweight='bold', color='white', ha='center', va='center', zorder=5)
         else:
             count = coauthor_counts.get(node, 0)
-            if count >= 5: c, s, fs = frequent_color, 2500 + count * 150, 9
-            elif count >= 2: c, s, fs = moderate_color, 1800 + count * 100, 8
-            else: c, s, fs = occasional_color, 1400, 7
-            
-            ax.scatter([x], [y], s=s, c=c, edgecolors='white', linewidths=2, alpha=0.9, zorder=3)
+            if count >= 5: color, size, fs = frequent_color, 2500 + count * 150, 9
+            elif count >= 2: color, size, fs = moderate_color, 1800 + count * 100, 8
+            else: color, size, fs = occasional_color, 1400, 7
+            alpha, width = 0.9, 2
+
             display_name = node.replace(' ', '\n', 1) if ' ' in node else node
-            
-            # Text Shadow
-            for dx, dy in [(-1,-1), (-1,1), (1,-1), (1,1)]:
-                 ax.annotate(display_name, (x+dx*0.015, y+dy*0.015), fontsize=fs, color='black', ha='center', va='center', fontweight='bold', zorder=4)
-            ax.annotate(display_name, (x, y), fontsize=fs, color='white', ha='center', va='center', fontweight='bold', zorder=5)
-            
+            ax.text(x, y, display_name, fontsize=fs, color='white', ha='center', va='center', fontweight='bold',
+                    zorder=5, path_effects=outline)
+
+        xs.append(x); ys.append(y); sizes.append(size)
+        face_colors.append(mcolors.to_rgba(color, alpha))
+        rim_colors.append(mcolors.to_rgba('white', alpha))
+        rim_widths.append(width)
+
+    ax.scatter(xs, ys, s=sizes, c=face_colors, edgecolors=rim_colors, linewidths=rim_widths, zorder=3)
+
     ax.set_xlim(-5.5, 5.5); ax.set_ylim(-5.7, 5.7); ax.axis('off')
     return fig
 
+@instrument.stage()
 def main():
     OUTPUT_IMG_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -250,27 +279,28 @@ def main():
 
     # 2. Calculate & Save Stats (JSON) - Used for "Collaboration DNA"
     print("Calculating network statistics...")
-    stats = calculate_stats(G, coauthor_counts)
+    stats = calculate_stats(G, coauthor_counts, previous_partition(artifacts.read_json(OUTPUT_DATA_FILE, {})))
     with open(OUTPUT_DATA_FILE, 'w') as f:
         json.dump(stats, f, indent=2)
     print(f"  Saved stats to: {OUTPUT_DATA_FILE}")
 
     # 3. [FIX] Save Graph Topology (JSON) - Used for the Interactive D3 Graph
-    graph_data = json_graph.node_link_data(G)
-    graph_output = PROJECT_ROOT / "static" / "data" / "network.json"
-    with open(graph_output, 'w') as f:
-        json.dump(graph_data, f)
-    print(f"  Saved D3 graph structure to: {graph_output}")
+    with open(OUTPUT_GRAPH_FILE, 'w') as f:
+        json.dump(export_graph(G), f, separators=(',', ':'))
+    print(f"  Saved D3 graph structure to: {OUTPUT_GRAPH_FILE}")
 
     # 4. Generate Images (Light/Dark) - Used for static fallback
     print("Generating static images...")
-    fig_light = draw_network_plot(G, coauthor_counts, dark_mode=False)
-    fig_light.savefig(OUTPUT_IMG_DIR / 'coauthor-network.png', dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close(fig_light)
-    
-    fig_dark = draw_network_plot(G, coauthor_counts, dark_mode=True)
-    fig_dark.savefig(OUTPUT_IMG_DIR / 'coauthor-network-dark.png', dpi=150, bbox_inches='tight', facecolor='#0d1117')
-    plt.close(fig_dark)
+    render.render_themes(
+        draw_network_plot,
+        plot_layout(coauthor_counts),
+        PALETTES,
+        {
+            'light': OUTPUT_IMG_DIR / 'coauthor-network.png',
+            'dark': OUTPUT_IMG_DIR / 'coauthor-network-dark.png',
+        },
+        savefig={'dpi': 150, 'bbox_inches': 'tight'},
+    )
     
     print("Done!")
 
@@ -6,11 +6,12 @@ ensure canonical URLs, and append the publication_extras shortcode.
 
 from __future__ import annotations
 
-import json
 import re
 from datetime import datetime
 from pathlib import Path
 
+from lib import artifacts, front_matter, instrument
+
 ROOT = Path(__file__).resolve().parent.parent
 DATA_FILE = ROOT / "static" / "data" / "publications.json"
 CONTENT_ROOT = ROOT / "content"
@@ -131,13 +132,6 @@ def extract_front_matter(text: str) -> tuple[str, str, str]:
     return "---", front.strip(), rest.lstrip("\n")
 
 
-def parse_title(front: str) -> str:
-    for line in front.splitlines():
-        if line.strip().startswith("title:"):
-            return line.split(":", 1)[1].strip().strip('"').strip("'")
-    return ""
-
-
 def set_url_in_front_matter(path: Path, url: str) -> bool:
     text = path.read_text(encoding="utf-8")
     marker, front, rest = extract_front_matter(text)
@@ -179,23 +173,15 @@ def set_url_in_front_matter(path: Path, url: str) -> bool:
 
 
 def build_existing_title_map():
-    title_map = {}
-    for section in SECTION_MAP.values():
-        for path in (CONTENT_ROOT / section).rglob("index.md"):
-            text = path.read_text(encoding="utf-8")
-            _, front, _ = extract_front_matter(text)
-            title = parse_title(front)
-            if title:
-                key = title.lower().strip()
-                title_map.setdefault(key, []).append(path)
-    return title_map
+    return front_matter.get_index().title_map()
 
 
+@instrument.stage()
 def main():
     if not DATA_FILE.exists():
         raise SystemExit(f"Missing {DATA_FILE}")
 
-    data = json.loads(DATA_FILE.read_text(encoding="utf-8"))
+    data = artifacts.read_json(DATA_FILE)
     if isinstance(data, dict):
         data = data.get("individualPublications", [])
 
@@ -1,5 +1,4 @@
 #!/usr/bin/env python3
-import json
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +19,9 @@ from reportlab.platypus import (
     HRFlowable,
 )
 
+from lib import artifacts, front_matter, instrument
+from lib.authors import is_main, resolve
+
 
 ROOT = Path(__file__).resolve().parents[1]
 OUTPUT_DIR = ROOT / "output" / "pdf"
@@ -27,13 +29,7 @@ STATIC_DIR = ROOT / "static" / "uploads"
 
 
 def load_yaml_front_matter(path):
-    text = path.read_text(errors="ignore")
-    if not text.startswith("---"):
-        return {}
-    parts = text.split("---", 2)
-    if len(parts) < 3:
-        return {}
-    return yaml.safe_load(parts[1]) or {}
+    return front_matter.load(path)
 
 
 def load_yaml_file(path):
@@ -43,9 +39,7 @@ def load_yaml_file(path):
 
 
 def load_json(path, default):
-    if not path.exists():
-        return default
-    return json.loads(path.read_text())
+    return artifacts.read_json(path, default)
 
 
 def build_metrics(publications, scholar):
@@ -281,8 +275,8 @@ def build_pdf():
     coauthors = set()
     for pub in publications:
         for author in pub.get("authors") or []:
-            if "ampel" not in author.lower():
-                coauthors.add(author)
+            if not is_main(author):
+                coauthors.add(resolve(author))
     institutions = {inst.get("name") for inst in collab_meta.get("institutions", []) if inst.get("name")}
     countries = {inst.get("country") for inst in collab_meta.get("institutions", []) if inst.get("country")}
 
@@ -364,5 +358,10 @@ def build_pdf():
     return output_path, static_path
 
 
-if __name__ == "__main__":
+@instrument.stage()
+def main():
     build_pdf()
+
+
+if __name__ == "__main__":
+    main()
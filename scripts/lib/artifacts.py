@@ -0,0 +1,75 @@
+"""
+Read and write the JSON data files that scripts hand to each other.
+
+Run standalone, every read goes to disk exactly as before. When the pipeline
+runner calls enable(), a file written by one task is handed to the next task
+as the already-parsed object, and files read by several tasks are parsed once.
+Cached entries are checked against the file's size and mtime, so a file that
+something else rewrote is re-read. Cached objects are shared between readers:
+treat them as read-only and copy before mutating.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+
+_lock = threading.Lock()
+_cache: dict = {}
+_enabled = False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    with _lock:
+        _cache.clear()
+
+
+def _stamp(path: Path):
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_json(path, default=None):
+    path = Path(path).resolve()
+    if not path.exists():
+        return default
+    if _enabled:
+        stamp = _stamp(path)
+        with _lock:
+            cached = _cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if _enabled:
+        with _lock:
+            _cache[path] = (stamp, data)
+    return data
+
+
+def write_json(path, data, newline=False, **dump_kwargs):
+    """Write `data` atomically: readers see the old file or the new one, never
+    a partial write (fetchers finish at different times under the pipeline)."""
+    path = Path(path).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with partial.open("w", encoding="utf-8") as handle:
+            json.dump(data, handle, **dump_kwargs)
+            if newline:
+                handle.write("\n")
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    if _enabled:
+        with _lock:
+            _cache[path] = (_stamp(path), data)
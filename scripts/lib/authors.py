@@ -0,0 +1,183 @@
+"""
+Author identity resolution against the registry in data/authors.yaml.
+
+resolve() maps any spelling of a registered person to their canonical name
+and returns other names cleaned but otherwise unchanged. The resolver is
+built once: every canonical name and alias is indexed under a normalized
+key (lowercase, no periods, single spaces) and under the same key without
+middle initials or suffixes, and people are blocked by (first initial, last
+name) for Google Scholar abbreviations such as "S Samtani". Lookups are
+memoized per input string.
+
+    from lib.authors import is_main, resolve
+
+    resolve("BM Ampel")              # 'Benjamin Ampel'
+    resolve("Matthew J. Hashim")     # 'Matthew Hashim'
+    is_main("admin")                 # True
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+AUTHORS_FILE = PROJECT_ROOT / "data" / "authors.yaml"
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv"}
+
+# Initials then a last name ("S Samtani", "BM Ampel", "JF Nunamaker Jr").
+_ABBREVIATED_RE = re.compile(r"^([A-Z]{1,4})\s+([A-Z][\w'\-]+)(?:\s+(?:Jr|Sr|II|III|IV)\.?)?$")
+
+
+def clean(name) -> str:
+    """Collapse whitespace and turn "Last, First" into "First Last"."""
+    text = re.sub(r"\s+", " ", str(name or "")).strip()
+    if "," in text:
+        parts = [part.strip() for part in text.split(",") if part.strip()]
+        if len(parts) >= 2:
+            text = f"{parts[1]} {parts[0]}"
+    return text
+
+
+def name_key(name: str) -> str:
+    return re.sub(r"\s+", " ", clean(name).replace(".", " ").lower()).strip()
+
+
+def short_key(key: str) -> str:
+    """`key` without middle initials or suffixes ("jay f nunamaker jr" -> "jay nunamaker")."""
+    tokens = [token for token in key.split() if token not in SUFFIXES]
+    if len(tokens) > 2:
+        tokens = [tokens[0], *(token for token in tokens[1:-1] if len(token) > 1), tokens[-1]]
+    return " ".join(tokens)
+
+
+def abbreviation(name: str):
+    """(first initial, last name) for a Scholar-style abbreviated name, else None."""
+    match = _ABBREVIATED_RE.match(clean(name).replace(".", ""))
+    if not match:
+        return None
+    return match.group(1)[0].lower(), match.group(2).lower()
+
+
+def block_key(name: str):
+    """(first initial, last name) of a full name, for the blocking index."""
+    tokens = short_key(name_key(name)).split()
+    if len(tokens) < 2:
+        return None
+    return tokens[0][0], tokens[-1]
+
+
+class AuthorResolver:
+    def __init__(self, people):
+        self.people = {}
+        self.main = None
+        self._keys = {}
+        self._short_keys = {}
+        self._blocks = {}
+        self._fullest = {}
+        self._memo = {}
+        for person in people or []:
+            if isinstance(person, dict) and person.get("name"):
+                self.register(person["name"], person)
+
+    @classmethod
+    def load(cls, path: Path = AUTHORS_FILE):
+        try:
+            people = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or []
+        except (OSError, yaml.YAMLError):
+            people = []
+        return cls(people)
+
+    def register(self, name: str, person: dict = None) -> str:
+        """Add a person (by default one known only by `name`) unless `name`
+        already resolves to someone. Returns the canonical name."""
+        if person is None:
+            existing = self._lookup(name)
+            if existing is not None:
+                spelling = clean(name)
+                if len(spelling) > len(self._fullest.get(existing, existing)):
+                    self._fullest[existing] = spelling
+                return existing
+            person = {"name": clean(name)}
+        canonical = clean(person["name"])
+        self.people[canonical] = dict(person, name=canonical)
+        if person.get("main"):
+            self.main = canonical
+        for spelling in [canonical, *(person.get("aliases") or [])]:
+            key = name_key(spelling)
+            self._keys.setdefault(key, canonical)
+            self._short_keys.setdefault(short_key(key), canonical)
+        block = block_key(canonical)
+        if block:
+            people = self._blocks.setdefault(block, [])
+            if canonical not in people:
+                people.append(canonical)
+        self._memo.clear()
+        return canonical
+
+    def _lookup(self, name: str):
+        key = name_key(name)
+        found = self._keys.get(key) or self._short_keys.get(short_key(key))
+        if found is None:
+            block = abbreviation(name)
+            candidates = self._blocks.get(block, []) if block else []
+            if len(candidates) == 1:
+                found = candidates[0]
+        return found
+
+    def candidates(self, name: str) -> list:
+        """Registered people an abbreviated name could stand for."""
+        block = abbreviation(name)
+        return list(self._blocks.get(block, [])) if block else []
+
+    def resolve(self, name) -> str:
+        """Canonical name for a registered person, else the cleaned input."""
+        if not isinstance(name, str):
+            return ""
+        found = self._memo.get(name)
+        if found is None:
+            found = self._memo[name] = self._lookup(name) or clean(name)
+        return found
+
+    def person(self, name) -> dict | None:
+        return self.people.get(self.resolve(name))
+
+    def display(self, name) -> str:
+        """`display` from the registry, else the fullest spelling registered
+        for the person ("Matthew J. Hashim" over "Matthew Hashim")."""
+        person = self.person(name)
+        if not person:
+            return clean(name)
+        return person.get("display") or self._fullest.get(person["name"], person["name"])
+
+    def is_main(self, name) -> bool:
+        return self.main is not None and self.resolve(name) == self.main
+
+
+_default = None
+
+
+def get_resolver() -> AuthorResolver:
+    global _default
+    if _default is None:
+        _default = AuthorResolver.load()
+    return _default
+
+
+def resolve(name) -> str:
+    return get_resolver().resolve(name)
+
+
+def display(name) -> str:
+    return get_resolver().display(name)
+
+
+def is_main(name) -> bool:
+    return get_resolver().is_main(name)
+
+
+def main_author() -> str:
+    return get_resolver().main
@@ -0,0 +1,113 @@
+"""
+Content-hash build manifest for pipeline stages.
+
+A stage's key is a digest of every input file (directories are walked), the
+code that builds it (the script plus scripts/lib) and any extra settings.
+The manifest remembers the key each stage was last built with and digests of
+the outputs it wrote; a stage is fresh when its key is unchanged and every
+recorded output is still on disk with the same contents.
+
+Manifest: .build-cache/manifest.json
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+SCRIPT_DIR = PROJECT_ROOT / "scripts"
+CACHE_DIR = PROJECT_ROOT / ".build-cache"
+MANIFEST_FILE = CACHE_DIR / "manifest.json"
+MANIFEST_VERSION = 1
+
+_CHUNK = 1 << 20
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    def __init__(self, root: Path = PROJECT_ROOT, manifest_file: Path = MANIFEST_FILE):
+        self.root = Path(root)
+        self.manifest_file = Path(manifest_file)
+        self.stages = {}
+        self._memo = {}
+        if self.manifest_file.exists():
+            try:
+                data = json.loads(self.manifest_file.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                data = {}
+            if data.get("version") == MANIFEST_VERSION:
+                self.stages = data.get("stages", {})
+
+    # -- digests ------------------------------------------------------------
+
+    def digest(self, rel_path, pattern="*") -> str:
+        """Digest of a file, of every file under a directory, or 'missing'.
+
+        Directories are walked for ``pattern``, skipping ``__pycache__``, in
+        order of relative path so the digest does not depend on walk order.
+        """
+        path = self.root / rel_path
+        if path.is_dir():
+            digest = hashlib.sha256()
+            children = sorted(
+                (p for p in path.rglob(pattern) if p.is_file() and "__pycache__" not in p.parts),
+                key=lambda p: p.relative_to(path).as_posix(),
+            )
+            for child in children:
+                digest.update(child.relative_to(path).as_posix().encode())
+                digest.update(self.digest(child.relative_to(self.root)).encode())
+            return digest.hexdigest()
+        if not path.is_file():
+            return "missing"
+        stat = path.stat()
+        memo_key = (str(path), stat.st_mtime_ns, stat.st_size)
+        if memo_key not in self._memo:
+            self._memo[memo_key] = _hash_file(path)
+        return self._memo[memo_key]
+
+    def stage_key(self, name, inputs, settings=None) -> str:
+        digest = hashlib.sha256()
+        # Code is hashed from sources only: bytecode caches carry source
+        # mtimes and would change the key on every fresh checkout.
+        code = [
+            (str((SCRIPT_DIR / f"{name}.py").relative_to(self.root)), "*"),
+            (str((SCRIPT_DIR / "lib").relative_to(self.root)), "*.py"),
+        ]
+        for rel_path, pattern in [*code, *((rel_path, "*") for rel_path in sorted(inputs))]:
+            digest.update(f"{rel_path}={self.digest(rel_path, pattern)}\n".encode())
+        digest.update(json.dumps(settings or {}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    # -- manifest -----------------------------------------------------------
+
+    def is_fresh(self, name, key, outputs) -> bool:
+        entry = self.stages.get(name)
+        if not entry or entry.get("key") != key:
+            return False
+        recorded = entry.get("outputs", {})
+        return all(recorded.get(rel_path) == self.digest(rel_path) for rel_path in outputs)
+
+    def record(self, name, key, outputs):
+        self.stages[name] = {
+            "key": key,
+            "outputs": {rel_path: self.digest(rel_path) for rel_path in outputs},
+            "built": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+
+    def forget(self, name):
+        self.stages.pop(name, None)
+
+    def save(self):
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"version": MANIFEST_VERSION, "stages": self.stages}
+        self.manifest_file.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
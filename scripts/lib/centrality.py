@@ -0,0 +1,291 @@
+"""
+Betweenness, average shortest path and clustering for the paper graph, exact
+or estimated from sampled pivots.
+
+Both betweenness (Brandes) and the average shortest path length need one
+breadth-first search per source node. `measure` runs those searches once for
+both metrics, a batch of sources at a time: each BFS level is one sparse
+product of the adjacency matrix with a (V x batch) block of path counts, so
+the per-node work happens in scipy rather than in Python. For large graphs
+the batches are spread over a process pool.
+
+Above EXACT_WORK_LIMIT (V * nonzeros) the "auto" mode samples pivots instead:
+sources drawn uniformly without replacement, each node's betweenness scaled
+by V/k (Brandes & Pich 2007). Pivots are added in rounds until the bridge
+scores of the TOP_K highest-ranked papers (the ones the dashboard lists) are
+each within EPSILON of their estimate, relative, at the stated confidence, or
+until MAX_PIVOTS is reached. The interval is a normal approximation from
+the per-pivot sample variance with the finite-population correction, and it
+is Bonferroni-adjusted over the TOP_K papers. It shrinks to zero as k
+approaches V. The result records the relative error actually reached, which
+may be above EPSILON when the cap stopped sampling.
+
+The average clustering coefficient is estimated from
+ln(2 / delta) / (2 CLUSTERING_EPSILON^2) sampled wedges (Schank & Wagner
+2005). By Hoeffding's inequality that is within CLUSTERING_EPSILON of the
+exact value with probability 1 - delta. The average path length is the mean
+over the pivots in the largest component and carries no stated bound.
+
+    from lib.centrality import measure
+
+    result = measure(graph)                 # mode from CENTRALITY_MODE, default auto
+    result["between"], result["avgPath"], result["clustering"], result["estimation"]
+
+Environment:
+    CENTRALITY_MODE        exact | approximate | auto (default)
+    CENTRALITY_WORKERS     process-pool size (default: CPU count)
+    CENTRALITY_EPSILON     relative error target for the top papers (default 0.05)
+    CENTRALITY_DELTA       1 - confidence (default 0.05)
+    CENTRALITY_MAX_PIVOTS  cap on sampled pivots (default 1000)
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+from statistics import NormalDist
+
+import networkx as nx
+import numpy as np
+
+MODES = ("exact", "approximate", "auto")
+EXACT_WORK_LIMIT = 2_000_000_000  # V * nonzeros above which "auto" samples pivots
+PARALLEL_WORK_LIMIT = 200_000_000  # sources * nonzeros above which searches use a process pool
+BATCH = 64  # sources searched together in one block
+TOP_K = 8
+EPSILON = 0.05
+DELTA = 0.05
+MAX_PIVOTS = 1000
+MIN_PIVOTS = 256  # first round, before the interval is trusted
+CLUSTERING_EPSILON = 0.01
+SEED = 0
+
+_adjacency = None  # the graph in a pool worker, set by _init_worker
+
+
+def configured_mode() -> str:
+    mode = (os.environ.get("CENTRALITY_MODE") or "auto").strip().lower()
+    if mode not in MODES:
+        raise ValueError(f"CENTRALITY_MODE must be one of {', '.join(MODES)}, not {mode!r}")
+    return mode
+
+
+def configured_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("CENTRALITY_WORKERS") or os.cpu_count() or 1))
+    except ValueError:
+        return 1
+
+
+def _configured_number(name, default, cast=float):
+    raw = os.environ.get(name)
+    if not raw:
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, not {raw!r}") from None
+    if value <= 0:
+        raise ValueError(f"{name} must be positive, not {raw!r}")
+    return value
+
+
+def configured_bounds():
+    """(epsilon, delta, max_pivots) from the environment, or the defaults."""
+    delta = _configured_number("CENTRALITY_DELTA", DELTA)
+    if delta >= 1:
+        raise ValueError(f"CENTRALITY_DELTA must be below 1, not {delta}")
+    return (
+        _configured_number("CENTRALITY_EPSILON", EPSILON),
+        delta,
+        _configured_number("CENTRALITY_MAX_PIVOTS", MAX_PIVOTS, int),
+    )
+
+
+def _search(adjacency, sources, lengths_from):
+    """Brandes accumulation and distance sums from each source.
+
+    `adjacency` is a symmetric CSR matrix of ones and `lengths_from` a boolean
+    mask of the nodes whose distance sums count towards the average path.
+    Returns (per-node sum of dependencies over the sources, per-node sum of
+    their squares, sum of shortest-path lengths from the counted sources,
+    number of those sources).
+    """
+    nodes = adjacency.shape[0]
+    totals = np.zeros(nodes)
+    squares = np.zeros(nodes)
+    length_total = 0
+    length_sources = 0
+    for start in range(0, len(sources), BATCH):
+        batch = np.asarray(sources[start:start + BATCH])
+        columns = np.arange(len(batch))
+        level = np.full((nodes, len(batch)), -1, dtype=np.int32)
+        level[batch, columns] = 0
+        sigma = np.zeros((nodes, len(batch)))
+        sigma[batch, columns] = 1.0
+        frontier = sigma.copy()
+        depth = 0
+        while True:
+            # Paths into each undiscovered node all come from the frontier.
+            reach = adjacency @ frontier
+            found = (level < 0) & (reach > 0)
+            if not found.any():
+                break
+            depth += 1
+            level[found] = depth
+            frontier = np.where(found, reach, 0.0)
+            sigma += frontier
+
+        dependency = np.zeros((nodes, len(batch)))
+        for d in range(depth, 0, -1):
+            at = level == d
+            coeff = np.where(at, (1.0 + dependency) / np.where(at, sigma, 1.0), 0.0)
+            dependency += np.where(level == d - 1, sigma * (adjacency @ coeff), 0.0)
+        dependency[batch, columns] = 0.0
+        totals += dependency.sum(axis=1)
+        squares += np.square(dependency).sum(axis=1)
+
+        counted = lengths_from[batch]
+        if counted.any():
+            reached = level[:, counted]
+            length_total += int(reached[reached > 0].sum())
+            length_sources += int(counted.sum())
+    return totals, squares, length_total, length_sources
+
+
+def _init_worker(adjacency):
+    global _adjacency
+    _adjacency = adjacency
+
+
+def _search_chunk(args):
+    return _search(_adjacency, *args)
+
+
+def _run_searches(adjacency, sources, largest, pool, workers):
+    if pool is None or len(sources) <= BATCH:
+        return _search(adjacency, sources, largest)
+    size = max(BATCH, math.ceil(len(sources) / (workers * 4)))
+    chunks = [(sources[i:i + size], largest) for i in range(0, len(sources), size)]
+    parts = pool.map(_search_chunk, chunks)
+    return (
+        sum(part[0] for part in parts),
+        sum(part[1] for part in parts),
+        sum(part[2] for part in parts),
+        sum(part[3] for part in parts),
+    )
+
+
+def _average_clustering(adjacency):
+    """Exact average clustering: triangles through each node from A^2 * A."""
+    nodes = adjacency.shape[0]
+    if not nodes:
+        return 0.0
+    triangles = np.asarray((adjacency @ adjacency).multiply(adjacency).sum(axis=1)).ravel() / 2
+    degrees = np.asarray(adjacency.sum(axis=1)).ravel()
+    pairs = degrees * (degrees - 1) / 2
+    local = np.divide(triangles, pairs, out=np.zeros(nodes), where=pairs > 0)
+    return float(local.mean())
+
+
+def _relative_error(totals, squares, nodes, pivots, delta, top_k):
+    """Largest relative half-width, at confidence 1 - delta, among the top_k
+    estimates (inf while any of them is still zero)."""
+    if pivots >= nodes:
+        return 0.0
+    top = np.argsort(totals)[::-1][:top_k]
+    mean = totals[top] / pivots
+    if not mean.all():
+        return math.inf
+    variance = np.maximum(squares[top] / pivots - mean ** 2, 0.0) * pivots / max(pivots - 1, 1)
+    spread = np.sqrt(variance / pivots * (1 - pivots / nodes))
+    z = NormalDist().inv_cdf(1 - delta / (2 * len(top)))
+    return float(np.max(z * spread / mean))
+
+
+def measure(graph, mode: str = None, workers: int = None, epsilon: float = None,
+            delta: float = None, max_pivots: int = None, seed: int = SEED, adjacency=None):
+    """Unnormalized betweenness, average shortest path (largest component) and
+    average clustering for an undirected graph with nodes 0..V-1.
+
+    Returns {"between": [per node], "avgPath", "clustering", "estimation"},
+    where "estimation" records the mode used and, when sampled, the pivots and
+    the error bounds reached. `adjacency`, when given, is the graph's
+    symmetric CSR matrix and saves converting it here.
+    """
+    mode = mode or configured_mode()
+    workers = workers or configured_workers()
+    env_epsilon, env_delta, env_max_pivots = configured_bounds()
+    epsilon = epsilon or env_epsilon
+    delta = delta or env_delta
+    max_pivots = max_pivots or env_max_pivots
+
+    nodes = graph.number_of_nodes()
+    edges = graph.number_of_edges()
+    if adjacency is None:
+        adjacency = nx.to_scipy_sparse_array(graph, nodelist=range(nodes), weight=None, format="csr")
+    adjacency = adjacency.tocsr().astype(float)
+    adjacency.data[:] = 1.0
+    if mode == "auto":
+        mode = "exact" if nodes * adjacency.nnz <= EXACT_WORK_LIMIT else "approximate"
+
+    largest = np.zeros(nodes, dtype=bool)
+    if nodes:
+        largest[list(max(nx.connected_components(graph), key=len))] = True
+    order = np.random.default_rng(seed).permutation(nodes)
+    target = nodes if mode == "exact" else min(nodes, max_pivots)
+
+    pool = None
+    if workers > 1 and target * adjacency.nnz > PARALLEL_WORK_LIMIT:
+        # "spawn", not "fork": the pipeline parent is multi-threaded (see lib/render.py).
+        context = multiprocessing.get_context("spawn")
+        pool = context.Pool(workers, initializer=_init_worker, initargs=(adjacency,))
+    try:
+        totals = np.zeros(nodes)
+        squares = np.zeros(nodes)
+        length_total = length_sources = 0
+        pivots = 0
+        error = math.inf
+        step = target if mode == "exact" else min(target, max(MIN_PIVOTS, BATCH * workers))
+        while pivots < target:
+            sources = np.sort(order[pivots:min(target, pivots + step)])
+            part = _run_searches(adjacency, sources, largest, pool, workers)
+            totals += part[0]
+            squares += part[1]
+            length_total += part[2]
+            length_sources += part[3]
+            pivots += len(sources)
+            if mode == "approximate":
+                error = _relative_error(totals, squares, nodes, pivots, delta, TOP_K)
+                if error <= epsilon:
+                    break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    # Undirected: every path is counted from both ends.
+    scale = 0.5 * nodes / pivots if pivots else 0.5
+    between = (totals * scale).tolist()
+
+    if largest.sum() > 1 and length_sources:
+        avg_path = length_total / (length_sources * (int(largest.sum()) - 1))
+    else:
+        avg_path = 0
+
+    estimation = {"mode": mode, "nodes": nodes, "edges": edges}
+    if mode == "exact":
+        clustering = _average_clustering(adjacency)
+    else:
+        trials = math.ceil(math.log(2 / delta) / (2 * CLUSTERING_EPSILON ** 2))
+        clustering = nx.approximation.average_clustering(graph, trials=trials, seed=seed)
+        estimation.update({
+            "pivots": pivots,
+            "topK": TOP_K,
+            "betweenError": round(error, 4) if math.isfinite(error) else None,
+            "clusteringTrials": trials,
+            "clusteringError": CLUSTERING_EPSILON,
+            "confidence": round(1 - delta, 4),
+        })
+    return {"between": between, "avgPath": avg_path, "clustering": clustering, "estimation": estimation}
@@ -0,0 +1,131 @@
+"""
+Seeded Louvain communities, warm-started from the previous run's partition,
+with cluster IDs that stay stable between runs.
+
+`detect` runs networkx's Louvain with a fixed seed. When the last partition
+is given (network_stats.json keeps it), it also runs Louvain's local-moving
+phase starting from that partition: known nodes begin in their old
+community, new nodes as singletons, and nodes move while that raises
+modularity. The warm result is kept unless the fresh one beats its
+modularity by more than WARM_START_SLACK, so one new paper does not
+reshuffle the clusters. As in Leiden, communities that end up disconnected
+are split into their connected components. Finally, each community takes the
+ID of the previous community it overlaps most, and new communities get new
+IDs (by size on the first run).
+
+    from lib.communities import detect
+
+    result = detect(graph, previous={"Sagar Samtani": 1, ...})
+    result["partition"]     # {node: id}
+    result["modularity"], result["warmStart"]
+"""
+
+from __future__ import annotations
+
+import random
+
+import networkx as nx
+
+SEED = 0
+RESOLUTION = 1.0
+WARM_START_SLACK = 0.02  # modularity the warm start may give up for stability
+MAX_SWEEPS = 50
+
+
+def _connected_parts(graph, parts):
+    """`parts` with every disconnected community split into its components."""
+    split = []
+    for part in parts:
+        split.extend(set(component) for component in nx.connected_components(graph.subgraph(part)))
+    return split
+
+
+def _local_moving(graph, initial, weight, resolution, seed):
+    """Louvain's first phase from `initial` ({node: label}); other nodes start alone."""
+    degree = dict(graph.degree(weight=weight))
+    m2 = sum(degree.values())  # 2m
+    if not m2:
+        return [{node} for node in graph]
+    label = {node: initial[node] if node in initial else ("new", node) for node in graph}
+    total = {}
+    for node, community in label.items():
+        total[community] = total.get(community, 0) + degree[node]
+
+    order = sorted(graph, key=str)
+    rng = random.Random(seed)
+    for _ in range(MAX_SWEEPS):
+        rng.shuffle(order)
+        moved = False
+        for node in order:
+            k = degree[node]
+            links = {}
+            for neighbor, data in graph.adj[node].items():
+                if neighbor != node:
+                    links[label[neighbor]] = links.get(label[neighbor], 0) + data.get(weight, 1)
+            current = label[node]
+            total[current] -= k
+            best, best_gain = current, links.get(current, 0) - resolution * total[current] * k / m2
+            for community, link in links.items():
+                gain = link - resolution * total[community] * k / m2
+                if gain > best_gain:
+                    best, best_gain = community, gain
+            total[best] += k
+            if best != current:
+                label[node] = best
+                moved = True
+        if not moved:
+            break
+
+    parts = {}
+    for node, community in label.items():
+        parts.setdefault(community, set()).add(node)
+    return list(parts.values())
+
+
+def stable_ids(parts, previous=None) -> dict:
+    """{node: id}, giving each part the previous ID it overlaps most."""
+    previous = previous or {}
+    ranked = sorted(parts, key=lambda part: (-len(part), sorted(map(str, part))))
+    overlaps = []
+    for index, part in enumerate(ranked):
+        counts = {}
+        for node in part:
+            if node in previous:
+                counts[previous[node]] = counts.get(previous[node], 0) + 1
+        overlaps.extend((-count, index, old) for old, count in counts.items())
+    assigned, taken = {}, set()
+    for _, index, old in sorted(overlaps, key=lambda item: (item[0], item[1], str(item[2]))):
+        if index not in assigned and old not in taken:
+            assigned[index] = old
+            taken.add(old)
+    next_id = max((value for value in previous.values() if isinstance(value, int)), default=0) + 1
+    partition = {}
+    for index, part in enumerate(ranked):
+        if index not in assigned:
+            while next_id in taken:
+                next_id += 1
+            assigned[index] = next_id
+            taken.add(next_id)
+        for node in part:
+            partition[node] = assigned[index]
+    return partition
+
+
+def detect(graph, previous=None, weight="weight", resolution=RESOLUTION, seed=SEED):
+    """Communities of an undirected graph (a subgraph view is fine).
+
+    Returns {"partition": {node: id}, "modularity", "warmStart"}.
+    """
+    if graph.number_of_nodes() == 0:
+        return {"partition": {}, "modularity": 0.0, "warmStart": False}
+    parts = _connected_parts(graph, nx.community.louvain_communities(
+        graph, weight=weight, resolution=resolution, seed=seed))
+    quality = nx.community.modularity(graph, parts, weight=weight, resolution=resolution)
+    warm = False
+    known = {node: previous[node] for node in graph if node in (previous or {})}
+    if known:
+        warm_parts = _connected_parts(graph, _local_moving(graph, known, weight, resolution, seed))
+        warm_quality = nx.community.modularity(graph, warm_parts, weight=weight, resolution=resolution)
+        if warm_quality >= quality - WARM_START_SLACK:
+            parts, quality, warm = warm_parts, warm_quality, True
+    return {"partition": stable_ids(parts, previous), "modularity": quality, "warmStart": warm}
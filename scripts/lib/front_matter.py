@@ -0,0 +1,223 @@
+"""
+Shared, persistent index of YAML front matter for the site's Markdown files.
+
+Every publication page under content/{journal,conference,workshop}_publication
+is parsed once and cached in .build-cache/front_matter.json keyed by path,
+mtime and size. A later scan re-stats each file and only re-parses the ones
+that changed; a file whose mtime moved but whose bytes did not (a fresh git
+checkout) keeps its cached parse. Dates are stored as ISO strings so cached
+and freshly parsed entries look the same to callers.
+
+    from lib import front_matter
+
+    index = front_matter.get_index()
+    for entry in index.publications():
+        entry.type, entry.title, entry.authors, entry.doi, entry.date
+    index.doi_map()            # {doi: title}
+    front_matter.load(path)    # any Markdown file, e.g. an author page
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CONTENT_DIR = PROJECT_ROOT / "content"
+INDEX_FILE = PROJECT_ROOT / ".build-cache" / "front_matter.json"
+INDEX_VERSION = 1
+
+SECTION_DIRS = {
+    "journal": "journal_publication",
+    "conference": "conference_publication",
+    "workshop": "workshop_publication",
+}
+
+
+def split_front_matter(text: str):
+    """Return the raw YAML between the leading '---' fences, or None."""
+    if not text.startswith("---"):
+        return None
+    parts = text.split("---", 2)
+    if len(parts) < 3:
+        return None
+    return parts[1]
+
+
+def _plain(value):
+    """Make a parsed YAML value JSON-safe (dates become ISO strings)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(key): _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def parse(text: str) -> dict:
+    front = split_front_matter(text)
+    if front is None:
+        return {}
+    try:
+        data = yaml.safe_load(front)
+    except Exception:
+        data = {}
+    return _plain(data) if isinstance(data, dict) else {}
+
+
+class Entry:
+    """One indexed publication page."""
+
+    __slots__ = ("path", "type", "data")
+
+    def __init__(self, path: Path, pub_type: str, data: dict):
+        self.path = path
+        self.type = pub_type
+        self.data = data
+
+    @property
+    def title(self) -> str:
+        return str(self.data.get("title") or "").strip()
+
+    @property
+    def authors(self) -> list:
+        authors = self.data.get("authors") or []
+        if isinstance(authors, str):
+            authors = [authors]
+        return [str(author).strip() for author in authors if str(author).strip()]
+
+    @property
+    def doi(self) -> str:
+        return str(self.data.get("doi") or "").strip()
+
+    @property
+    def date(self):
+        return self.data.get("date") or self.data.get("publishDate")
+
+    @property
+    def draft(self) -> bool:
+        return self.data.get("draft") is True
+
+
+class FrontMatterIndex:
+    def __init__(self, root: Path = PROJECT_ROOT, index_file: Path = INDEX_FILE):
+        self.root = Path(root)
+        self.index_file = Path(index_file)
+        self._lock = threading.RLock()
+        self._entries = {}
+        self._dirty = False
+        if self.index_file.exists():
+            try:
+                stored = json.loads(self.index_file.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                stored = {}
+            if stored.get("version") == INDEX_VERSION:
+                self._entries = stored.get("files", {})
+
+    def _key(self, path: Path) -> str:
+        path = Path(path).resolve()
+        try:
+            return str(path.relative_to(self.root))
+        except ValueError:
+            return str(path)
+
+    def load(self, path) -> dict:
+        """Parsed front matter for `path`, re-parsing only if the file changed."""
+        path = Path(path)
+        if not path.is_file():
+            return {}
+        stat = path.stat()
+        key = self._key(path)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached["mtime"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                return cached["data"]
+            raw = path.read_bytes()
+            digest = hashlib.sha1(raw).hexdigest()
+            if cached and cached["sha1"] == digest:
+                data = cached["data"]
+            else:
+                data = parse(raw.decode("utf-8", errors="ignore"))
+            self._entries[key] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest, "data": data}
+            self._dirty = True
+            return data
+
+    def publications(self, types=None) -> list:
+        """Scan the publication sections and return an Entry per index.md."""
+        entries = []
+        seen = set()
+        with self._lock:
+            for pub_type, dir_name in SECTION_DIRS.items():
+                if types and pub_type not in types:
+                    continue
+                base_dir = self.root / "content" / dir_name
+                if not base_dir.exists():
+                    continue
+                for path in sorted(base_dir.rglob("index.md")):
+                    seen.add(self._key(path))
+                    entries.append(Entry(path, pub_type, self.load(path)))
+            if not types:
+                content_prefix = tuple(f"content/{name}/" for name in SECTION_DIRS.values())
+                for key in [k for k in self._entries if k.startswith(content_prefix) and k not in seen]:
+                    del self._entries[key]
+                    self._dirty = True
+            self.save()
+        return entries
+
+    # -- lookups ------------------------------------------------------------
+
+    def titles(self) -> list:
+        return [entry.title for entry in self.publications() if entry.title]
+
+    def title_map(self) -> dict:
+        """{lowercased title: [paths]} for matching records to existing pages."""
+        mapping = {}
+        for entry in self.publications():
+            if entry.title:
+                mapping.setdefault(entry.title.lower(), []).append(entry.path)
+        return mapping
+
+    def doi_map(self) -> dict:
+        """{doi: title} for every publication that has both."""
+        return {entry.doi: entry.title for entry in self.publications() if entry.doi and entry.title}
+
+    def authors_by_path(self) -> dict:
+        return {entry.path: entry.authors for entry in self.publications()}
+
+    def by_type(self) -> dict:
+        grouped = {pub_type: [] for pub_type in SECTION_DIRS}
+        for entry in self.publications():
+            grouped[entry.type].append(entry)
+        return grouped
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = {"version": INDEX_VERSION, "files": self._entries}
+            self.index_file.write_text(json.dumps(payload, ensure_ascii=False) + "\n", encoding="utf-8")
+            self._dirty = False
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> FrontMatterIndex:
+    """Process-wide index, shared by every pipeline task."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = FrontMatterIndex()
+        return _index
+
+
+def load(path) -> dict:
+    return get_index().load(path)
@@ -0,0 +1,115 @@
+"""
+Indexed venue gazetteer (data/venue_locations.yaml).
+
+Each rule places papers whose venue contains its `match` string
+(case-insensitive), optionally only for one `year`; the first matching rule
+in file order wins and `skip: true` rules place nothing. The index buckets
+rules by year, scans a venue once with a compiled automaton over every
+match string (lib/matching.py) and memoizes the winning rule per
+venue/year. Venue/year pairs no rule covers are collected and reported in
+one batch.
+
+    from lib.gazetteer import Gazetteer
+
+    gazetteer = Gazetteer.load()
+    rule = gazetteer.locate("IEEE ISI", 2021)      # rule dict or None
+    gazetteer.report_unmatched("[footprint]")
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import yaml
+
+from lib.matching import keyword_scanner, prefixes
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+GAZETTEER_FILE = PROJECT_ROOT / "data" / "venue_locations.yaml"
+
+_ANY_YEAR = object()
+
+
+class Gazetteer:
+    def __init__(self, rules):
+        self.rules = [rule for rule in rules or [] if isinstance(rule, dict)]
+        self._buckets = {}
+        matches = set()
+        for index, rule in enumerate(self.rules):
+            match = str(rule.get("match", "")).lower()
+            matches.add(match)
+            year = rule["year"] if "year" in rule else _ANY_YEAR
+            self._buckets.setdefault(year, {}).setdefault(match, index)
+        self._scanner = keyword_scanner(matches)
+        self._prefixes = prefixes(matches)
+        self._present = {}
+        self._located = {}
+        self.unmatched = {}
+
+    @classmethod
+    def load(cls, path: Path = GAZETTEER_FILE):
+        try:
+            rules = yaml.safe_load(Path(path).read_text(encoding="utf-8")) or []
+        except (OSError, yaml.YAMLError):
+            rules = []
+        return cls(rules)
+
+    def _match_strings(self, venue: str) -> set:
+        """Every rule match string occurring in `venue` ("" always does)."""
+        found = self._present.get(venue)
+        if found is None:
+            found = {""}
+            if self._scanner is not None:
+                for hit in self._scanner.finditer(venue.lower()):
+                    found.update(self._prefixes[hit.group(1)])
+            self._present[venue] = found
+        return found
+
+    def locate(self, venue, year):
+        """First rule (file order) covering venue/year, or None (recorded as unmatched)."""
+        venue = str(venue or "")
+        key = (venue, year)
+        if key in self._located:
+            index = self._located[key]
+        else:
+            present = self._match_strings(venue)
+            candidates = [
+                bucket[match]
+                for bucket in (self._buckets.get(year, {}), self._buckets.get(_ANY_YEAR, {}))
+                for match in present
+                if match in bucket
+            ]
+            index = self._located[key] = min(candidates) if candidates else None
+        if index is None:
+            self.unmatched[key] = self.unmatched.get(key, 0) + 1
+            return None
+        return self.rules[index]
+
+    def report_unmatched(self, prefix="[gazetteer]"):
+        """Print one warning listing every venue/year no rule covered, then reset."""
+        if not self.unmatched:
+            return
+        print(f"{prefix} WARNING: no gazetteer rule for {len(self.unmatched)} venue/year pair(s) "
+              f"-- add them to data/venue_locations.yaml:")
+        for (venue, year), count in sorted(self.unmatched.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))):
+            print(f"    venue={venue!r} year={year} ({count} paper{'s' if count != 1 else ''})")
+        self.unmatched = {}
+
+    def presentations(self, publications):
+        """Conference/workshop locations from publications, in locations.json shape:
+        [{name, lat, lng, city, years: [str]}], one per venue name and place."""
+        grouped = {}
+        for pub in publications or []:
+            if pub.get("type") not in {"conference", "workshop"}:
+                continue
+            rule = self.locate(pub.get("venue"), pub.get("year"))
+            if rule is None or rule.get("skip"):
+                continue
+            name = re.sub(r"\s+(?:19|20)\d{2}$", "", rule["name"]).strip()
+            entry = grouped.setdefault((name, rule["lat"], rule["lng"]), {
+                "name": name, "lat": rule["lat"], "lng": rule["lng"], "city": rule["city"], "years": set(),
+            })
+            if pub.get("year"):
+                entry["years"].add(str(pub["year"]))
+        return [dict(entry, years=sorted(entry["years"])) for entry in grouped.values()]
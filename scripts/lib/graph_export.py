@@ -0,0 +1,116 @@
+"""
+Compact, pre-laid-out graph export for the interactive co-author views.
+
+node_link_data repeats both author names in every link. A compact graph
+stores each name once and the edges as parallel integer arrays, so a client
+can index them directly or wrap them in typed arrays:
+
+    {
+      "format": "compact-graph", "version": 1,
+      "names":  ["Benjamin Ampel", "Hsinchun Chen", ...],
+      "source": [0, 0, 1, ...],  "target": [1, 2, 2, ...],  "weight": [22, 3, 5, ...],
+      "x": [0.0, -212.4, ...],   "y": [0.0, 87.1, ...],
+      ...per-node arrays such as "count"
+    }
+
+x/y come from a seeded Fruchterman-Reingold layout centred on `center` and
+scaled to +-LAYOUT_SCALE, so the page can draw the final positions without
+running a force simulation first. The layout is networkx's dense
+spring_layout step for step, in float32 and for every graph size
+(networkx switches to a much slower per-node loop above 500 nodes): about
+2 s for 1500 nodes. Above DENSE_LAYOUT_LIMIT nodes the V x V matrices get too
+large and nx.spring_layout is used instead.
+Several views of one graph (e.g. year ranges) can share one layout so nodes
+keep their place when the view changes.
+
+    from lib.graph_export import compact_graph, layout
+
+    positions = layout(names, links, center="Benjamin Ampel")
+    compact_graph(names, links, positions, count=[...])
+"""
+
+from __future__ import annotations
+
+import networkx as nx
+import numpy as np
+
+FORMAT = "compact-graph"
+VERSION = 1
+LAYOUT_SCALE = 500
+LAYOUT_SEED = 0
+LAYOUT_ITERATIONS = 50
+LAYOUT_THRESHOLD = 1e-4
+DENSE_LAYOUT_LIMIT = 5000
+
+
+def _fruchterman_reingold(adjacency, iterations=LAYOUT_ITERATIONS, seed=LAYOUT_SEED):
+    """networkx's dense Fruchterman-Reingold on a float32 adjacency matrix."""
+    count = adjacency.shape[0]
+    pos = np.random.RandomState(seed).rand(count, 2).astype(np.float32)
+    k = np.float32(np.sqrt(1.0 / count))
+    temperature = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        dx = pos[:, 0, None] - pos[None, :, 0]
+        dy = pos[:, 1, None] - pos[None, :, 1]
+        distance = np.sqrt(dx * dx + dy * dy)
+        np.clip(distance, 0.01, None, out=distance)
+        force = k * k / (distance * distance) - adjacency * distance / k
+        displacement = np.stack([(dx * force).sum(axis=1), (dy * force).sum(axis=1)], axis=1)
+        length = np.sqrt((displacement * displacement).sum(axis=1))
+        length = np.where(length < 0.01, 0.1, length)
+        step = displacement * (temperature / length)[:, None]
+        pos += step
+        temperature -= cooling
+        if np.linalg.norm(step) / count < LAYOUT_THRESHOLD:
+            break
+    return pos
+
+
+def layout(names, links, center=None, seed=LAYOUT_SEED) -> dict:
+    """{name: (x, y)} for `links` [(source, target, weight)]: spring layout,
+    `center` moved to the origin, scaled so the farthest node sits
+    LAYOUT_SCALE away on either axis."""
+    names = list(names)
+    if not names:
+        return {}
+    index = {name: i for i, name in enumerate(names)}
+    if len(names) <= DENSE_LAYOUT_LIMIT:
+        adjacency = np.zeros((len(names), len(names)), dtype=np.float32)
+        for u, v, w in links:
+            adjacency[index[u], index[v]] = adjacency[index[v], index[u]] = w
+        positions = _fruchterman_reingold(adjacency, seed=seed)
+    else:
+        graph = nx.Graph()
+        graph.add_nodes_from(range(len(names)))
+        graph.add_weighted_edges_from((index[u], index[v], w) for u, v, w in links)
+        positions = nx.spring_layout(graph, weight="weight", seed=seed, iterations=LAYOUT_ITERATIONS)
+    ox, oy = positions[index[center]] if center in index else (0.0, 0.0)
+    shifted = {name: (float(positions[i][0] - ox), float(positions[i][1] - oy)) for name, i in index.items()}
+    extent = max(max(abs(x), abs(y)) for x, y in shifted.values()) or 1.0
+    return {
+        name: (round(x / extent * LAYOUT_SCALE, 1), round(y / extent * LAYOUT_SCALE, 1))
+        for name, (x, y) in shifted.items()
+    }
+
+
+def compact_graph(names, links, positions=None, **node_arrays) -> dict:
+    """Compact graph for `names` and `links` [(source name, target name, weight)].
+
+    `positions` is {name: (x, y)} (see layout); extra keyword arguments are
+    per-node arrays in `names` order.
+    """
+    names = list(names)
+    index = {name: i for i, name in enumerate(names)}
+    graph = {"format": FORMAT, "version": VERSION, "names": names}
+    graph.update(node_arrays)
+    source, target, weight = [], [], []
+    for u, v, w in links:
+        source.append(index[u])
+        target.append(index[v])
+        weight.append(w)
+    graph.update({"source": source, "target": target, "weight": weight})
+    if positions is not None:
+        graph["x"] = [positions[name][0] for name in names]
+        graph["y"] = [positions[name][1] for name in names]
+    return graph
@@ -0,0 +1,301 @@
+"""
+Shared HTTP client for the fetch_* scripts.
+
+One requests.Session serves every script in the process, so connections to
+each host are kept alive and reused (the pipeline runs the fetchers in
+threads of one interpreter). Requests are paced per host by a token bucket
+sized to that API's published limit (HOST_LIMITS), so a script waits only as
+long as the limit requires instead of sleeping a fixed delay after every
+call however long the call took.
+
+At most HOST_CONCURRENCY requests are in flight to one host at a time, so a
+source can send its queries concurrently with gather(): every query runs in
+a helper thread attached to the caller's instrument stage, and results come
+back in query order. One query failing yields `default` for it instead of
+failing the others.
+
+Failed requests (connection errors, timeouts, 429 and 5xx) are retried with
+jittered exponential backoff, starting from the host's HOST_BACKOFF (or
+BACKOFF) unless the call passes backoff=. A Retry-After header is honoured and pauses
+the whole host, so concurrent callers back off too. Other 4xx responses
+raise at once. Every attempt is counted per host in the current
+instrument stage, and time spent waiting for a token is added to the
+stage's "throttled" seconds.
+
+The shared client answers GET and POST requests from the persistent
+response cache when it can (TTLs, revalidation and offline mode are
+described in lib/http_cache.py); pass ttl= to override a host's TTL.
+
+    from lib import http
+
+    client = http.get_client()
+    data = client.get_json(url, params={"q": "..."}, headers={"Accept": "application/json"})
+
+    results = http.gather(fetch_keyword, SEARCH_KEYWORDS, default=[])
+
+Environment:
+    HTTP_RETRIES   retries after the first attempt (default 3)
+    HTTP_WORKERS   helper threads per gather() call (default 8)
+    HTTP_CACHE, HTTP_OFFLINE   see lib/http_cache.py
+"""
+
+from __future__ import annotations
+
+import email.utils
+import os
+import random
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from lib import http_cache, instrument
+
+USER_AGENT = "BampelWebsite/1.0 (academic portfolio; mailto:bampel@gsu.edu)"
+TIMEOUT = 20
+RETRIES = 3
+WORKERS = 8
+BACKOFF = 1.0            # seconds before the first retry, doubled after each
+MAX_RETRY_AFTER = 120.0  # longest Retry-After we are willing to wait
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# host -> (requests per second, burst)
+HOST_LIMITS = {
+    "api.semanticscholar.org": (1.0, 1),     # free tier: ~1 request/s
+    "api.crossref.org": (10.0, 5),           # polite pool (mailto)
+    "api.openalex.org": (10.0, 5),           # polite pool (mailto)
+    "api.github.com": (10 / 60, 10),         # search API without a token: 10/min
+    "opencitations.net": (2.0, 2),
+    "api.nsf.gov": (1.0, 2),
+    "apply07.grants.gov": (1.0, 2),
+    "export.arxiv.org": (1 / 3, 1),          # arXiv asks for one request every 3 s
+}
+DEFAULT_LIMIT = (1.0, 1)
+
+# host -> requests in flight at once
+HOST_CONCURRENCY = {
+    "api.semanticscholar.org": 1,
+    "export.arxiv.org": 1,
+    "api.github.com": 2,
+}
+DEFAULT_CONCURRENCY = 4
+
+# host -> seconds before the first retry, when BACKOFF is too short for the
+# host's outages to clear
+HOST_BACKOFF = {
+    "export.arxiv.org": 10.0,                # timeouts last tens of seconds
+}
+
+RequestError = requests.RequestException
+
+
+class TokenBucket:
+    """Thread-safe token bucket. acquire() reserves a token and sleeps until it is due."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Take one token; returns the seconds slept waiting for it."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Hold back every caller for `seconds` (Retry-After)."""
+        with self.lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+
+
+def configured_retries() -> int:
+    try:
+        return max(0, int(os.environ.get("HTTP_RETRIES") or RETRIES))
+    except ValueError:
+        return RETRIES
+
+
+def configured_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("HTTP_WORKERS") or WORKERS))
+    except ValueError:
+        return WORKERS
+
+
+def retry_after(response) -> float | None:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date), capped."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class HttpClient:
+    """Pooled, per-host rate-limited session with retries."""
+
+    def __init__(self, limits=None, retries=None, backoff=BACKOFF, cache=None):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.cache = cache
+        self.retries = configured_retries() if retries is None else retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=len(self.limits) + 4, pool_maxsize=DEFAULT_CONCURRENCY)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._buckets = {}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def set_limit(self, host: str, rate: float, burst: int = 1):
+        """Change a host's pace (e.g. a higher limit when authenticated)."""
+        with self._lock:
+            self.limits[host] = (rate, burst)
+            self._buckets.pop(host, None)
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(*self.limits.get(host, DEFAULT_LIMIT))
+            return self._buckets[host]
+
+    def slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, DEFAULT_CONCURRENCY))
+            return self._slots[host]
+
+    def request(self, method, url, *, ttl=None, retries=None, backoff=None, timeout=TIMEOUT,
+                **kwargs) -> requests.Response:
+        """Send a request, or answer it from the response cache, and return
+        the response; raises RequestError once retries are used up or on a
+        non-retryable error status. `ttl` overrides the host's cache TTL and
+        `backoff` its first retry delay."""
+        cache = self.cache
+        if cache is None or method.upper() not in http_cache.CACHEABLE_METHODS:
+            return self._send(method, url, retries, backoff, timeout, **kwargs)
+        key = http_cache.request_key(method, url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data"))
+        entry = cache.lookup(key)
+        if entry is not None and (cache.offline or entry.age() < (cache.ttl(url) if ttl is None else ttl)):
+            instrument.record_cache(url, "hit")
+            return entry.response()
+        if cache.offline:
+            instrument.record_cache(url, "miss")
+            raise http_cache.OfflineMiss(f"not cached (HTTP_OFFLINE): {method} {url}")
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **entry.validators()}
+        response = self._send(method, url, retries, backoff, timeout, **kwargs)
+        if entry is not None and response.status_code == 304:
+            cache.renew(entry, response)
+            instrument.record_cache(url, "revalidated")
+            return entry.response()
+        instrument.record_cache(url, "miss")
+        cache.store(key, url, response)
+        return response
+
+    def _send(self, method, url, retries, backoff, timeout, **kwargs) -> requests.Response:
+        host = urllib.parse.urlsplit(url).hostname or url
+        bucket, slots = self.bucket(host), self.slots(host)
+        retries = self.retries if retries is None else retries
+        if backoff is None:
+            backoff = HOST_BACKOFF.get(host, self.backoff)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            if waited:
+                instrument.record_throttle(url, waited)
+            response = None
+            try:
+                with slots:
+                    response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == retries:
+                    response.raise_for_status()
+                    return response
+            delay = retry_after(response)
+            if delay is not None:
+                bucket.pause(delay)
+            else:
+                time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+            attempt += 1
+
+    def get(self, url, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_json(self, url, **kwargs):
+        return self.get(url, **kwargs).json()
+
+    def post_json(self, url, payload, **kwargs):
+        return self.post(url, json=payload, **kwargs).json()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_client() -> HttpClient:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient(cache=http_cache.get_cache())
+        return _default
+
+
+def gather(func, items, default=None, workers=None) -> list:
+    """[func(item) for item in items], run concurrently in helper threads.
+
+    Results keep the order of `items`. An item whose call raises is reported
+    and gives `default`. Pacing and per-host limits come from the client.
+    """
+    items = list(items)
+    workers = min(workers or configured_workers(), len(items))
+    if workers <= 1:
+        return [_call(func, item, default) for item in items]
+    stage = instrument.current_stage()
+
+    def attached(item):
+        with instrument.attach(stage):
+            return _call(func, item, default)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(attached, items))
+
+
+def _call(func, item, default):
+    try:
+        return func(item)
+    except Exception as exc:
+        print(f"  Warning [{str(item)[:50]}]: {exc}")
+        return default
@@ -0,0 +1,206 @@
+"""
+Persistent HTTP response cache for lib.http.
+
+Successful responses are stored in SQLite under .build-cache/ (which the
+workflow keeps between runs), keyed by method, normalized URL (lower-case
+scheme and host, sorted query) and request body. A stored response is served
+without a request while it is younger than its host's TTL (HOST_TTLS). After
+that it is revalidated with If-None-Match / If-Modified-Since when the
+server sent an ETag or Last-Modified, and a 304 renews it in place;
+otherwise it is fetched again.
+
+With HTTP_OFFLINE=1 every lookup is answered from the cache whatever its age,
+and a request that is not cached raises OfflineMiss, so outputs can be
+rebuilt without network. Lookups are counted per stage and host as
+"hit", "revalidated" or "miss" (see lib/instrument.py).
+
+Cache: .build-cache/http.sqlite
+
+Environment:
+    HTTP_CACHE     on (default) | off
+    HTTP_OFFLINE   1 to serve only from the cache
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+CACHE_FILE = PROJECT_ROOT / ".build-cache" / "http.sqlite"
+SCHEMA_VERSION = 1
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+# host -> seconds a stored response is served without asking the server
+HOST_TTLS = {
+    "api.crossref.org": 90 * DAY,        # metadata of a resolved DOI rarely changes
+    "opencitations.net": DAY,
+    "api.semanticscholar.org": 7 * DAY,
+    "api.openalex.org": DAY,
+    "api.nsf.gov": DAY,
+    "apply07.grants.gov": 6 * HOUR,
+    "api.github.com": 6 * HOUR,
+    "export.arxiv.org": HOUR,
+}
+DEFAULT_TTL = 0  # always revalidate (the copy still serves offline mode)
+
+CACHEABLE_METHODS = {"GET", "POST"}
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+class OfflineMiss(requests.RequestException):
+    """HTTP_OFFLINE is set and the request is not in the cache."""
+
+
+def _flag(name, default="") -> str:
+    return (os.environ.get(name) or default).strip().lower()
+
+
+def normalize_url(url, params=None) -> str:
+    """URL with params merged, scheme and host lower-cased, query sorted, fragment dropped."""
+    if params:
+        url = requests.Request("GET", url, params=params).prepare().url
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+def request_key(method, url, params=None, json_body=None, data=None) -> str:
+    digest = hashlib.sha256(f"{method.upper()} {normalize_url(url, params)}\n".encode())
+    if json_body is not None:
+        digest.update(json.dumps(json_body, sort_keys=True, separators=(",", ":")).encode())
+    elif data is not None:
+        digest.update(data if isinstance(data, bytes) else str(data).encode())
+    return digest.hexdigest()
+
+
+class Entry:
+    """One stored response."""
+
+    def __init__(self, key, url, headers, body, stored_at):
+        self.key = key
+        self.url = url
+        self.headers = CaseInsensitiveDict(headers)
+        self.body = body
+        self.stored_at = stored_at
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def validators(self) -> dict:
+        headers = {}
+        if self.headers.get("ETag"):
+            headers["If-None-Match"] = self.headers["ETag"]
+        if self.headers.get("Last-Modified"):
+            headers["If-Modified-Since"] = self.headers["Last-Modified"]
+        return headers
+
+    def response(self) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.headers["X-Cache"] = "hit"
+        response._content = self.body
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+class HttpCache:
+    def __init__(self, path: Path = CACHE_FILE, offline=False):
+        self.path = Path(path)
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connect(self):
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS responses")
+                db.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT NOT NULL, headers TEXT NOT NULL,"
+                " body BLOB NOT NULL, stored_at REAL NOT NULL)"
+            )
+            db.commit()
+            self._db = db
+        return self._db
+
+    def ttl(self, url) -> float:
+        return HOST_TTLS.get(urllib.parse.urlsplit(url).hostname, DEFAULT_TTL)
+
+    def lookup(self, key):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT url, headers, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        url, headers, body, stored_at = row
+        return Entry(key, url, json.loads(headers), bytes(body), stored_at)
+
+    def store(self, key, url, response):
+        """Keep a 200 response unless the server asked not to."""
+        if response.status_code != 200 or "no-store" in response.headers.get("Cache-Control", ""):
+            return
+        headers = {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers}
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, url, headers, body, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, url, json.dumps(headers), response.content, time.time()),
+            )
+            db.commit()
+
+    def renew(self, entry, response):
+        """A 304: the stored body is current; take any new validators."""
+        for name in ("ETag", "Last-Modified"):
+            if response.headers.get(name):
+                entry.headers[name] = response.headers[name]
+        entry.stored_at = time.time()
+        with self._lock:
+            db = self._connect()
+            db.execute(
+                "UPDATE responses SET headers = ?, stored_at = ? WHERE key = ?",
+                (json.dumps(dict(entry.headers)), entry.stored_at, entry.key),
+            )
+            db.commit()
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_cache():
+    """The shared cache, or None when HTTP_CACHE=off (and not offline)."""
+    global _default
+    offline = _flag("HTTP_OFFLINE") in ("1", "true", "yes", "on")
+    if _flag("HTTP_CACHE", "on") in ("0", "off", "false", "no") and not offline:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = HttpCache(offline=offline)
+        return _default
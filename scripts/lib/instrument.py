@@ -0,0 +1,391 @@
+"""
+Per-stage timing, memory, I/O and HTTP instrumentation.
+
+Wrap a script's main() (or any block) in a stage:
+
+    from lib import instrument
+
+    @instrument.stage()
+    def main():
+        ...
+        with instrument.stage("centrality"):
+            ...
+
+Each stage records wall time, CPU time of its thread, bytes read and written
+by its thread (Linux /proc counters, 0 elsewhere) and the count and latency
+of HTTP requests it made through urllib.request or requests (other clients
+can report through record_http()), plus the time lib.http spent waiting on
+per-host rate limits and its response-cache hits, revalidations and misses. Peak RSS is a process-wide
+figure (stages run concurrently in the pipeline), so it is reported once per
+session.
+
+The pipeline runner opens one session for the whole run. A decorated script
+run on its own opens a session for itself. When a session closes it writes
+output/traces/<timestamp>.json (stage records) and <timestamp>.trace.json
+(Chrome trace-event format: open in chrome://tracing or ui.perfetto.dev) and
+prints a summary table.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+TRACE_DIR = PROJECT_ROOT / "output" / "traces"
+
+_local = threading.local()
+_record_lock = threading.Lock()  # helper threads share their stage's record
+_session = None
+_session_lock = threading.Lock()
+_hooks_installed = False
+
+
+# ---------------------------------------------------------------------------
+# Counters
+# ---------------------------------------------------------------------------
+
+def _thread_io():
+    """(bytes read, bytes written) by the calling thread, from /proc on Linux."""
+    try:
+        with open("/proc/thread-self/io", "r", encoding="ascii") as handle:
+            fields = dict(line.split(": ", 1) for line in handle.read().splitlines())
+        return int(fields.get("rchar", 0)), int(fields.get("wchar", 0))
+    except (OSError, ValueError):
+        return 0, 0
+
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+class _Session:
+    def __init__(self, label):
+        self.label = label
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.stages = []
+        self.lock = threading.Lock()
+
+    def offset_us(self, moment) -> int:
+        return int((moment - self.origin) * 1_000_000)
+
+
+def start_session(label="pipeline"):
+    """Begin collecting stages. Returns False if a session is already open."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            return False
+        _session = _Session(label)
+    install_http_hooks()
+    return True
+
+
+def finish_session(trace_dir: Path = TRACE_DIR, print_summary=True):
+    """Close the session, write its trace files and print the summary table."""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is None:
+        return None
+    wall = time.perf_counter() - session.origin
+    stamp = session.started_at.strftime("%Y%m%d-%H%M%S")
+    trace_dir.mkdir(parents=True, exist_ok=True)
+    json_path = trace_dir / f"{stamp}-{session.label}.json"
+    chrome_path = trace_dir / f"{stamp}-{session.label}.trace.json"
+
+    stages = [{key: value for key, value in record.items() if not key.startswith("_")} for record in session.stages]
+    json_path.write_text(json.dumps({
+        "label": session.label,
+        "started": session.started_at.isoformat(timespec="seconds"),
+        "wall": round(wall, 4),
+        "peakRssKb": _peak_rss_kb(),
+        "stages": stages,
+    }, indent=2) + "\n", encoding="utf-8")
+    chrome_path.write_text(json.dumps(_chrome_events(session)) + "\n", encoding="utf-8")
+
+    if print_summary:
+        print_table(stages, wall)
+        print(f"{'peak RSS (process) MB':36s} {_peak_rss_kb() / 1024:8.1f}")
+        print(f"Trace: {json_path.relative_to(PROJECT_ROOT) if json_path.is_relative_to(PROJECT_ROOT) else json_path}")
+    return json_path
+
+
+def _chrome_events(session):
+    pid = os.getpid()
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": session.label}}]
+    for record in session.stages:
+        events.append({
+            "name": record["name"],
+            "cat": "stage",
+            "ph": "X",
+            "pid": pid,
+            "tid": record["thread"],
+            "ts": record["_ts"],
+            "dur": max(1, int(record["wall"] * 1_000_000)),
+            "args": {key: record[key] for key in ("cpu", "bytesRead", "bytesWritten", "http")},
+        })
+        for call in record["_http_events"]:
+            events.append({
+                "name": f"{call['method']} {call['host']}",
+                "cat": "http",
+                "ph": "X",
+                "pid": pid,
+                "tid": record["thread"],
+                "ts": call["ts"],
+                "dur": max(1, int(call["seconds"] * 1_000_000)),
+                "args": {"status": call["status"]},
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"peakRssKb": _peak_rss_kb()}}
+
+
+def print_table(stages, wall=None):
+    header = (f"{'stage':36s} {'wall s':>8s} {'cpu s':>8s} {'read MB':>8s} {'write MB':>8s} "
+              f"{'http':>5s} {'http s':>7s} {'cached':>6s}")
+    print("\n" + header)
+    print("-" * len(header))
+    for record in sorted(stages, key=lambda item: item["wall"], reverse=True):
+        indent = "  " * record["depth"]
+        print(
+            f"{(indent + record['name'])[:36]:36s} {record['wall']:8.2f} {record['cpu']:8.2f} "
+            f"{record['bytesRead'] / 1e6:8.2f} {record['bytesWritten'] / 1e6:8.2f} "
+            f"{record['http']['count']:5d} {record['http']['seconds']:7.2f} "
+            f"{sum(record['http'].get('cache', {}).get(kind, 0) for kind in ('hit', 'revalidated')):6d}"
+        )
+    if wall is not None:
+        print(f"{'total (wall)':36s} {wall:8.2f}")
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+class stage:
+    """Context manager / decorator that records one stage."""
+
+    def __init__(self, name=None):
+        self.name = name
+
+    def __call__(self, func):
+        name = self.name or _default_name(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def __enter__(self):
+        stack = _stack()
+        if stack and stack[-1] is not None and stack[-1]["name"] == self.name:
+            # Already inside a stage of the same name (pipeline task wrapping main()).
+            stack.append(None)
+            return self
+        owns_session = start_session(self.name or "run") if not stack and _session is None else False
+        read, written = _thread_io()
+        stack.append({
+            "name": self.name,
+            "depth": len([item for item in stack if item]),
+            "thread": threading.get_native_id(),
+            "_owns_session": owns_session,
+            "_start": time.perf_counter(),
+            "_cpu": time.thread_time(),
+            "_read": read,
+            "_written": written,
+            "_http_events": [],
+            "http": {"count": 0, "seconds": 0.0, "errors": 0, "throttled": 0.0, "cache": {}, "hosts": {}},
+        })
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record = _stack().pop()
+        if record is None:
+            return False
+        read, written = _thread_io()
+        end = time.perf_counter()
+        record.update({
+            "wall": round(end - record["_start"], 4),
+            "cpu": round(time.thread_time() - record["_cpu"], 4),
+            "bytesRead": max(0, read - record["_read"]),
+            "bytesWritten": max(0, written - record["_written"]),
+            "ok": exc_type is None,
+        })
+        record["http"]["seconds"] = round(record["http"]["seconds"], 4)
+        record["http"]["throttled"] = round(record["http"]["throttled"], 4)
+        session = _session
+        if session is not None:
+            record["_ts"] = session.offset_us(record["_start"])
+            for call in record["_http_events"]:
+                call["ts"] = session.offset_us(call.pop("start"))
+            with session.lock:
+                session.stages.append(record)
+        if record["_owns_session"]:
+            finish_session()
+        return False
+
+
+def _default_name(func) -> str:
+    module = func.__module__
+    if module == "__main__":
+        module = Path(sys.argv[0]).stem
+    return module if func.__name__ == "main" else f"{module}.{func.__name__}"
+
+
+def current_stage():
+    for record in reversed(_stack()):
+        if record is not None:
+            return record
+    return None
+
+
+def root_stage():
+    """The outermost stage open on this thread (the pipeline task)."""
+    for record in _stack():
+        if record is not None:
+            return record
+    return None
+
+
+@contextlib.contextmanager
+def attach(record):
+    """Attribute this thread's HTTP requests to `record`, a stage opened on
+    another thread (pass that thread's current_stage()). For helper threads
+    of a stage; record None is a no-op."""
+    stack = _stack()
+    stack.append(record)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+# ---------------------------------------------------------------------------
+# HTTP accounting
+# ---------------------------------------------------------------------------
+
+def record_http(url, seconds, status=None, method="GET", started=None):
+    """Attribute one HTTP request to the calling thread's current stage."""
+    record = current_stage()
+    if record is None:
+        return
+    host = urllib.parse.urlsplit(url).hostname or url
+    with _record_lock:
+        stats = record["http"]
+        stats["count"] += 1
+        stats["seconds"] += seconds
+        if status is None or (isinstance(status, int) and status >= 400):
+            stats["errors"] += 1
+        per_host = stats["hosts"].setdefault(host, {"count": 0, "seconds": 0.0})
+        per_host["count"] += 1
+        per_host["seconds"] = round(per_host["seconds"] + seconds, 4)
+        record["_http_events"].append({
+            "host": host,
+            "method": method,
+            "status": status,
+            "seconds": seconds,
+            "start": started if started is not None else time.perf_counter() - seconds,
+        })
+
+
+def record_throttle(url, seconds):
+    """Attribute time spent waiting on a rate limit (lib.http) to the current stage."""
+    record = current_stage()
+    if record is None:
+        return
+    host = urllib.parse.urlsplit(url).hostname or url
+    with _record_lock:
+        record["http"]["throttled"] += seconds
+        per_host = record["http"]["hosts"].setdefault(host, {"count": 0, "seconds": 0.0})
+        per_host["throttled"] = round(per_host.get("throttled", 0.0) + seconds, 4)
+
+
+def record_cache(url, outcome):
+    """Count one lib.http cache lookup ("hit", "revalidated" or "miss")."""
+    record = current_stage()
+    if record is None:
+        return
+    host = urllib.parse.urlsplit(url).hostname or url
+    with _record_lock:
+        cache = record["http"]["cache"]
+        cache[outcome] = cache.get(outcome, 0) + 1
+        per_host = record["http"]["hosts"].setdefault(host, {"count": 0, "seconds": 0.0})
+        per_host.setdefault("cache", {})
+        per_host["cache"][outcome] = per_host["cache"].get(outcome, 0) + 1
+
+
+def install_http_hooks():
+    """Count requests made through urllib.request and requests (idempotent)."""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    _hooks_installed = True
+
+    import urllib.error
+    import urllib.request
+
+    original_open = urllib.request.OpenerDirector.open
+
+    def timed_open(self, fullurl, data=None, *args, **kwargs):
+        if isinstance(fullurl, str):
+            url, method = fullurl, "GET" if data is None else "POST"
+        else:
+            url, method = fullurl.full_url, fullurl.get_method()
+        started = time.perf_counter()
+        status = None
+        try:
+            response = original_open(self, fullurl, data, *args, **kwargs)
+            status = getattr(response, "status", None)
+            return response
+        except urllib.error.HTTPError as exc:
+            status = exc.code
+            raise
+        finally:
+            record_http(url, time.perf_counter() - started, status, method, started)
+
+    urllib.request.OpenerDirector.open = timed_open
+
+    try:
+        import requests
+    except ImportError:
+        return
+
+    original_send = requests.Session.send
+
+    def timed_send(self, request, **kwargs):
+        started = time.perf_counter()
+        status = None
+        try:
+            response = original_send(self, request, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            record_http(request.url, time.perf_counter() - started, status, request.method, started)
+
+    requests.Session.send = timed_send
@@ -0,0 +1,50 @@
+"""
+Multi-keyword substring matching with one compiled regex.
+
+keyword_scanner() factors the keywords into a character trie and wraps the
+resulting alternation in a lookahead, so one finditer() pass reports, at
+every position of the text, the longest keyword starting there. Keywords
+that are prefixes of a reported keyword occur at the same position too;
+prefixes() lists them so callers can credit every keyword that occurs.
+"""
+
+from __future__ import annotations
+
+import re
+
+
+def trie_pattern(words) -> str:
+    """Alternation regex for `words` factored into a character trie, so the
+    engine tests one branch per leading character instead of every word.
+    Longer words come before their prefixes, so the longest match wins."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            branches.append("")
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return render(trie)
+
+
+def keyword_scanner(words):
+    """Compiled pattern whose finditer() yields the longest keyword (group 1)
+    starting at each position of the text. Returns None for no keywords."""
+    words = sorted({word for word in words if word})
+    if not words:
+        return None
+    return re.compile("(?=(" + trie_pattern(words) + "))")
+
+
+def prefixes(words) -> dict:
+    """{word: [every word in `words` that is a prefix of it, itself included]}"""
+    words = sorted(set(words))
+    return {word: [other for other in words if word.startswith(other)] for word in words}
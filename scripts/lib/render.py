@@ -0,0 +1,183 @@
+"""
+Light and dark renders of the static images from one figure build.
+
+A script prepares everything that does not depend on the theme once (data,
+layout, map geometry) and passes a draw function plus a palette per theme.
+Each theme is drawn and saved in a worker process. The worker pool is shared,
+so the map, co-author network and impact dashboard renders run at the same
+time when the pipeline runs those tasks concurrently. Workers are spawned
+(the pipeline parent is multi-threaded) and stay up for the run, so
+matplotlib is imported once per worker and not once per image.
+
+    from lib import render
+
+    render.render_themes(
+        draw_dashboard, data,
+        {"light": LIGHT, "dark": DARK},
+        {"light": OUTPUT_DIR / "impact-dashboard.png", "dark": OUTPUT_DIR / "impact-dashboard-dark.png"},
+        savefig={"dpi": 150, "bbox_inches": "tight"},
+    )
+
+Backgrounds that never change between runs (the map's projected basemap)
+can be kept as raster layers with cached_layer(): the axes is drawn once
+per key, cropped to its on-screen area and stored under
+.build-cache/layers/, and later renders only imshow() the stored pixels
+behind their markers and labels.
+
+`draw(data, palette)` must be a module-level function returning a figure,
+and `data` must be picklable. The figure is saved with the palette's
+"bg_color" as its facecolor unless `savefig` sets one. With
+RENDER_WORKERS=1 (or a single theme) the themes are drawn one after another
+in this process instead, holding a lock because pyplot is not thread-safe.
+
+Environment:
+    RENDER_WORKERS   worker processes (default: CPU count, at most 4)
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+LAYER_DIR = PROJECT_ROOT / ".build-cache" / "layers"
+LAYER_VERSION = 1
+
+THEMES = ("light", "dark")
+MAX_WORKERS = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+_pyplot_lock = threading.Lock()
+
+
+def configured_workers() -> int:
+    try:
+        return max(1, int(os.environ.get("RENDER_WORKERS") or min(MAX_WORKERS, os.cpu_count() or 1)))
+    except ValueError:
+        return 1
+
+
+def _init_worker():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def get_pool(workers: int = None):
+    """The shared render pool, started on first use (None when workers <= 1)."""
+    global _pool
+    workers = workers or configured_workers()
+    if workers <= 1:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+            atexit.register(shutdown)
+        return _pool
+
+
+def shutdown():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+def _render(draw, data, palette, path, savefig):
+    """Draw one theme and save it. Runs in a worker or under _pyplot_lock."""
+    import matplotlib.pyplot as plt
+
+    fig = draw(data, palette)
+    if fig is None:
+        return None
+    try:
+        options = {"facecolor": palette.get("bg_color"), "edgecolor": "none", **(savefig or {})}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, **options)
+    finally:
+        plt.close(fig)
+    return str(path)
+
+
+def render_themes(draw, data, palettes, outputs, savefig=None, workers=None):
+    """Render `draw(data, palettes[theme])` to `outputs[theme]` for every theme
+    in `outputs`. Returns {theme: saved path or None}, in THEMES order."""
+    themes = [theme for theme in THEMES if theme in outputs] + [
+        theme for theme in outputs if theme not in THEMES
+    ]
+    pool = get_pool(workers) if len(themes) > 1 else None
+    if pool is None:
+        with _pyplot_lock:
+            return {theme: _render(draw, data, palettes[theme], outputs[theme], savefig) for theme in themes}
+    futures = {
+        theme: pool.submit(_render, draw, data, palettes[theme], outputs[theme], savefig)
+        for theme in themes
+    }
+    return {theme: future.result() for theme, future in futures.items()}
+
+
+# ---------------------------------------------------------------------------
+# Cached layers
+# ---------------------------------------------------------------------------
+
+def _layer_path(name, key, directory) -> Path:
+    text = json.dumps({"version": LAYER_VERSION, "key": key}, sort_keys=True, default=str)
+    return Path(directory) / f"{name}-{hashlib.sha256(text.encode()).hexdigest()[:16]}.npz"
+
+
+def cached_layer(name, key, draw, figsize, dpi, directory=LAYER_DIR):
+    """Raster of one axes' static content, from disk when `key` is unchanged.
+
+    `draw(figure)` adds the axes to a transparent `figsize` figure at `dpi`,
+    placed where it sits in the final figure, and returns it. `key` must
+    cover everything else that affects the pixels (projection, extent, axes
+    position, colours). Returns {"rgba": uint8 array,
+    "xlim": (x0, x1), "ylim": (y0, y1)}; show it with
+    ax.imshow(layer["rgba"], extent=(*layer["xlim"], *layer["ylim"])).
+    """
+    import numpy as np
+
+    path = _layer_path(name, {"layer": key, "figsize": list(figsize), "dpi": dpi}, directory)
+    try:
+        with np.load(path) as stored:
+            return {"rgba": stored["rgba"], "xlim": tuple(stored["xlim"]), "ylim": tuple(stored["ylim"])}
+    except (OSError, KeyError, ValueError):
+        pass
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    # The Figure API keeps this off pyplot, so pipeline threads may build layers.
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    fig.patch.set_alpha(0)
+    ax = draw(fig)
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    fig.canvas.draw()
+    pixels = np.asarray(fig.canvas.buffer_rgba())
+    box = ax.get_window_extent()
+    height = pixels.shape[0]
+    rgba = pixels[
+        height - int(round(box.y1)):height - int(round(box.y0)),
+        int(round(box.x0)):int(round(box.x1)),
+    ].copy()
+    layer = {"rgba": rgba, "xlim": tuple(ax.get_xlim()), "ylim": tuple(ax.get_ylim())}
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp.npz")
+    np.savez_compressed(partial, **layer)
+    os.replace(partial, path)
+    return layer
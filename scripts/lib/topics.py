@@ -0,0 +1,94 @@
+"""
+Keyword taxonomy and a compiled topic classifier for publication titles.
+
+A title belongs to a category when one of the category's keywords occurs in
+it (case-insensitive substring). The primary topic is the first category in
+TOPIC_TAXONOMY order that matches, or "Other".
+
+TopicClassifier compiles every keyword into one regex (lib/matching.py), so
+a single scan finds the longest keyword starting at each position; keywords
+that are prefixes of the one matched there are credited too, which keeps the
+result identical to testing each keyword on its own. Results are memoized
+per normalized title.
+
+    from lib.topics import classify, classify_topic
+
+    classify_topic("Phishing detection with deep learning")   # 'AI / Deep Learning'
+    classify("Phishing detection with deep learning").hits     # {'AI / Deep Learning': 1, 'Cybersecurity': 1}
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from lib.matching import keyword_scanner, prefixes
+
+TOPIC_TAXONOMY = {
+    "AI / Deep Learning": ["Deep Learning", "Neural", "Transfer Learning", "Embedding", "Machine Learning", "Artificial Intelligence", "Adversarial"],
+    "Cybersecurity": ["Cyber", "Vulnerability", "Exploit", "Attack", "Threat", "Security", "Malicious", "Ransomware", "Phishing"],
+    "LLMs & NLP": ["Large Language Model", "LLM", "Text Analytics", "NLP", "Transformer", "Bert", "GPT", "Language Models"],
+    "Hacker Communities": ["Hacker", "Forum", "Dark Web", "Paste", "Community", "Marketplace", "Underground"],
+    "Design Science": ["Design Science", "Framework", "Artifact", "System", "Implementation", "Prototyping"],
+    "Behavioral": ["Nudging", "Bias", "Social", "Human", "Behavior", "Psychology", "Decision", "Trust"],
+}
+
+OTHER = "Other"
+
+
+class TopicMatch(NamedTuple):
+    primary: str
+    hits: dict  # {category: keyword occurrences}, taxonomy order, matching categories only
+
+    @property
+    def categories(self) -> list:
+        return list(self.hits)
+
+
+class TopicClassifier:
+    def __init__(self, taxonomy: dict = TOPIC_TAXONOMY):
+        self.order = list(taxonomy)
+        categories_by_keyword = {}
+        for category, keywords in taxonomy.items():
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                if keyword:
+                    categories_by_keyword.setdefault(keyword, []).append(category)
+
+        # A position reports the longest keyword starting there; its prefixes
+        # necessarily match at the same position as well.
+        self._credits = {
+            keyword: [category for prefix in found for category in categories_by_keyword[prefix]]
+            for keyword, found in prefixes(categories_by_keyword).items()
+        }
+        self._pattern = keyword_scanner(categories_by_keyword)
+        self._memo = {}
+
+    def classify(self, title: str) -> TopicMatch:
+        text = (title or "").strip().lower()
+        found = self._memo.get(text)
+        if found is None:
+            counts = {}
+            for match in (self._pattern.finditer(text) if self._pattern else ()):
+                for category in self._credits[match.group(1)]:
+                    counts[category] = counts.get(category, 0) + 1
+            hits = {category: counts[category] for category in self.order if category in counts}
+            found = self._memo[text] = TopicMatch(next(iter(hits), OTHER), hits)
+        return found
+
+
+_default = None
+
+
+def get_classifier() -> TopicClassifier:
+    global _default
+    if _default is None:
+        _default = TopicClassifier()
+    return _default
+
+
+def classify(title: str) -> TopicMatch:
+    return get_classifier().classify(title)
+
+
+def classify_topic(title: str) -> str:
+    return get_classifier().classify(title).primary
@@ -0,0 +1,105 @@
+"""
+Venue-name normalization and journal-list (Q1/FT50/UTD24) matching.
+
+A venue belongs to a list when the tokens of one of the list's names or
+aliases appear as a contiguous run in the venue's tokens (after
+clean_venue_name/to_key). VenueMatcher normalizes every alias once into a
+token trie, matches a venue against all lists in one pass and memoizes the
+result per venue string.
+
+    from lib.venues import VenueMatcher
+
+    matcher = VenueMatcher.from_directory(STATIC_DATA / "journal_lists")
+    matcher.memberships("MIS Quarterly, 45(2)")   # frozenset({'q1', 'ft50', 'utd24'})
+    matcher.matches("Decision Support Systems", "q1")
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+from lib import artifacts
+
+
+def clean_venue_name(value: str) -> str:
+    if not value:
+        return ""
+    venue = value.split(",")[0].strip()
+    venue = re.sub(r"\s+forthcoming$", "", venue, flags=re.I).strip()
+    venue = re.sub(r"\s+in press$", "", venue, flags=re.I).strip()
+    venue = re.sub(r"\s+\d+(\s*\(\d+\))?.*$", "", venue, flags=re.I).strip()
+    venue = re.sub(r"management information systems quarterly\s*\(misq\)", "MIS Quarterly", venue, flags=re.I)
+    venue = re.sub(r"management information systems quarterly", "MIS Quarterly", venue, flags=re.I)
+    return venue
+
+
+def to_key(value: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", clean_venue_name(value).strip().lower()).strip()
+
+
+def flatten_journal_list(raw):
+    entries = raw if isinstance(raw, list) else raw.get("journals", [])
+    flattened = []
+    for item in entries:
+        if isinstance(item, str):
+            flattened.append(item)
+            continue
+        aliases = item.get("aliases", []) if isinstance(item, dict) else []
+        name = item.get("name") if isinstance(item, dict) else None
+        flattened.extend([name, *aliases])
+    return [entry for entry in flattened if entry]
+
+
+class VenueMatcher:
+    """Token trie over every alias of every journal list."""
+
+    _LISTS = "\0lists"  # trie key holding the lists an alias ending here belongs to
+
+    def __init__(self, lists: dict):
+        """`lists` maps a list name to its names and aliases."""
+        self.names = sorted(lists)
+        self._trie = {}
+        self._memo = {}
+        for list_name, aliases in lists.items():
+            for alias in aliases:
+                tokens = to_key(alias).split()
+                if not tokens:
+                    continue
+                node = self._trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(self._LISTS, set()).add(list_name)
+
+    @classmethod
+    def from_directory(cls, directory: Path):
+        """One list per *.json file, named after the file (q1, ft50, utd24)."""
+        lists = {}
+        for path in sorted(Path(directory).glob("*.json")):
+            lists[path.stem] = flatten_journal_list(artifacts.read_json(path, []))
+        return cls(lists)
+
+    def memberships(self, venue: str) -> frozenset:
+        """Names of the lists `venue` belongs to (memoized per venue string)."""
+        venue = venue or ""
+        found = self._memo.get(venue)
+        if found is None:
+            found = self._memo[venue] = self._scan(to_key(venue).split())
+        return found
+
+    def _scan(self, tokens) -> frozenset:
+        found = set()
+        for start in range(len(tokens)):
+            node = self._trie
+            for token in tokens[start:]:
+                node = node.get(token)
+                if node is None:
+                    break
+                found.update(node.get(self._LISTS, ()))
+        return frozenset(found)
+
+    def matches(self, venue: str, list_name: str) -> bool:
+        return list_name in self.memberships(venue)
+
+    def matches_any(self, venue: str) -> bool:
+        return bool(self.memberships(venue))
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Run the site data pipeline in one interpreter.
+
+Each script's main() is a task node with declared inputs and outputs. A task
+waits for every earlier task (in TASKS order, which mirrors the old workflow
+step order) that writes something it reads, reads something it writes, or
+writes the same path; everything else runs concurrently on a thread pool.
+JSON files written through lib.artifacts are handed to downstream tasks
+already parsed instead of being re-read from disk.
+
+Tasks marked `cached` are skipped when their inputs, code and settings hash
+the same as on their last successful run and their outputs are untouched
+(see lib/build_cache.py). --force rebuilds them anyway.
+
+Every task runs inside an instrument stage; the run's timings, CPU, peak RSS,
+I/O and HTTP counts are printed as a table and written to output/traces/
+(see lib/instrument.py).
+
+Usage:
+    python scripts/pipeline.py                 # run everything
+    python scripts/pipeline.py --list          # print the task graph
+    python scripts/pipeline.py --only build_dashboard_metrics build_dashboard_payload
+    python scripts/pipeline.py --jobs 4
+    python scripts/pipeline.py --force         # ignore the build cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from lib import artifacts, instrument  # noqa: E402
+from lib.build_cache import BuildCache  # noqa: E402
+
+DATA = "static/data"
+IMAGES = "static/images"
+PUBLICATIONS = f"{DATA}/publications.json"
+SCHOLAR = f"{DATA}/scholar-metrics.json"
+AUTHORS = "data/authors.yaml"
+FIGURES = (
+    "research-map",
+    "research-map-dark",
+    "coauthor-network",
+    "coauthor-network-dark",
+    "impact-dashboard",
+    "impact-dashboard-dark",
+)
+FIGURE_VARIANTS = tuple(
+    f"{IMAGES}/{figure}@{scale}x.{fmt}"
+    for figure in FIGURES
+    for fmt, scale in (("png", 1), ("webp", 1), ("webp", 2), ("avif", 1), ("avif", 2))
+)
+CONTENT_PUBS = (
+    "content/journal_publication",
+    "content/conference_publication",
+    "content/workshop_publication",
+)
+
+
+@dataclass(frozen=True)
+class Task:
+    name: str
+    inputs: tuple = ()
+    outputs: tuple = ()
+    entry: str = "main"
+    # Tasks sharing a resource never run at the same time. (The image tasks
+    # need none: lib/render.py draws in worker processes.)
+    resources: tuple = ()
+    # A gate blocks every later task that reads one of its inputs, and those
+    # tasks are skipped if the gate fails (e.g. publications.json validation).
+    gate: bool = False
+    # Deterministic given inputs + settings, so it may be skipped when unchanged.
+    cached: bool = False
+    # Callable returning extra values that affect the output (e.g. the year).
+    settings: object = None
+
+    @property
+    def module(self) -> str:
+        return self.name
+
+
+TASKS = [
+    Task("update_visitor_stats", outputs=(f"{DATA}/visitor_stats.json",)),
+    Task("sync_scholar_publications", inputs=CONTENT_PUBS, outputs=CONTENT_PUBS),
+    Task("expand_stub_authors", inputs=(AUTHORS, *CONTENT_PUBS), outputs=CONTENT_PUBS),
+    Task("build_publications_json", inputs=(AUTHORS, *CONTENT_PUBS), outputs=(PUBLICATIONS,), cached=True),
+    Task("generate_publication_pages", inputs=(PUBLICATIONS, *CONTENT_PUBS), outputs=CONTENT_PUBS),
+    Task("validate_publications_json", inputs=(PUBLICATIONS,), gate=True, cached=True),
+    Task("update_altmetric", inputs=CONTENT_PUBS, outputs=(f"{DATA}/altmetric.json",)),
+    Task(
+        "generate_network",
+        inputs=(PUBLICATIONS, AUTHORS),
+        outputs=(
+            f"{DATA}/network_stats.json",
+            f"{DATA}/network.json",
+            f"{IMAGES}/coauthor-network.png",
+            f"{IMAGES}/coauthor-network-dark.png",
+        ),
+        cached=True,
+        settings=lambda: {"networkExport": os.environ.get("NETWORK_EXPORT", "compact")},
+    ),
+    Task(
+        "generate_map",
+        inputs=(f"{DATA}/locations.json", PUBLICATIONS, "data/venue_locations.yaml"),
+        outputs=(f"{IMAGES}/research-map.png", f"{IMAGES}/research-map-dark.png"),
+    ),
+    Task("update_scholar_metrics", outputs=(SCHOLAR,)),
+    Task(
+        "generate_research_summary_pdf",
+        inputs=(
+            "content/authors/admin/_index.md",
+            "config/_default",
+            PUBLICATIONS,
+            AUTHORS,
+            SCHOLAR,
+            f"{DATA}/awards.json",
+            f"{DATA}/teaching.json",
+            f"{DATA}/collaboration_meta.json",
+        ),
+        outputs=("output/pdf/research-summary.pdf", "static/uploads/research-summary.pdf"),
+        cached=True,
+    ),
+    Task(
+        "build_dashboard_metrics",
+        inputs=(PUBLICATIONS, AUTHORS, SCHOLAR),
+        outputs=(f"{DATA}/dashboard_network.json",),
+        cached=True,
+        # Collaboration ranges are relative to the current year.
+        settings=lambda: {
+            "year": date.today().year,
+            "centralityMode": os.environ.get("CENTRALITY_MODE", "auto"),
+            "centralityBounds": [
+                os.environ.get(name, "")
+                for name in ("CENTRALITY_EPSILON", "CENTRALITY_DELTA", "CENTRALITY_MAX_PIVOTS")
+            ],
+            "collaborationRanges": os.environ.get("COLLABORATION_RANGES", ""),
+        },
+    ),
+    Task(
+        "build_dashboard_payload",
+        inputs=(
+            PUBLICATIONS,
+            AUTHORS,
+            SCHOLAR,
+            f"{DATA}/awards.json",
+            f"{DATA}/visitor_stats.json",
+            f"{DATA}/cv_topics.json",
+            f"{DATA}/dashboard_network.json",
+            f"{DATA}/journal_lists",
+            "data/impact_map.yaml",
+            "data/venue_locations.yaml",
+        ),
+        outputs=(f"{DATA}/dashboard",),
+        cached=True,
+    ),
+    Task(
+        "generate_dashboard",
+        inputs=(SCHOLAR,),
+        outputs=(f"{IMAGES}/impact-dashboard.png", f"{IMAGES}/impact-dashboard-dark.png"),
+        cached=True,
+    ),
+    Task(
+        "export_images",
+        inputs=tuple(f"{IMAGES}/{figure}.png" for figure in FIGURES),
+        outputs=(f"{IMAGES}/manifest.json", *FIGURE_VARIANTS),
+        cached=True,
+        settings=lambda: {
+            "budgets": os.environ.get("IMAGE_BUDGETS", ""),
+            "budgetMode": os.environ.get("IMAGE_BUDGET_MODE", "warn"),
+        },
+    ),
+    Task("update_hot_papers", inputs=(PUBLICATIONS,), outputs=(f"{DATA}/hot_papers.json",)),
+    Task("fetch_arxiv_papers", outputs=(f"{DATA}/arxiv_papers.json",)),
+    Task("fetch_nsf_grants", outputs=(f"{DATA}/nsf_grants.json",)),
+    Task(
+        "fetch_semantic_scholar",
+        inputs=(PUBLICATIONS, *CONTENT_PUBS),
+        outputs=(f"{DATA}/semantic_scholar.json",),
+    ),
+    Task("fetch_openalex", outputs=(f"{DATA}/openalex.json",)),
+    Task("fetch_grants_gov", outputs=(f"{DATA}/grants_gov.json",)),
+    Task("fetch_opencitations", inputs=CONTENT_PUBS, outputs=(f"{DATA}/opencitations.json",)),
+    Task("fetch_github_research", outputs=(f"{DATA}/github_research.json",)),
+]
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+def _overlaps(left, right) -> bool:
+    """True if any path in `left` equals, contains or sits inside one in `right`."""
+    for a in left:
+        for b in right:
+            a_path, b_path = Path(a), Path(b)
+            if a_path == b_path or a_path in b_path.parents or b_path in a_path.parents:
+                return True
+    return False
+
+
+def build_dependencies(tasks):
+    """Return {task name: set of earlier task names it must wait for}."""
+    deps = {task.name: set() for task in tasks}
+    for j, later in enumerate(tasks):
+        for earlier in tasks[:j]:
+            if (
+                _overlaps(earlier.outputs, later.inputs)
+                or _overlaps(earlier.inputs, later.outputs)
+                or _overlaps(earlier.outputs, later.outputs)
+                or (earlier.gate and _overlaps(earlier.inputs, later.inputs))
+            ):
+                deps[later.name].add(earlier.name)
+    return deps
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+class _TaskStream(io.TextIOBase):
+    """Line-buffered stdout proxy that prefixes each line with the current task."""
+
+    def __init__(self, target):
+        self._target = target
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def bind(self, name):
+        self._local.name = name
+        self._local.buffer = ""
+
+    def write(self, text):
+        name = getattr(self._local, "name", None)
+        if name is None:
+            # A task's helper thread (lib.http.gather) runs attached to its stage.
+            stage = instrument.root_stage()
+            name = stage["name"] if stage else None
+        if name is None:
+            with self._lock:
+                self._target.write(text)
+            return len(text)
+        self._local.buffer = getattr(self._local, "buffer", "") + text
+        *lines, self._local.buffer = self._local.buffer.split("\n")
+        if lines:
+            with self._lock:
+                for line in lines:
+                    self._target.write(f"[{name}] {line}\n")
+        return len(text)
+
+    def release(self):
+        if getattr(self._local, "buffer", ""):
+            self.write("\n")
+        self._local.name = None
+
+    def flush(self):
+        self._target.flush()
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def run_task(task: Task, stream: _TaskStream):
+    """Import the task's module and call its entry point. Returns (ok, seconds)."""
+    stream.bind(task.name)
+    started = time.perf_counter()
+    ok = True
+    try:
+        with instrument.stage(task.name):
+            module = importlib.import_module(task.module)
+            result = getattr(module, task.entry)()
+        if isinstance(result, int) and not isinstance(result, bool) and result != 0:
+            print(f"exited with status {result}")
+            ok = False
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            print(f"exited: {exc.code}")
+            ok = False
+    except Exception:
+        traceback.print_exc(file=sys.stdout)
+        ok = False
+    finally:
+        stream.release()
+    return ok, time.perf_counter() - started
+
+
+def run(tasks, jobs=None, cache=None, force=False):
+    """Run `tasks` respecting dependencies. Returns {name: status}.
+
+    Status is "ok", "cached" (skipped, unchanged), "failed" or "skipped".
+    """
+    deps = build_dependencies(tasks)
+    by_name = {task.name: task for task in tasks}
+    status = {}
+    keys = {}
+    busy_resources = set()
+    running = {}
+
+    stream = _TaskStream(sys.stdout)
+    original_stdout = sys.stdout
+    sys.stdout = stream
+    artifacts.enable()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs or min(8, len(tasks) or 1)) as pool:
+            while len(status) < len(tasks):
+                for task in tasks:
+                    if task.name in status or task.name in running.values():
+                        continue
+                    waiting_on = deps[task.name]
+                    if any(status.get(dep) in ("failed", "skipped") for dep in waiting_on):
+                        status[task.name] = "skipped"
+                        print(f"[pipeline] skip {task.name} (upstream failure)")
+                        continue
+                    if not all(status.get(dep) in ("ok", "cached") for dep in waiting_on):
+                        continue
+                    if busy_resources.intersection(task.resources):
+                        continue
+                    if task.cached and cache is not None:
+                        settings = task.settings() if task.settings else None
+                        keys[task.name] = cache.stage_key(task.name, task.inputs, settings)
+                        if not force and cache.is_fresh(task.name, keys[task.name], task.outputs):
+                            status[task.name] = "cached"
+                            print(f"[pipeline] unchanged {task.name} (skipped)")
+                            continue
+                    busy_resources.update(task.resources)
+                    running[pool.submit(run_task, task, stream)] = task.name
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    busy_resources.difference_update(by_name[name].resources)
+                    ok, seconds = future.result()
+                    status[name] = "ok" if ok else "failed"
+                    if name in keys:
+                        if ok:
+                            cache.record(name, keys[name], by_name[name].outputs)
+                        else:
+                            cache.forget(name)
+                    print(f"[pipeline] {'done' if ok else 'FAILED'} {name} in {seconds:.1f}s")
+    finally:
+        artifacts.disable()
+        sys.stdout = original_stdout
+        if cache is not None:
+            cache.save()
+    return status
+
+
+def select(names):
+    known = {task.name for task in TASKS}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise SystemExit(f"Unknown task(s): {', '.join(unknown)}")
+    wanted = set(names)
+    return [task for task in TASKS if task.name in wanted]
+
+
+def print_graph(tasks):
+    deps = build_dependencies(tasks)
+    for task in tasks:
+        after = ", ".join(sorted(deps[task.name])) or "-"
+        print(f"{task.name:32s} after: {after}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", metavar="TASK", help="run only these tasks (their inputs are taken as-is)")
+    parser.add_argument("--jobs", type=int, default=None, help="maximum tasks running at once")
+    parser.add_argument("--list", action="store_true", help="print the task graph and exit")
+    parser.add_argument("--force", action="store_true", help="rebuild cached stages even if unchanged")
+    args = parser.parse_args(argv)
+
+    tasks = select(args.only) if args.only else TASKS
+    if args.list:
+        print_graph(tasks)
+        return 0
+
+    os.chdir(PROJECT_ROOT)
+    started = time.perf_counter()
+    instrument.start_session("pipeline")
+    try:
+        status = run(tasks, jobs=args.jobs, cache=BuildCache(PROJECT_ROOT), force=args.force)
+    finally:
+        instrument.finish_session()
+    unchanged = [name for name, state in status.items() if state == "cached"]
+    failed = [name for name, state in status.items() if state in ("failed", "skipped")]
+    print(f"\nPipeline finished in {time.perf_counter() - started:.1f}s: "
+          f"{len(status) - len(failed) - len(unchanged)} ran, {len(unchanged)} unchanged, "
+          f"{len(failed)} failed or skipped.")
+    for name in unchanged:
+        print(f"  unchanged {name}")
+    for name in failed:
+        print(f"  {status[name]:9s} {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,8 @@ import urllib.parse
 import urllib.request
 from pathlib import Path
 
+from lib import front_matter, instrument
+
 # Try serpapi package first, fall back to urllib (mirrors update_scholar_metrics.py)
 try:
     from serpapi import GoogleSearch
@@ -214,28 +216,14 @@ def fetch_scholar_articles() -> list:
 # ---------------------------------------------------------------------------
 
 def load_existing_titles() -> list:
-    titles = []
-    for section in SECTION_DIRS.values():
-        for path in (CONTENT_ROOT / section).rglob("index.md"):
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            if not text.startswith("---"):
-                continue
-            parts = text.split("---", 2)
-            if len(parts) < 3:
-                continue
-            for line in parts[1].splitlines():
-                if line.strip().startswith("title:"):
-                    t = line.split(":", 1)[1].strip().strip('"').strip("'")
-                    if t:
-                        titles.append(t)
-                    break
-    return titles
+    return front_matter.get_index().titles()
 
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
+@instrument.stage()
 def main():
     print("=== Scholar Publication Sync ===")
 
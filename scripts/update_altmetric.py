@@ -5,14 +5,11 @@ import re
 import requests
 from pathlib import Path
 
+from lib import front_matter, instrument
+
 # --- CONFIGURATION ---
 API_KEY = os.environ.get("ALTMETRIC_API_KEY")
 
-CONTENT_DIRS = [
-    "content/journal_publication",
-    "content/conference_publication",
-    "content/workshop_publication"
-]
 OUTPUT_FILE = "static/data/altmetric.json"
 
 # Headers to look like a real browser
@@ -23,24 +20,12 @@ HEADERS = {
 def extract_dois():
     print("--- 1. Scanning Content Files for DOIs ---")
     dois = []
-    doi_pattern = re.compile(r'^doi\s*[:=]\s*["\']?(10\.[^\s"\']+)["\']?', re.MULTILINE | re.IGNORECASE)
-    base_path = Path(__file__).parent.parent
-    
-    for dir_name in CONTENT_DIRS:
-        dir_path = base_path / dir_name
-        if not dir_path.exists():
-            continue
-            
-        print(f"Scanning {dir_name}...")
-        for file_path in dir_path.rglob("index.md"):
-            try:
-                content = file_path.read_text(encoding="utf-8")
-                match = doi_pattern.search(content)
-                if match:
-                    dois.append(match.group(1))
-            except Exception as e:
-                print(f"  Error reading {file_path}: {e}")
-    
+    doi_pattern = re.compile(r'^10\.\S+$')
+
+    for entry in front_matter.get_index().publications():
+        if doi_pattern.match(entry.doi):
+            dois.append(entry.doi)
+
     unique_dois = list(set(dois))
     print(f"Total Unique DOIs Found: {len(unique_dois)}")
     return unique_dois
@@ -155,6 +140,7 @@ def fetch_metrics(dois):
 
     return stats
 
+@instrument.stage()
 def main():
     dois = extract_dois()
     if not dois:
@@ -11,6 +11,8 @@ import urllib.request
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from lib import artifacts, instrument
+
 # --- CONFIGURATION ---
 # Per-paper sheet: first column = Title, remaining columns = dates with citation counts
 CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQxM6BBdrswiWbzNk4iJ_OCVCZIiJK8jj8Paz-MMUzji8AOHzU55dvK2jbJj6Yd1InMv-p__fPmZl8c/pub?gid=180149822&single=true&output=csv"
@@ -118,8 +120,7 @@ def fetch_hot_papers():
         print(f"Error: {PUBS_FILE} not found.")
         return
 
-    with open(PUBS_FILE, "r") as f:
-        all_pubs = json.load(f)
+    all_pubs = artifacts.read_json(PUBS_FILE)
 
     # Lookup: normalized title -> pub data (try exact and relaxed match)
     pubs_map = {p["title"].lower().strip(): p for p in all_pubs}
@@ -171,5 +172,10 @@ def fetch_hot_papers():
     print(f"Success. Saved {len(final_data)} hot papers to {OUTPUT_FILE}")
 
 
-if __name__ == "__main__":
+@instrument.stage()
+def main():
     fetch_hot_papers()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
+from lib import artifacts, instrument
+
 # Try to use serpapi package if available, otherwise fall back to urllib
 try:
     from serpapi import GoogleSearch
@@ -164,12 +166,14 @@ def process_and_save(data):
         "individualPublications": individual_publications
     }
 
-    OUTPUT_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output, f, indent=2)
-    
+    artifacts.write_json(OUTPUT_FILE, output, indent=2)
+
     print(f"Success! Saved metrics to {OUTPUT_FILE}")
 
-if __name__ == "__main__":
+@instrument.stage()
+def main():
     json_data = fetch_data()
-    process_and_save(json_data)
\ No newline at end of file
+    process_and_save(json_data)
+
+if __name__ == "__main__":
+    main()
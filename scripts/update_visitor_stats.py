@@ -11,6 +11,8 @@ from google.analytics.data_v1beta.types import (
 )
 from google.oauth2 import service_account
 
+from lib import instrument
+
 # --- CONFIG ---
 OUTPUT_FILE = "static/data/visitor_stats.json"
 PROPERTY_ID = os.environ.get("GA4_PROPERTY_ID")
@@ -150,10 +152,14 @@ def fetch_analytics():
         "lifetime_total": lifetime_total
     }
 
-if __name__ == "__main__":
+@instrument.stage()
+def main():
     stats = fetch_analytics()
     if stats:
         os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
         with open(OUTPUT_FILE, "w") as f:
             json.dump(stats, f, indent=2)
         print(f"Success: Detailed stats saved to {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
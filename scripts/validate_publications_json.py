@@ -5,6 +5,8 @@ import re
 import sys
 from pathlib import Path
 
+from lib import artifacts, instrument
+
 ROOT = Path(__file__).resolve().parents[1]
 DATA_PATH = ROOT / "static" / "data" / "publications.json"
 
@@ -22,17 +24,17 @@ BAD_VENUE_PATTERNS = [
 BAD_PAREN_ABBREV = re.compile(r"\([A-Z0-9&\.\s]{2,}\)")
 
 
+@instrument.stage()
 def main():
     if not DATA_PATH.exists():
         print(f"ERROR: {DATA_PATH} does not exist")
         return 1
 
-    with DATA_PATH.open() as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"ERROR: Invalid JSON: {e}")
-            return 1
+    try:
+        data = artifacts.read_json(DATA_PATH)
+    except json.JSONDecodeError as e:
+        print(f"ERROR: Invalid JSON: {e}")
+        return 1
 
     if not isinstance(data, list):
         print("ERROR: publications.json must be a list")
@@ -24,6 +24,16 @@
       .then((response) => (response.ok ? response.json() : null))
       .catch(() => null);
 
+  // Only the impactStats section of the sharded dashboard payload is needed.
+  const loadImpactStats = () =>
+    fetch(`${base}data/dashboard/manifest.json`, { cache: "no-cache" })
+      .then((response) => (response.ok ? response.json() : null))
+      .then((manifest) => {
+        const entry = manifest && manifest.sections && manifest.sections.impactStats;
+        return entry ? safeFetch(`${base}data/dashboard/${entry.file}`) : null;
+      })
+      .catch(() => null);
+
   const animateValue = (el, value) => {
     if (prefersReducedMotion) {
       el.textContent = String(value);
@@ -98,10 +108,9 @@
     });
   });
 
-  safeFetch(`${base}data/dashboard_payload.json`).then((payload) => {
-    if (!payload || !payload.impactStats) return;
+  loadImpactStats().then((stats) => {
+    if (!stats) return;
 
-    const stats = payload.impactStats;
     if (updatedEl) updatedEl.textContent = `Updated ${stats.updatedLabel || "Recent"}`;
     if (latestYearEl) latestYearEl.textContent = stats.latestYear ? String(stats.latestYear) : "--";
 